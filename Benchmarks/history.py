@@ -0,0 +1,106 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import os
+
+# Result fields compared with the baseline, and whether a higher value is better
+METRICS = {'seconds': False, 'requestsPerSecond': True, 'peakRssMb': False, 'requests': False}
+
+
+def load(filename):
+    # return (list): Benchmark runs saved in a history file, oldest first. Empty if the file does not exist.
+    if not os.path.isfile(filename):
+        return []
+    with open(filename) as f:
+        return json.load(f)
+
+
+def append(filename, run):
+    # param run (dict): Benchmark run, see "main.benchmark"
+    runs = load(filename)
+    runs.append(run)
+    with open(filename, 'w') as f:
+        json.dump(runs, f, indent=2)
+
+
+def load_baseline(filename):
+    # return (dict): The baseline run, or None if the file does not exist
+    if not os.path.isfile(filename):
+        return None
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_baseline(filename, run):
+    with open(filename, 'w') as f:
+        json.dump(run, f, indent=2)
+
+
+def change(value, previous):
+    # return (float): Change from "previous" to "value" in percent, or None if either is missing or zero
+    if value is None or not previous:
+        return None
+    return (value - previous) / previous * 100
+
+
+def compare(run, baseline, threshold=10.0):
+    # param run, baseline (dict): Benchmark runs
+    # param threshold (float): Change in percent, in the wrong direction, counted as a regression
+    # return rows (list): Per workflow and fleet size present in both runs, each metric's "value", "baseline",
+    # "change" in percent and whether it "regressed"
+
+    previous = {(r['workflow'], r['devices']): r for r in baseline['results']}
+    rows = []
+    for result in run['results']:
+        old = previous.get((result['workflow'], result['devices']))
+        if old is None or result['status'] != 'ok' or old['status'] != 'ok':
+            continue
+        for metric, higher_is_better in METRICS.items():
+            delta = change(result.get(metric), old.get(metric))
+            worse = delta is not None and (-delta if higher_is_better else delta) > threshold
+            rows.append({'workflow': result['workflow'], 'devices': result['devices'], 'metric': metric,
+                         'value': result.get(metric), 'baseline': old.get(metric), 'change': delta,
+                         'regressed': worse})
+    return rows
+
+
+def print_results(run):
+    print(f'{"Workflow":<20}{"Devices":>9}{"Status":>12}{"Wall s":>10}{"Requests":>10}{"Req/s":>10}'
+          f'{"Throttled":>11}{"Errors":>8}{"Peak RSS MB":>13}')
+    print('-' * 103)
+    for r in run['results']:
+        print(f'{r["workflow"]:<20}{r["devices"]:>9}{r["status"]:>12}{r["seconds"]:>10.2f}{r["requests"]:>10}'
+              f'{r["requestsPerSecond"]:>10.1f}{r["throttled"]:>11}{r["errors"]:>8}'
+              f'{r["peakRssMb"] if r["peakRssMb"] is not None else "n/a":>13}')
+
+
+def print_comparison(rows, baseline):
+    print(f'\nCompared with the baseline of {baseline["timestamp"]} ({baseline.get("label") or "no label"}, '
+          f'commit {baseline.get("commit") or "unknown"}):')
+    print(f'{"Workflow":<20}{"Devices":>9}  {"Metric":<20}{"Baseline":>12}{"Now":>12}{"Change":>10}')
+    print('-' * 85)
+    for row in rows:
+        delta = f'{row["change"]:+.1f}%' if row['change'] is not None else 'n/a'
+        print(f'{row["workflow"]:<20}{row["devices"]:>9}  {row["metric"]:<20}{row["baseline"]:>12}'
+              f'{row["value"]:>12}{delta:>10}{"  REGRESSED" if row["regressed"] else ""}')
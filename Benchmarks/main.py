@@ -0,0 +1,281 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import logging
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import os
+import tempfile
+import threading
+import time
+import json
+from datetime import datetime as dt
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import logger, http_client
+import history
+import scenarios
+
+DEFAULT_SIZES = [100, 1000, 10000, 50000]
+HISTORY_FILE = os.path.join(currentdir, 'history.json')
+BASELINE_FILE = os.path.join(currentdir, 'baseline.json')
+MOCK_SCRIPT = os.path.join(parentdir, 'Mock DNAC', 'main.py')
+WORKER_SCRIPT = os.path.join(currentdir, 'worker.py')
+# Seconds to wait for the mock server to accept connections
+STARTUP_TIMEOUT = 30
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def git_commit():
+    # return (str): Short hash of the checked out commit, or None outside a git working tree
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=parentdir, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class MockServer:
+    # Mock DNAC server of one fleet size, run in its own process so it does not compete with the measured workflow
+    # for the GIL and is not counted in its memory use
+
+    def __init__(self, size, port, arguments, log_file):
+        self.url = f'https://127.0.0.1:{port}'
+        command = [sys.executable, MOCK_SCRIPT, '--port', str(port), '--devices', str(size), '--seed',
+                   str(arguments.seed), '--latency', str(arguments.latency), '--jitter', str(arguments.jitter),
+                   '--rate_limit', str(arguments.rate_limit), '--task_delay', str(arguments.task_delay)]
+        self.log = open(log_file, 'w')
+        self.process = subprocess.Popen(command, stdout=self.log, stderr=subprocess.STDOUT)
+        deadline = time.monotonic() + STARTUP_TIMEOUT
+        while True:
+            try:
+                self.stats()
+                return
+            except http_client.get_client(self.url).errors:
+                if self.process.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f'The mock DNAC server did not start, see {log_file}')
+                time.sleep(0.2)
+
+    def stats(self):
+        return http_client.get(f'{self.url}/mock/stats', verify=False).json()
+
+    def reset(self):
+        http_client.post(f'{self.url}/mock/reset', verify=False)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+        self.log.close()
+
+
+def run_once(name, size, data_dir, mock, number, timeout):
+    # param name (str): One of scenarios.WORKFLOWS
+    # param data_dir (str): Folder of the fleet's device files; each run gets its own subfolder for its output
+    # return result (dict): Wall time, API calls and peak memory of one run of the workflow
+
+    command, arguments = scenarios.WORKFLOWS[name]
+    run_dir = os.path.join(data_dir, f'{name}_{number}')
+    os.makedirs(run_dir, exist_ok=True)
+    job_file = os.path.join(run_dir, 'job.json')
+    with open(job_file, 'w') as f:
+        json.dump({'workflow': name, 'command': command, 'argv': arguments(data_dir)}, f)
+    mock.reset()
+
+    timed_out = threading.Event()
+    with open(os.path.join(run_dir, 'output.log'), 'w') as log:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable, WORKER_SCRIPT, job_file], cwd=run_dir, stdout=log,
+                                   stderr=subprocess.STDOUT)
+        timer = threading.Timer(timeout, lambda: (timed_out.set(), process.kill()))
+        timer.start()
+        if hasattr(os, 'wait4'):
+            # Resource usage of this process alone; RUSAGE_CHILDREN would report the largest of all runs so far
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # "ru_maxrss" is in kilobytes on Linux and in bytes on macOS
+            peak_rss = round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+        else:
+            process.wait()
+            peak_rss = None
+        seconds = time.perf_counter() - start
+        timer.cancel()
+
+    stats = mock.stats()
+    totals = stats['totals']
+    with open(job_file) as f:
+        job = json.load(f)
+    worker_seconds, devices = job.get('seconds'), job.get('devices')
+    status = 'timeout' if timed_out.is_set() else 'failed' if process.returncode != 0 else \
+        'incomplete' if devices is not None and devices != size else 'ok'
+    if status == 'incomplete':
+        logging.warning(f'{name} returned results for {devices} of {size} devices')
+    if status != 'ok':
+        logging.warning(f'{name} with {size} devices {status}, see {os.path.join(run_dir, "output.log")}')
+    return {
+        'workflow': name,
+        'devices': size,
+        'status': status,
+        'exitCode': process.returncode,
+        'devicesCovered': devices,
+        'seconds': round(seconds, 3),
+        'workerSeconds': None if worker_seconds is None else round(worker_seconds, 3),
+        'requests': totals.get('requests', 0),
+        'requestsPerSecond': round(totals.get('requests', 0) / seconds, 1),
+        'throttled': totals.get('throttled', 0),
+        'errors': sum(totals.get(key, 0) for key in ('injected_errors', 'not_found', 'unauthorized')),
+        'peakRssMb': peak_rss,
+        'apiCalls': stats['calls']
+    }
+
+
+def run_workflow(name, size, data_dir, mock, repeat, timeout):
+    # return result (dict): The run with the median wall time, with the highest peak memory of all runs
+    results = sorted((run_once(name, size, data_dir, mock, number, timeout) for number in range(repeat)),
+                     key=lambda result: (result['status'] != 'ok', result['seconds']))
+    result = results[(len(results) - 1) // 2] if all(r['status'] == 'ok' for r in results) else results[-1]
+    peaks = [r['peakRssMb'] for r in results if r['peakRssMb'] is not None]
+    return dict(result, repeat=repeat, peakRssMb=max(peaks) if peaks else None)
+
+
+def benchmark(arguments):
+    # param arguments (Namespace): Parsed CLI arguments
+    # return run (dict): Settings and results of every workflow at every fleet size
+
+    run = {'timestamp': dt.now().isoformat(timespec='seconds'), 'label': arguments.label, 'commit': git_commit(),
+           'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+           'mock': {'seed': arguments.seed, 'latency': arguments.latency, 'jitter': arguments.jitter,
+                    'rateLimit': arguments.rate_limit, 'taskDelay': arguments.task_delay},
+           'results': []}
+    work_dir = arguments.work_dir or tempfile.mkdtemp(prefix='dnac_benchmark_')
+    try:
+        for size in arguments.sizes:
+            data_dir = os.path.join(work_dir, str(size))
+            port = free_port()
+            logging.info(f'Preparing a fleet of {size} devices in {data_dir}')
+            scenarios.prepare(size, arguments.seed, data_dir, port)
+            mock = MockServer(size, port, arguments, os.path.join(data_dir, 'mock.log'))
+            try:
+                for name in arguments.workflows:
+                    print(f'Running {name} with {size} devices...', flush=True)
+                    run['results'].append(run_workflow(name, size, data_dir, mock, arguments.repeat,
+                                                       arguments.timeout))
+            finally:
+                mock.stop()
+    finally:
+        if arguments.work_dir is None and not arguments.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        elif arguments.keep:
+            print(f'Output of every run was kept in {work_dir}')
+    return run
+
+
+def main(arguments):
+    # param arguments (Namespace): Parsed CLI arguments
+    # return (int): Exit status; 1 if a workflow failed, or regressed with --fail_on_regression
+
+    logger.logger(arguments.logging_level, arguments.logging_file)
+    run = benchmark(arguments)
+    history.append(arguments.history_file, run)
+    print()
+    history.print_results(run)
+    print(f'\nResults appended to {arguments.history_file}')
+
+    regressed = False
+    baseline = history.load_baseline(arguments.baseline_file)
+    if baseline and not arguments.save_baseline:
+        rows = history.compare(run, baseline, arguments.threshold)
+        history.print_comparison(rows, baseline)
+        regressed = any(row['regressed'] for row in rows)
+    if arguments.save_baseline:
+        history.save_baseline(arguments.baseline_file, run)
+        print(f'Saved as the baseline in {arguments.baseline_file}')
+    failed = any(result['status'] != 'ok' for result in run['results'])
+    return 1 if failed or (regressed and arguments.fail_on_regression) else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run every workflow against a local mock DNAC server at several '
+                                                 'fleet sizes, record wall time, API calls, requests per second and '
+                                                 'peak memory to a JSON history file, and compare them with a '
+                                                 'stored baseline.')
+    log_settings = parser.add_argument_group('Log Settings')
+    log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
+                                                                      'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET')
+    log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.')
+    suite = parser.add_argument_group('Suite')
+    suite.add_argument('-s', '--sizes', type=lambda value: [int(size) for size in value.split(',')],
+                       default=DEFAULT_SIZES, help='Comma separated fleet sizes. Default is '
+                       f'"{",".join(str(size) for size in DEFAULT_SIZES)}".')
+    suite.add_argument('-w', '--workflows', type=lambda value: value.split(','), default=list(scenarios.WORKFLOWS),
+                       help=f'Comma separated workflows to run. Default is all of: {", ".join(scenarios.WORKFLOWS)}.')
+    suite.add_argument('--repeat', type=int, default=1, help='Runs of each workflow; the run with the median wall '
+                       'time is recorded. Default is 1.')
+    suite.add_argument('--timeout', type=int, default=3600, help='Seconds after which a run is stopped. Default '
+                       'is 3600.')
+    suite.add_argument('--label', type=str, help='Description stored with the results, e.g. the change being '
+                       'measured.')
+    suite.add_argument('--work_dir', type=str, help='Folder for the device files and the output of every run. By '
+                       'default a temporary folder is used and removed afterwards.')
+    suite.add_argument('--keep', action='store_true', help='Keep the temporary folder.')
+    mock = parser.add_argument_group('Mock DNAC')
+    mock.add_argument('--seed', type=int, default=1, help='Seed of the synthetic fleet. Default is 1.')
+    mock.add_argument('--latency', type=float, default=0, help='Milliseconds added to every API call. Default is 0.')
+    mock.add_argument('--jitter', type=float, default=0, help='Random extra milliseconds per API call. Default is 0.')
+    mock.add_argument('--rate_limit', type=float, default=0, help='API calls per second accepted before answering '
+                      'with 429. Default is 0 (no limit).')
+    mock.add_argument('--task_delay', type=float, default=0, help='Seconds before archive and Command Runner tasks '
+                      'finish. Default is 0.')
+    results = parser.add_argument_group('Results')
+    results.add_argument('--history_file', type=str, default=HISTORY_FILE, help='JSON file every run is appended '
+                         'to. Default is "history.json" in this folder.')
+    results.add_argument('--baseline_file', type=str, default=BASELINE_FILE, help='JSON file holding the baseline '
+                         'run. Default is "baseline.json" in this folder.')
+    results.add_argument('--save_baseline', action='store_true', help='Store this run as the new baseline instead '
+                         'of comparing with the old one.')
+    results.add_argument('--threshold', type=float, default=10, help='Change in percent, in the wrong direction, '
+                         'reported as a regression. Default is 10.')
+    results.add_argument('--fail_on_regression', action='store_true', help='Exit with status 1 if any metric '
+                         'regressed.')
+    arguments = parser.parse_args(argv)
+    unknown = [name for name in arguments.workflows if name not in scenarios.WORKFLOWS]
+    if unknown:
+        parser.error(f'unknown workflows: {", ".join(unknown)}')
+    return arguments
+
+
+if __name__ == '__main__':
+    sys.exit(main(parse_args()))
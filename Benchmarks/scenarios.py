@@ -0,0 +1,106 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import csv
+import json
+import os
+import sys
+from datetime import datetime as dt, timedelta
+
+# Append parent directory, and the mock server folder, to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+sys.path.append(os.path.join(parentdir, 'Mock DNAC'))
+
+from utils import csv_creator
+from fleet import Fleet
+
+DEVICE_CSV = 'devices.csv'
+DEVICE_JSON = 'devices.json'
+# Minutes of device events requested by the "events" workflow
+EVENT_MINUTES = 60
+
+
+def events_window():
+    before = dt.now()
+    return ['-a', (before - timedelta(minutes=EVENT_MINUTES)).isoformat(timespec='seconds'),
+            '-b', before.isoformat(timespec='seconds')]
+
+
+def device_uuids(data_dir):
+    with open(os.path.join(data_dir, DEVICE_CSV), newline='') as f:
+        return ','.join(row['id'] for row in csv.DictReader(f) if row['family'] != 'Unified AP')
+
+
+# Workflow name: (dnac.py subcommand or None for utils/csv_creator, function returning its arguments). The
+# functions receive the folder holding the fleet's device files. Every workflow covers the whole fleet.
+WORKFLOWS = {
+    'compliance': ('compliance', lambda data_dir: []),
+    'archive_sanitized': ('archive', lambda data_dir: ['sanitized', '--csv_file',
+                                                       os.path.join(data_dir, DEVICE_CSV)]),
+    'archive_full': ('archive', lambda data_dir: ['full', '--csv_file', os.path.join(data_dir, DEVICE_CSV)]),
+    'commands': ('commands', lambda data_dir: ['--commands', 'show version,show inventory',
+                                               '--deviceUuids', device_uuids(data_dir)]),
+    'advisories': ('advisories', lambda data_dir: ['-r', 'full', '-o', 'json']),
+    'events': ('events', lambda data_dir: ['--filter', 'hostname=.*', '-o', 'ndjson', '-m'] + events_window()),
+    'csv_creator': (None, lambda data_dir: ['--input_file', os.path.join(data_dir, DEVICE_JSON),
+                                            '--output_file', 'devices.csv'])
+}
+
+
+# Workflow name: function returning the number of devices in the workflow's result, for the workflows whose result
+# lists devices. A run covering fewer devices than the fleet holds is not counted as "ok".
+DEVICE_COUNTS = {
+    # One list of compliance types per device
+    'compliance': lambda result: len({item['deviceUuid'] for device in result or [] for item in device or []})
+}
+
+
+def write_fleet_files(fleet, data_dir):
+    # param fleet (Fleet): Fleet served by the mock server
+    # param data_dir (str): Folder in which to write the fleet's "Get Device List" response as JSON, the input of
+    # "utils/csv_creator", and converted to CSV by "utils/csv_creator", the input of the Configuration Archive and
+    # Command Runner workflows
+
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, DEVICE_JSON), 'w') as f:
+        f.write('[')
+        for index in range(fleet.size):
+            f.write((',\n' if index else '') + json.dumps(fleet.device(index)))
+        f.write(']')
+    csv_creator.write_csv(os.path.join(data_dir, DEVICE_JSON), os.path.join(data_dir, DEVICE_CSV))
+
+
+def write_config(data_dir, port):
+    # A "config.ini" in the parent folder of the run folders is found by every script
+    with open(os.path.join(data_dir, 'config.ini'), 'w') as f:
+        f.write(f'[DNAC]\nserver=127.0.0.1\nport={port}\nusername=benchmark\npassword=benchmark\n')
+
+
+def prepare(size, seed, data_dir, port):
+    # return fleet (Fleet): The fleet of "size" devices, after writing its device files and "config.ini"
+    fleet = Fleet(size, seed)
+    write_fleet_files(fleet, data_dir)
+    write_config(data_dir, port)
+    return fleet
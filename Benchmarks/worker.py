@@ -0,0 +1,63 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import sys
+import os
+import time
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+
+def run(command, argv):
+    # param command (str): dnac.py subcommand, or None for utils/csv_creator
+    # param argv (list): Arguments of the workflow
+    # return: Result of the workflow
+    # Results are written to files as usual but not printed, so printing large results is not measured.
+
+    if command is None:
+        from utils import csv_creator
+        arguments = dict(zip([a.lstrip('-') for a in argv[::2]], argv[1::2]))
+        return csv_creator.main(arguments)
+    import dnac
+    module = dnac.load(command)
+    return module.run(module.parse_args(argv, prog=f'dnac {command}'), show=False)
+
+
+if __name__ == '__main__':
+    # Started by the benchmark in a fresh process for each run, with the workflow in a JSON file, so long device
+    # lists are not limited by the size of the command line and peak memory is measured per run
+    with open(sys.argv[1]) as f:
+        job = json.load(f)
+    start = time.perf_counter()
+    result = run(job['command'], job['argv'])
+    seconds = time.perf_counter() - start
+    # Counted after the clock is stopped so the check does not add to the measured time
+    import scenarios
+    count = scenarios.DEVICE_COUNTS.get(job.get('workflow'))
+    devices = None if count is None else count(result)
+    with open(sys.argv[1], 'w') as f:
+        json.dump(dict(job, seconds=seconds, devices=devices), f)
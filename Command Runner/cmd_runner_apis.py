@@ -21,12 +21,19 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
 import logging
 import pathlib
+import sys
 import os
 import json
 
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import get_config, http_client, logger
+
 
 def get_accepted_commands(dnac_token, baseUrl):
     # params dnac_token, baseUrl: Strings used for making API call
@@ -36,10 +43,10 @@ def get_accepted_commands(dnac_token, baseUrl):
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device-poller/cli/legit-reads'
 
-    response = requests.get(url, headers=header, verify=False)
+    response = http_client.get(url, headers=header, verify=False)
     output = response.json()
     result = output['response']
-    logging.debug(f'Received list of accepted commands: {result}')
+    logging.debug('Received list of accepted commands: %s', logger.Preview(result))
     return result
 
 
@@ -58,14 +65,14 @@ def request_run_command(dnac_token, baseUrl, payload):
     # requests_log.propagate = True
 
     logging.info('Sending Command Runner request.')
-    logging.debug(f'Command Runner received payload: {payload}')
+    logging.debug('Command Runner received payload: %s', logger.Preview(payload))
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device-poller/cli/read-request'
 
-    response = requests.post(url, data=json.dumps(payload), headers=header, verify=False)
+    response = http_client.post(url, data=json.dumps(payload), headers=header, verify=False)
     output = response.json()
-    result = output['response']
-    logging.debug(f'Command Runner response: {response}')
+    result = output.get('response', output)  # Error replies, e.g. a rejected token, may not have a "response" key
+    logger.log_response('Command Runner response', response)
     return result, response.status_code
 
 
@@ -78,8 +85,11 @@ def get_task_status(dnac_token, baseUrl, task_id):
     logging.debug(f'Task ID: {task_id}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/task/' + task_id
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Obtained response: {response.status_code}: {response.text}')
+    response = http_client.get(url, headers=header, verify=False)
+    logger.log_response('Obtained response', response)
+    if response.status_code != 200:
+        # Report a failed status check as a task error, keeping the status code so a rejected token can be renewed
+        return {'isError': True, 'statusCode': response.status_code, 'failureReason': response.text}
 
     # Check the status of the task and respond accordingly
     output = response.json()
@@ -96,17 +106,18 @@ def download_file_by_id(dnac_token, baseUrl, file_id):
     logging.debug(f'Attempting download of file ID: {file_id}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/file/' + file_id
-    response = requests.get(url, headers=header, verify=False)
+    response = http_client.get(url, headers=header, verify=False)
 
     # Create dictionary for reporting results, including filename and path where it is saved.
     result = {}
 
     # Check if response was successful (200 OK)
-    logging.debug(f'File download response was: {response.status_code}: {response.text}')
+    logger.log_response('File download response was', response)
     if response.status_code == 200:
         result['status_code'] = response.status_code
         result['status'] = 'The request was successful. The result is contained in the response body.'
-        filename = response.headers['filename'] + '.json'
+        # Prefixed with the cluster name when several clusters are queried at once
+        filename = get_config.cluster_path(response.headers['filename'] + '.json')
         pathlib.Path('files/').mkdir(parents=True, exist_ok=True)  # Create a "files/" subdirectory if it doesn't exist
 
         # Create file and open for writing; stream data in chunks into the file.
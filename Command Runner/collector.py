@@ -0,0 +1,183 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import pathlib
+import hashlib
+import gzip
+import os
+import json
+import time
+from collections import deque
+
+from output_parser import normalize_command, iter_result_records
+
+DEFAULT_STORE_DIR = 'files/collection'
+# Number of collection summaries kept by "run_schedule", so a scheduler running indefinitely does not grow
+RESULT_HISTORY = 100
+
+
+class OutputStore:
+    # Content addressed store for recurring Command Runner collections. Each distinct output is saved once, gzipped,
+    # under its SHA-256 hash. A state file maps every (device UUID, command) pair to the hash of its latest output, and
+    # each collection writes a delta file listing only the pairs whose output changed since the previous collection.
+
+    def __init__(self, store_dir=DEFAULT_STORE_DIR):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, 'objects')
+        self.deltas_dir = os.path.join(store_dir, 'deltas')
+        self.state_file = os.path.join(store_dir, 'state.json')
+        pathlib.Path(self.objects_dir).mkdir(parents=True, exist_ok=True)
+        pathlib.Path(self.deltas_dir).mkdir(parents=True, exist_ok=True)
+        if os.path.isfile(self.state_file):
+            with open(self.state_file) as f:
+                self.state = json.load(f)
+        else:
+            self.state = {}
+
+    def object_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest + '.gz')
+
+    def get_output(self, digest):
+        # param digest: SHA-256 hash of a stored output
+        # return: String containing the stored CLI output
+        with gzip.open(self.object_path(digest), 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def add_results(self, result_file):
+        # param result_file: Path to a Command Runner result file
+        # return changes: List of dictionaries describing each (device, command) pair whose output changed
+
+        changes = []
+        for record in iter_result_records(result_file):
+            output = record['output'] or ''
+            digest = hashlib.sha256(output.encode('utf-8')).hexdigest()
+            key = f'{record["deviceUuid"]}|{normalize_command(record["command"])}'
+            previous = self.state.get(key)
+            if previous and previous['hash'] == digest and previous['status'] == record['status']:
+                continue
+            path = self.object_path(digest)
+            if not os.path.isfile(path):
+                pathlib.Path(os.path.dirname(path)).mkdir(exist_ok=True)
+                with gzip.open(path, 'wt', encoding='utf-8') as f:
+                    f.write(output)
+            self.state[key] = {'hash': digest, 'status': record['status']}
+            changes.append({'deviceUuid': record['deviceUuid'], 'command': record['command'],
+                            'status': record['status'], 'hash': digest,
+                            'previous_hash': previous['hash'] if previous else None})
+        return changes
+
+    def write_delta(self, changes):
+        # param changes: List of changes from "add_results" for one collection
+        # return filename: Path of the delta file written, or None if nothing changed
+
+        # Save state first, atomically, so an interrupted run never leaves a truncated state file
+        with open(self.state_file + '.tmp', 'w') as f:
+            json.dump(self.state, f)
+        os.replace(self.state_file + '.tmp', self.state_file)
+        if not changes:
+            return None
+        timestamp = time.strftime("%Y-%m-%d_%I-%M-%S%p_%Z", time.localtime())
+        filename = os.path.join(self.deltas_dir, f'delta_{timestamp}.ndjson')
+        with open(filename, 'w') as f:
+            for change in changes:
+                f.write(json.dumps(change) + '\n')
+        return filename
+
+
+def collect(token_manager, baseUrl, body_params, store, run_command_request, batch_size=100, spread=0):
+    # param token_manager: utils.auth.TokenManager supplying a reused DNAC token
+    # param baseUrl: String containing the DNAC IP, port, and base URL
+    # param body_params: Dictionary of Command Runner body parameters, including "commands" and "deviceUuids"
+    # param store: OutputStore object
+    # param run_command_request: Function submitting one Command Runner request and returning its result dictionary
+    # param batch_size: Number of devices sent in each Command Runner request
+    # param spread: Number of seconds over which the batches are started, to smooth the load on DNAC
+    # return result: Dictionary summarizing the collection
+
+    device_uuids = body_params['deviceUuids']
+    batches = [device_uuids[i:i + batch_size] for i in range(0, len(device_uuids), batch_size)]
+    gap = spread / len(batches) if batches else 0
+    changes = []
+    failed = []
+    started = time.monotonic()
+
+    for index, batch in enumerate(batches):
+        # Wait for this batch's time slot
+        delay = started + index * gap - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        batch_params = dict(body_params, deviceUuids=batch)
+        try:
+            result = run_command_request(token_manager.get_token(), baseUrl, batch_params)
+            if result['status_code'] == 401:
+                # The token can be rejected by the request, a task status check or the download
+                logging.info('DNAC token was rejected, requesting a new token.')
+                token_manager.invalidate()
+                result = run_command_request(token_manager.get_token(), baseUrl, batch_params)
+        except Exception as e:
+            logging.exception(f'Collection of batch {index + 1} of {len(batches)} failed: {e}')
+            failed.extend(batch)
+            continue
+        if result['status_code'] != 200 or not result['location']:
+            logging.error(f'Collection of batch {index + 1} of {len(batches)} failed: {result["status"]}')
+            failed.extend(batch)
+            continue
+        changes.extend(store.add_results(result['location']))
+        os.remove(result['location'])  # Raw result file is no longer needed once stored
+
+    delta_file = store.write_delta(changes)
+    logging.info(f'Collection finished with {len(changes)} changed outputs.')
+    return {'devices': len(device_uuids), 'failed_devices': failed, 'changes': len(changes), 'delta_file': delta_file}
+
+
+def run_schedule(token_manager, baseUrl, body_params, run_command_request, interval, batch_size=100, iterations=None,
+                 store_dir=DEFAULT_STORE_DIR):
+    # param interval: Number of seconds between the start of each collection. Batches are spread over the interval.
+    # param iterations: Number of collections to run, or None to run until interrupted
+    # Other params are passed to "collect".
+    # return results: List of the last RESULT_HISTORY collection summaries. A collection that fails is logged and
+    # recorded with an "error" key, and the schedule carries on.
+
+    store = OutputStore(store_dir)
+    results = deque(maxlen=RESULT_HISTORY)
+    count = 0
+    try:
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            logging.info(f'Starting scheduled collection #{count + 1}.')
+            try:
+                results.append(collect(token_manager, baseUrl, body_params, store, run_command_request, batch_size,
+                                       spread=interval / 2))
+            except Exception as e:
+                logging.exception(f'Scheduled collection #{count + 1} failed: {e}')
+                results.append({'devices': len(body_params['deviceUuids']), 'error': f'{type(e).__name__}: {e}'})
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+    except KeyboardInterrupt:
+        logging.info('Scheduled collection stopped by user.')
+    return list(results)
@@ -22,26 +22,138 @@ __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
 import cmd_runner_apis
+import output_parser
+import result_cache
+import collector
 import logging
-import urllib3
 import sys
 import os
 import argparse
 import json
-import time
 
 # Append parent directory to path so we can import from external packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
-from utils import auth, logger, get_config
+from utils import auth, logger, get_config, metrics, profiler, webhook
+from functools import partial
 from pprint import pprint as pp
 from configparser import ConfigParser, Error
-from urllib3.exceptions import InsecureRequestWarning
 
-# Disable certificate warnings
-urllib3.disable_warnings(InsecureRequestWarning)
+
+def authenticate(dnac_server, dnac_port, dnac_username, dnac_password):
+    # params dnac_server, dnac_port, dnac_username, dnac_password: Strings from "config.ini"
+    # return dnac_token: String containing the DNAC API token
+
+    logging.info('Authenticating to DNAC.')
+    with profiler.stage('auth'):
+        dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server,
+                                       port=dnac_port)
+    logging.debug(f'Setting "dnac_token" to: {dnac_token}')
+    return dnac_token
+
+
+def run_command_request(dnac_token, baseUrl, body_params, waiter=None):
+    # param dnac_token, baseUrl: Strings containing API token and API base URL
+    # param body_params: Dictionary of body parameters for the
+    # "/dna/intent/api/v1/network-device-poller/cli/read-request" endpoint
+    # param waiter: Optional utils.webhook.TaskWaiter fed by a webhook receiver
+    # return result: Dictionary containing "status_code", "status", "filename", "location" of the result file
+
+    result = {}
+
+    # Make Command Runner request; task will be queued and task ID will be provided
+    with profiler.stage('request'):
+        cmd_runner_result, cmd_runner_status_code = cmd_runner_apis.request_run_command(dnac_token, baseUrl,
+                                                                                         body_params)
+
+    # Check output of Command Runner results
+    if cmd_runner_status_code == 200:
+        # Get Task ID from response; we will ignore included URL and simply hard-code it
+        cmd_runner_task_id = cmd_runner_result['taskId']
+        logging.info(f'Received Task ID: {cmd_runner_task_id}')
+    elif cmd_runner_status_code == 201 or cmd_runner_status_code == 202:
+        # Unsure what a 201 or 202 result looks like, check if Task ID exists.
+        if 'taskId' in cmd_runner_result.keys():
+            cmd_runner_task_id = cmd_runner_result['taskId']
+            logging.info(f'Received Task ID: {cmd_runner_task_id}')
+        else:
+            logging.error(f'Command Runner request may not have been successful: {cmd_runner_result}')
+            result['status_code'] = cmd_runner_status_code
+            result['status'] = cmd_runner_result
+            result['filename'] = None
+            result['location'] = None
+            return result
+    else:
+        logging.error(f'Command Runner request may not have been successful: {cmd_runner_result}')
+        result['status_code'] = cmd_runner_status_code
+        result['status'] = cmd_runner_result
+        result['filename'] = None
+        result['location'] = None
+        return result
+
+    # If Command Runner POST successful, get status of task and check if finished. With a webhook receiver running,
+    # a task notification triggers the next status check immediately instead of after the poll interval.
+    get_status = lambda: cmd_runner_apis.get_task_status(dnac_token, baseUrl, cmd_runner_task_id)
+    with profiler.stage('task-wait'):
+        task_status = webhook.wait_for_task(get_status, cmd_runner_task_id, waiter=waiter)
+    if task_status['isError']:
+        logging.error(f'Command Runner has reported an error: {task_status}')
+        result['status_code'] = task_status.get('statusCode', 500)
+        result['status'] = task_status
+        result['filename'] = None
+        result['location'] = None
+    elif 'endTime' in task_status.keys():
+        file_info = json.loads(task_status['progress'])
+        # Initiate file download once File ID becomes available.
+        with profiler.stage('write'):
+            result = cmd_runner_apis.download_file_by_id(dnac_token, baseUrl, file_info['fileId'])
+    else:
+        logging.info(f'Task ID {cmd_runner_task_id} has not completed yet. Please check for a problem in DNAC.')
+        logging.error(f'Task may be stuck, key "endTime" not found in status output: {task_status}')
+        result['status_code'] = 500
+        result['status'] = task_status
+        result['filename'] = None
+        result['location'] = None
+
+    return result
+
+
+def run_cached_command_request(dnac_token, baseUrl, body_params, cache, cached, groups, waiter=None):
+    # param dnac_token, baseUrl: Strings containing API token and API base URL
+    # param body_params: Dictionary of body parameters for the Command Runner request
+    # param cache: result_cache.ResultCache object
+    # param cached, groups: Cache hits and groups of cache misses from "result_cache.split_cached"
+    # param waiter: Optional utils.webhook.TaskWaiter fed by a webhook receiver
+    # return result: Dictionary containing "status_code", "status", "filename", "location" of the combined result
+    # file, plus "cache_hits" and "cache_misses" counts. Only commands missing from the cache are sent to DNAC. If a
+    # group fails, the cache hits and the other groups are still merged; the status code and status of the failure
+    # are returned, and "failed_groups" lists the devices and commands that were not collected.
+
+    result_files = []
+    failed_groups = []
+    for device_uuids, commands in groups:
+        group_params = dict(body_params, deviceUuids=device_uuids, commands=commands)
+        result = run_command_request(dnac_token, baseUrl, group_params, waiter)
+        if result['status_code'] != 200:
+            logging.error(f'Command Runner request failed for {len(device_uuids)} devices: {result["status"]}')
+            failed_groups.append({'deviceUuids': device_uuids, 'commands': commands,
+                                  'status_code': result['status_code'], 'status': result['status']})
+            continue
+        cache.store_results(result['location'])
+        result_files.append(result['location'])
+
+    with profiler.stage('write'):
+        result = result_cache.write_merged_file(cached, result_files)
+    result['cache_hits'] = sum(len(v) for v in cached.values())
+    result['cache_misses'] = sum(len(uuids) * len(commands) for uuids, commands in groups)
+    if failed_groups:
+        result['status_code'] = failed_groups[0]['status_code']
+        result['status'] = (f'{len(failed_groups)} of {len(groups)} Command Runner requests failed. Cached and '
+                            f'successfully collected results are combined in the result file.')
+        result['failed_groups'] = failed_groups
+    return result
 
 
 def main(arguments):
@@ -49,22 +161,40 @@ def main(arguments):
     # "/dna/intent/api/v1/network-device-poller/cli/read-request" endpoint
     # return result: Dictionary containing status of Command Runner request
 
-    # Create result object for final return. Keys should be "status_code", "status", "filename", "location"
-    result = {}
-
     # Parse arguments, separate out logging and "valid commands" arguments from the rest
     body_params = {}
     logging_level = ''
     logging_file = ''
+    metrics_dir = None
+    profile_options = {}
     valid_commands = False
+    parse_options = {}
+    cache_ttl = 0
+    cache_file = result_cache.DEFAULT_CACHE_FILE
+    schedule_options = {}
+    webhook_options = {}
     for key, value in arguments.items():
         if key == 'logging_level':
             logging_level = value
         elif key == 'logging_file':
             logging_file = value
+        elif key == 'metrics_dir':
+            metrics_dir = value
+        elif key in ['profile', 'profile_dir']:
+            profile_options[key] = value
         elif key == 'valid_commands':
             if value:
                 valid_commands = True
+        elif key in ['parse', 'parse_output', 'templates', 'workers']:
+            parse_options[key] = value
+        elif key == 'cache_ttl':
+            cache_ttl = value or 0
+        elif key == 'cache_file':
+            cache_file = value or cache_file
+        elif key in ['interval', 'batch_size', 'iterations']:
+            schedule_options[key] = value
+        elif key in ['webhook', 'webhook_host', 'webhook_auth']:
+            webhook_options[key] = value
         elif key in ['timeout', 'name', 'description'] or value is None:
             body_params[key] = value
         else:
@@ -73,100 +203,95 @@ def main(arguments):
 
     # Configure Logging
     logger.logger(logging_level, logging_file)
+    metrics.report_at_exit(metrics_dir, 'command_runner')
+    if profile_options.get('profile'):
+        profiler.enable(profile_options['profile'], 'command_runner', profile_options['profile_dir'])
     logging.debug(f'Setting "body_params" to: {body_params}')
 
     # Pull in DNAC config details from "config.ini"
     dnac_server, dnac_port, dnac_username, dnac_password = get_config.get_config()
-
-    # Authenticate to DNAC
-    logging.info('Authenticating to DNAC.')
-    dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server, port=dnac_port)
-    logging.debug(f'Setting "dnac_token" to: {dnac_token}')
-
     baseUrl = f'https://{dnac_server}:{dnac_port}/dna/intent/api'
+    # The cache and the scheduled collection store are kept per cluster when several clusters are queried at once
+    cache = result_cache.ResultCache(get_config.cluster_path(cache_file)) if cache_ttl > 0 else None
 
     # If "valid_commands" option specified, run "get_accepted_commands" only then exit script
     if valid_commands:
         logging.info('Getting list of accepted command keywords for Command Runner.')
-        response = cmd_runner_apis.get_accepted_commands(dnac_token, baseUrl)
+        response = cache.get_accepted_commands(baseUrl, cache_ttl) if cache else None
+        if response is None:
+            dnac_token = authenticate(dnac_server, dnac_port, dnac_username, dnac_password)
+            response = cmd_runner_apis.get_accepted_commands(dnac_token, baseUrl)
+            if cache:
+                cache.store_accepted_commands(baseUrl, response)
         logging.debug(f'Valid commands: {response}')
         logging.debug('Option "valid_commands" passed to script - gracefully exiting.')
         return response
-        sys.exit(0)
 
     # Check if commands and device IDs were specified.
     if body_params['commands'] is None or body_params['deviceUuids'] is None:
         logging.error(f'Error: Commands and Device IDs must be specified: {body_params}')
         raise Exception('You must specific one or more commands and device IDs to run them on.')
 
-    # Make Command Runner request; task will be queued and task ID will be provided
-    cmd_runner_result, cmd_runner_status_code = cmd_runner_apis.request_run_command(dnac_token, baseUrl, body_params)
+    waiter = None
+    receiver = None
+    if webhook_options.get('webhook'):
+        # Task notifications pushed by DNAC wake the task status checks early
+        waiter = webhook.TaskWaiter()
+        receiver = webhook.WebhookReceiver(waiter.notify, webhook_options.get('webhook_host') or webhook.DEFAULT_HOST,
+                                           webhook_options['webhook'],
+                                           authorization=webhook_options.get('webhook_auth')).start()
+    try:
+        if schedule_options.get('interval'):
+            # Long-running collection; one token is reused and renewed only when it nears expiry
+            token_manager = auth.TokenManager(dnac_server, dnac_port, dnac_username, dnac_password)
+            return collector.run_schedule(token_manager, baseUrl, body_params,
+                                          partial(run_command_request, waiter=waiter), schedule_options['interval'],
+                                          schedule_options.get('batch_size') or 100,
+                                          schedule_options.get('iterations'),
+                                          get_config.cluster_path(collector.DEFAULT_STORE_DIR))
 
-    # Check output of Command Runner results
-    if cmd_runner_status_code == 200:
-        # Get Task ID from response; we will ignore included URL and simply hard-code it
-        cmd_runner_task_id = cmd_runner_result['taskId']
-        logging.info(f'Received Task ID: {cmd_runner_task_id}')
-    elif cmd_runner_status_code == 201 or cmd_runner_status_code == 202:
-        # Unsure what a 201 or 202 result looks like, check if Task ID exists.
-        if 'taskId' in cmd_runner_result.keys():
-            cmd_runner_task_id = cmd_runner_result['taskId']
-            logging.info(f'Received Task ID: {cmd_runner_task_id}')
+        if cache:
+            with profiler.stage('cache'):
+                cached, groups = result_cache.split_cached(cache, body_params['deviceUuids'],
+                                                           body_params['commands'], cache_ttl)
+            # Only authenticate if something has to be sent to DNAC
+            dnac_token = authenticate(dnac_server, dnac_port, dnac_username, dnac_password) if groups else None
+            result = run_cached_command_request(dnac_token, baseUrl, body_params, cache, cached, groups, waiter)
         else:
-            logging.error(f'Command Runner request may not have been successful: {cmd_runner_result}')
-            result['status_code'] = cmd_runner_status_code
-            result['status'] = cmd_runner_result
-            result['filename'] = None
-            result['location'] = None
-            return result
-    else:
-        logging.error(f'Command Runner request may not have been successful: {cmd_runner_result}')
-        result['status_code'] = cmd_runner_status_code
-        result['status'] = cmd_runner_result
-        result['filename'] = None
-        result['location'] = None
-        return result
+            dnac_token = authenticate(dnac_server, dnac_port, dnac_username, dnac_password)
+            result = run_command_request(dnac_token, baseUrl, body_params, waiter)
+    finally:
+        if receiver:
+            receiver.stop()
 
-    # If Command Runner POST successful, get status of task and check if finished
-    counter = 1
-    while True:
-        task_status = cmd_runner_apis.get_task_status(dnac_token, baseUrl, cmd_runner_task_id)
-        if task_status['isError']:
-            logging.error(f'Command Runner has reported an error: {task_status}')
-            result['status_code'] = 500
-            result['status'] = task_status
-            result['filename'] = None
-            result['location'] = None
-            break
-        elif 'endTime' in task_status.keys():
-            file_info = json.loads(task_status['progress'])
-            # Initiate file download once File ID becomes available.
-            result = cmd_runner_apis.download_file_by_id(dnac_token, baseUrl, file_info['fileId'])
-            break
-        elif counter <= 4:
-            logging.info(f'Currently waiting on Task ID {cmd_runner_task_id} to finish. Attempt #{counter}')
-            logging.debug(f'Task is still pending, attempt #{counter}: {task_status}')
-            counter += 1
-            time.sleep(3)
-        else:
-            logging.info(f'Task ID {cmd_runner_task_id} has not completed yet. Please check for a problem in DNAC.')
-            logging.error(f'Task may be stuck, key "endTime" not found in status output: {task_status}')
-            result['status_code'] = 500
-            result['status'] = task_status
-            result['filename'] = None
-            result['location'] = None
-            break
+    if parse_options.get('parse') and result['location']:
+        # Convert the result file into per-device, per-command records
+        with profiler.stage('post-process'):
+            result['parsed'] = output_parser.process_result_file(
+                result['location'], (parse_options.get('parse_output') or 'ndjson').lower(),
+                workers=parse_options.get('workers') or 4, template_dir=parse_options.get('templates'))
 
     return result
 
 
-if __name__ == '__main__':
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
     # Parse incoming arguments
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog=prog)
     log_settings = parser.add_argument_group('Log Settings')
     log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
                                     'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET')
     log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.')
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics, as a '
+                              'Prometheus text file and a JSON run summary.')
+    log_settings.add_argument('--profile', nargs='?', const='time', choices=profiler.MODES, help='Time each stage '
+                              '(auth, cache, request, task-wait, write, post-process) and save a flame graph of '
+                              'sampled stacks. "cprofile" also runs each stage under cProfile, "tracemalloc" reports '
+                              'the lines allocating the most memory per stage. Default mode is "time".')
+    log_settings.add_argument('--profile_dir', type=str, default='profile', help='Directory for profile output. '
+                              'Default is "profile".')
 
     cmd_runner_options = parser.add_argument_group('Command Runner Parameters')
     cmd_runner_options.add_argument('--valid_commands', help='Return a list of valid command keywords'
@@ -178,8 +303,59 @@ if __name__ == '__main__':
                                             'run.')
     cmd_runner_options.add_argument('--deviceUuids', type=str, help='Comma separated double-quoted list of device UUIDs.')
 
-    args = parser.parse_args()
+    cache_settings = parser.add_argument_group('Result Cache')
+    cache_settings.add_argument('--cache_ttl', type=int, help='Reuse command output and the accepted commands list '
+                                                              'collected within this many seconds. Default is 0 '
+                                                              '(cache disabled).', default=0)
+    cache_settings.add_argument('--cache_file', type=str, help='SQLite file used to store cached results.',
+                                default=result_cache.DEFAULT_CACHE_FILE)
+
+    schedule_settings = parser.add_argument_group('Scheduled Collection')
+    schedule_settings.add_argument('--interval', type=int, help='Run the commands repeatedly, starting a new '
+                                                                'collection every INTERVAL seconds. Only outputs that '
+                                                                'changed are written to "files/collection/deltas/".')
+    schedule_settings.add_argument('--batch_size', type=int, help='Number of devices per Command Runner request in '
+                                                                  'scheduled mode. Batches are staggered across the '
+                                                                  'interval.', default=100)
+    schedule_settings.add_argument('--iterations', type=int, help='Stop after this many scheduled collections. '
+                                                                  'Default is to run until interrupted.')
+
+    webhook_settings = parser.add_argument_group('Webhook Notifications')
+    webhook_settings.add_argument('--webhook', type=int, help='Listen on this TCP port for task notifications pushed '
+                                                              'by DNAC to a REST webhook destination, so finished '
+                                                              'tasks are picked up without waiting for the next poll.')
+    webhook_settings.add_argument('--webhook_host', type=str, default=webhook.DEFAULT_HOST, help='Address the '
+                                  'webhook receiver listens on. Default is "127.0.0.1", which only accepts '
+                                  'notifications relayed on this host; use "0.0.0.0" with --webhook_auth to accept '
+                                  'them from DNAC directly.')
+    webhook_settings.add_argument('--webhook_auth', type=str, help='"Authorization" header value the webhook '
+                                                                   'destination is configured to send.')
+
+    parse_settings = parser.add_argument_group('Output Parsing')
+    parse_settings.add_argument('--parse', help='Parse the downloaded result file into per-device, per-command '
+                                                'records.', action='store_true')
+    parse_settings.add_argument('--parse_output', type=str, help='Format for parsed records. Possible values are: '
+                                                                 'ndjson, sqlite', default='ndjson')
+    parse_settings.add_argument('--templates', type=str, help='Directory of TextFSM templates named after the '
+                                                              'command they parse, e.g. "show_version.textfsm".')
+    parse_settings.add_argument('--workers', type=int, help='Number of parser worker processes.', default=4)
+
+    args = parser.parse_args(argv)
+    return args
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Print the result
+    # return: Result of "main"
     arg_dict = vars(args)  # Convert "args" Namespace to a Dictionary
 
     result = main(arg_dict)
-    pp(result, indent=4)
+    if show:
+        with profiler.stage('output'):
+            pp(result, indent=4)
+    return result
+
+
+if __name__ == '__main__':
+    run(parse_args())
@@ -0,0 +1,278 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import sys
+import os
+import re
+import json
+import sqlite3
+import argparse
+from itertools import islice
+from multiprocessing import Pool
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import json_stream
+
+# Command Runner groups the output of each command under one of these status keys
+RESULT_STATUSES = ['SUCCESS', 'FAILURE', 'BLACKLISTED']
+
+# Registered parsers, keyed by normalized command string. Each parser accepts the raw CLI text and returns a list
+# of dictionaries. Parsers registered before "process_result_file" is called are sent to the worker processes, so
+# they must be picklable: module level functions or instances of a class like "TextfsmParser", not lambdas.
+PARSERS = {}
+
+
+def normalize_command(command):
+    # param command: String containing a CLI command
+    # return: Lower case command with repeated whitespace collapsed, used for parser and cache lookups
+
+    return ' '.join(command.lower().split())
+
+
+def register_parser(command, parser):
+    # param command: String containing the CLI command the parser handles (e.g. "show inventory")
+    # param parser: Callable accepting the CLI text output and returning a list of dictionaries
+
+    PARSERS[normalize_command(command)] = parser
+    logging.debug(f'Registered parser for command: {normalize_command(command)}')
+
+
+def get_parser(command):
+    # param command: String containing a CLI command
+    # return: Parser for the longest registered command matching the start of "command", or None
+
+    command = normalize_command(command)
+    match = None
+    for registered in PARSERS:
+        if command == registered or command.startswith(registered + ' '):
+            if match is None or len(registered) > len(match):
+                match = registered
+    return PARSERS[match] if match else None
+
+
+class TextfsmParser:
+    # Parser running a TextFSM template against CLI text output. A class rather than a closure so that it can be
+    # pickled and sent to the worker processes. The "textfsm" package is only imported when a template is used.
+
+    def __init__(self, template_file):
+        # param template_file: Path to a TextFSM template file
+        with open(template_file) as f:
+            self.template = f.read()
+
+    def __call__(self, text):
+        import io
+        import textfsm  # External package from PyPi, only needed when TextFSM templates are in use
+        fsm = textfsm.TextFSM(io.StringIO(self.template))
+        headers = [h.lower() for h in fsm.header]
+        return [dict(zip(headers, row)) for row in fsm.ParseText(text)]
+
+
+def textfsm_parser(template_file):
+    # param template_file: Path to a TextFSM template file
+    # return: Parser that runs the template against CLI text output
+
+    return TextfsmParser(template_file)
+
+
+def load_textfsm_templates(template_dir):
+    # param template_dir: Directory containing TextFSM templates, named after the command they parse with underscores
+    # in place of spaces (e.g. "show_ip_interface_brief.textfsm")
+    # return: Number of templates registered
+
+    count = 0
+    for filename in sorted(os.listdir(template_dir)):
+        if not filename.endswith('.textfsm'):
+            continue
+        command = filename[:-len('.textfsm')].replace('_', ' ')
+        register_parser(command, textfsm_parser(os.path.join(template_dir, filename)))
+        count += 1
+    logging.info(f'Loaded {count} TextFSM templates from "{template_dir}".')
+    return count
+
+
+_INVENTORY_RE = re.compile(r'NAME:\s*"(?P<name>[^"]*)",\s*DESCR:\s*"(?P<descr>[^"]*)"\s*'
+                           r'PID:\s*(?P<pid>[^,]*?)\s*,\s*VID:\s*(?P<vid>[^,]*?)\s*,\s*SN:\s*(?P<sn>\S*)')
+
+
+def parse_show_inventory(text):
+    # param text: String containing "show inventory" CLI output
+    # return: List of dictionaries, one per inventory item
+
+    return [match.groupdict() for match in _INVENTORY_RE.finditer(text)]
+
+
+register_parser('show inventory', parse_show_inventory)
+
+
+def iter_result_records(result_file):
+    # param result_file: Path to a Command Runner result file downloaded by "cmd_runner_apis.download_file_by_id"
+    # return: Generator of per-device, per-command records containing "deviceUuid", "command", "status", "output"
+    # The file is read incrementally, one device at a time.
+
+    with open(result_file, 'r', encoding='utf-8') as f:
+        for device in json_stream.iter_json_array(f):
+            device_uuid = device.get('deviceUuid')
+            responses = device.get('commandResponses') or {}
+            for status in RESULT_STATUSES:
+                for command, output in (responses.get(status) or {}).items():
+                    yield {'deviceUuid': device_uuid, 'command': command, 'status': status, 'output': output}
+
+
+def parse_record(record):
+    # param record: Dictionary produced by "iter_result_records"
+    # return: Copy of the record with "parsed" (list or None) and "parse_error" (string or None) keys added
+
+    result = dict(record)
+    result['parsed'] = None
+    result['parse_error'] = None
+    if record['status'] != 'SUCCESS':
+        return result
+    parser = get_parser(record['command'])
+    if parser is None:
+        return result
+    try:
+        result['parsed'] = parser(record['output'])
+    except Exception as e:
+        result['parse_error'] = f'{type(e).__name__}: {e}'
+    return result
+
+
+def _init_worker(parsers):
+    # Worker process initializer, registers the parent's parsers in each process of the pool. Workers started with
+    # the "spawn" or "forkserver" method only see the parsers registered at import time otherwise.
+    PARSERS.update(parsers)
+
+
+class NdjsonSink:
+    # Writes parsed records to a newline delimited JSON file, one record per line.
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, 'w', encoding='utf-8')
+
+    def write(self, records):
+        for record in records:
+            self.file.write(json.dumps(record) + '\n')
+
+    def close(self):
+        self.file.close()
+
+
+class SqliteSink:
+    # Writes parsed records to a SQLite database table named "results".
+
+    def __init__(self, filename):
+        self.filename = filename
+        if os.path.exists(filename):
+            os.remove(filename)  # Start with an empty table so re-parsing a file does not duplicate rows
+        self.db = sqlite3.connect(filename)
+        self.db.execute('CREATE TABLE IF NOT EXISTS results (device_uuid TEXT, command TEXT, status TEXT, '
+                        'output TEXT, parsed TEXT, parse_error TEXT)')
+
+    def write(self, records):
+        rows = [(r['deviceUuid'], r['command'], r['status'], r['output'],
+                 json.dumps(r['parsed']) if r['parsed'] is not None else None, r['parse_error']) for r in records]
+        self.db.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)', rows)
+        self.db.commit()
+
+    def close(self):
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_device ON results (device_uuid)')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_command ON results (command, status)')
+        self.db.commit()
+        self.db.close()
+
+
+def process_result_file(result_file, output_format='ndjson', output_file=None, workers=4, template_dir=None,
+                        batch_size=500):
+    # param result_file: Path to a Command Runner result file
+    # param output_format: String, "ndjson" or "sqlite"
+    # param output_file: Path for the output file. Defaults to the result file name with a new extension.
+    # param workers: Number of worker processes used to run parsers; 1 or less parses in the current process
+    # param template_dir: Optional directory of TextFSM templates to register
+    # param batch_size: Number of records handed to the worker pool at a time, which bounds memory use
+    # return result: Dictionary containing record counts by status, parser error count, filename and location
+
+    if output_file is None:
+        output_file = os.path.splitext(result_file)[0] + ('.db' if output_format == 'sqlite' else '.ndjson')
+    sink = SqliteSink(output_file) if output_format == 'sqlite' else NdjsonSink(output_file)
+    logging.info(f'Parsing Command Runner results from "{result_file}" into "{output_file}".')
+
+    result = {'records': 0, 'parsed': 0, 'parse_errors': 0}
+    for status in RESULT_STATUSES:
+        result[status] = 0
+
+    if template_dir:
+        load_textfsm_templates(template_dir)
+    records = iter_result_records(result_file)
+    pool = Pool(workers, initializer=_init_worker, initargs=(dict(PARSERS),)) if workers > 1 else None
+    try:
+        while True:
+            batch = list(islice(records, batch_size))
+            if not batch:
+                break
+            if pool:
+                parsed = pool.map(parse_record, batch, chunksize=max(1, len(batch) // (workers * 4)))
+            else:
+                parsed = [parse_record(record) for record in batch]
+            sink.write(parsed)
+            for record in parsed:
+                result['records'] += 1
+                result[record['status']] += 1
+                if record['parsed'] is not None:
+                    result['parsed'] += 1
+                if record['parse_error']:
+                    result['parse_errors'] += 1
+                    logging.warning(f'Parser failed for "{record["command"]}" on {record["deviceUuid"]}: '
+                                    f'{record["parse_error"]}')
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+        sink.close()
+
+    result['filename'] = os.path.basename(output_file)
+    result['location'] = os.path.abspath(output_file)
+    logging.info(f'Parsed {result["records"]} Command Runner records.')
+    return result
+
+
+if __name__ == '__main__':
+    # Parse incoming arguments
+    parser = argparse.ArgumentParser(description='Parse a Command Runner result file into per-device, per-command '
+                                                 'records and save them as NDJSON or SQLite.')
+    parser.add_argument('result_file', type=str, help='Command Runner result file saved in the "files/" directory.')
+    parser.add_argument('--parse_output', type=str, default='ndjson', help='Output format. Possible values are: '
+                                                                           'ndjson, sqlite')
+    parser.add_argument('--output_file', type=str, help='Filename to use for the parsed output.')
+    parser.add_argument('--templates', type=str, help='Directory of TextFSM templates named after the command they '
+                                                      'parse, e.g. "show_ip_interface_brief.textfsm".')
+    parser.add_argument('--workers', type=int, default=4, help='Number of parser worker processes.')
+    args = parser.parse_args()
+
+    print(json.dumps(process_result_file(args.result_file, args.parse_output.lower(), args.output_file, args.workers,
+                                         args.templates), indent=4))
@@ -0,0 +1,154 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import pathlib
+import os
+import json
+import sqlite3
+import time
+import uuid
+import sys
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import get_config
+from output_parser import normalize_command, iter_result_records
+
+DEFAULT_CACHE_FILE = 'files/command_cache.db'
+
+
+class ResultCache:
+    # SQLite backed cache of Command Runner output, keyed on (device UUID, normalized command), plus the list of
+    # accepted commands for each DNAC cluster. Entries older than the TTL given at lookup time are treated as misses.
+
+    def __init__(self, filename=DEFAULT_CACHE_FILE):
+        pathlib.Path(os.path.dirname(filename) or '.').mkdir(parents=True, exist_ok=True)
+        self.filename = filename
+        self.db = sqlite3.connect(filename)
+        self.db.execute('CREATE TABLE IF NOT EXISTS command_results (device_uuid TEXT, command TEXT, '
+                        'stored_at REAL, output TEXT, PRIMARY KEY (device_uuid, command))')
+        self.db.execute('CREATE TABLE IF NOT EXISTS accepted_commands (server TEXT PRIMARY KEY, stored_at REAL, '
+                        'commands TEXT)')
+        self.db.commit()
+
+    def get_result(self, device_uuid, command, ttl):
+        # param device_uuid, command: Strings identifying the cached output
+        # param ttl: Maximum age of the cached output in seconds
+        # return: Cached CLI output string, or None on a miss
+        row = self.db.execute('SELECT output FROM command_results WHERE device_uuid = ? AND command = ? AND '
+                              'stored_at >= ?', (device_uuid, normalize_command(command), time.time() - ttl)).fetchone()
+        return row[0] if row else None
+
+    def store_results(self, result_file):
+        # param result_file: Path to a Command Runner result file
+        # return: Number of outputs stored. Only SUCCESS outputs are cached, failures are always retried.
+        now = time.time()
+        rows = ((r['deviceUuid'], normalize_command(r['command']), now, r['output'])
+                for r in iter_result_records(result_file) if r['status'] == 'SUCCESS')
+        before = self.db.total_changes
+        self.db.executemany('INSERT OR REPLACE INTO command_results VALUES (?, ?, ?, ?)', rows)
+        self.db.commit()
+        return self.db.total_changes - before
+
+    def get_accepted_commands(self, server, ttl):
+        # param server: String identifying the DNAC cluster (base URL)
+        # param ttl: Maximum age of the cached list in seconds
+        # return: Cached list of accepted commands, or None on a miss
+        row = self.db.execute('SELECT commands FROM accepted_commands WHERE server = ? AND stored_at >= ?',
+                              (server, time.time() - ttl)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def store_accepted_commands(self, server, commands):
+        self.db.execute('INSERT OR REPLACE INTO accepted_commands VALUES (?, ?, ?)',
+                        (server, time.time(), json.dumps(commands)))
+        self.db.commit()
+
+    def purge(self, ttl):
+        # param ttl: Entries older than this many seconds are deleted
+        cutoff = time.time() - ttl
+        self.db.execute('DELETE FROM command_results WHERE stored_at < ?', (cutoff,))
+        self.db.execute('DELETE FROM accepted_commands WHERE stored_at < ?', (cutoff,))
+        self.db.commit()
+
+    def close(self):
+        self.db.close()
+
+
+def split_cached(cache, device_uuids, commands, ttl):
+    # param cache: ResultCache object
+    # param device_uuids, commands: Lists of requested device UUIDs and commands
+    # param ttl: Maximum age of cached output in seconds
+    # return cached, groups: Dictionary of {device_uuid: {command: output}} for cache hits, and a list of
+    # (device_uuids, commands) tuples to submit to Command Runner. Devices missing the same set of commands are
+    # grouped into a single request.
+
+    cached = {}
+    missing = {}
+    for device_uuid in device_uuids:
+        for command in commands:
+            output = cache.get_result(device_uuid, command, ttl)
+            if output is None:
+                missing.setdefault(device_uuid, []).append(command)
+            else:
+                cached.setdefault(device_uuid, {})[command] = output
+
+    groups = {}
+    for device_uuid, device_commands in missing.items():
+        groups.setdefault(tuple(device_commands), []).append(device_uuid)
+    logging.info(f'Command Runner cache: {sum(len(v) for v in cached.values())} hits, '
+                 f'{sum(len(v) for v in missing.values())} misses.')
+    return cached, [(uuids, list(group_commands)) for group_commands, uuids in groups.items()]
+
+
+def write_merged_file(cached, result_files):
+    # param cached: Dictionary of {device_uuid: {command: output}} answered from the cache
+    # param result_files: List of Command Runner result files downloaded for the cache misses
+    # return result: Dictionary containing the "status_code", "status", "filename" and "location" of a result file
+    # in the same format as the one downloaded from DNAC, combining the cached and freshly collected output.
+
+    devices = {}
+    for result_file in result_files:
+        for r in iter_result_records(result_file):
+            responses = devices.setdefault(r['deviceUuid'], {'SUCCESS': {}, 'FAILURE': {}, 'BLACKLISTED': {}})
+            responses[r['status']][r['command']] = r['output']
+    for device_uuid, outputs in cached.items():
+        responses = devices.setdefault(device_uuid, {'SUCCESS': {}, 'FAILURE': {}, 'BLACKLISTED': {}})
+        responses['SUCCESS'].update(outputs)
+
+    # A random suffix keeps runs started within the same second from writing to the same file
+    timestamp = time.strftime("%Y-%m-%d_%I-%M-%S%p_%Z", time.localtime())
+    filename = get_config.cluster_path(f'command_runner_{timestamp}_{uuid.uuid4().hex[:8]}.json')
+    pathlib.Path('files/').mkdir(parents=True, exist_ok=True)
+    with open(f'files/{filename}', 'w') as f:
+        json.dump([{'deviceUuid': k, 'commandResponses': v} for k, v in devices.items()], f)
+
+    result = {}
+    result['status_code'] = 200
+    result['status'] = 'The request was successful. Cached and new results are combined in the result file.'
+    result['filename'] = filename
+    result['location'] = os.path.abspath(f'files/{filename}')
+    return result
@@ -21,16 +21,27 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
 import sys
+import os
 import logging
 
+# Append parent directory to path so we can import from top-level packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client, logger
+
+# Maximum number of devices returned by one "Get Device List" call
+DEVICE_PAGE_SIZE = 500
+
 
 def get_device_info(dnac_token, baseUrl, **kwargs):
     # param query_params: Dictionary of accepted query params for "/dna/intent/api/v1/network-device" endpoint.
     # param dnac_token: String containing the DNA Center JWT from auth.py
     # param baseUrl: String containing the DNA Center server IP, port and base URL
-    # return result: JSON output of API endpoint
+    # return result: JSON output of API endpoint, with the devices of every page unless the query parameters
+    # set "offset" or "limit"
 
     query_params = kwargs.get('query_params', None)
     logging.debug(f'Received the following query parameters: {query_params}')
@@ -45,31 +56,42 @@ def get_device_info(dnac_token, baseUrl, **kwargs):
     url = f'{baseUrl}/v1/network-device'
     header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
 
-    if query_params:
-        device_info = requests.get(url, headers=header, params=query_params, verify=False)
-    else:
-        device_info = requests.get(url, headers=header, verify=False)
-    result = device_info.json()
-    logging.debug(f'Device list info obtained: {result.text}')
-    return result['response']
+    if query_params and ('offset' in query_params or 'limit' in query_params):
+        device_info = http_client.get(url, headers=header, params=query_params, verify=False)
+        logger.log_response('Device list info obtained', device_info)
+        return device_info.json()['response']
+
+    # The API returns at most "DEVICE_PAGE_SIZE" devices per call, so request pages until a short one arrives
+    result = []
+    offset = 1  # The "offset" parameter of this API is 1-based
+    while True:
+        params = dict(query_params or {}, offset=offset, limit=DEVICE_PAGE_SIZE)
+        device_info = http_client.get(url, headers=header, params=params, verify=False)
+        logger.log_response('Device list info obtained', device_info)
+        page = device_info.json()['response']
+        result.extend(page)
+        if len(page) < DEVICE_PAGE_SIZE:
+            break
+        offset += DEVICE_PAGE_SIZE
+    return result
 
 
 def get_compliance_details(iterable_list):
     # param iterable_list: List containing "dnac_token", "baseUrl", "hostname", "deviceUuid"
     # return result: JSON output of API endpoint
 
-    logging.debug(f'Received iterable list argument: {iterable_list}')
+    logging.debug('Received compliance request for device: %s (%s)', iterable_list[2], iterable_list[3])
     dnac_token, baseUrl, hostname, deviceUuid = iterable_list
     header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
     url = f'{baseUrl}/v1/compliance/{deviceUuid}/detail?diffList=True'
-    r = requests.get(url, headers=header, verify=False)
+    r = http_client.get(url, headers=header, verify=False)
     output = r.json()
     result = output['response']
 
     # Insert device hostname into each dictionary because it is not part of compliance output
     for item in result:
         item['hostname'] = hostname
-    logging.debug(f'Obtained compliance info: {result}')
+    logging.debug('Obtained compliance info for %s: %s', hostname, logger.Preview(result))
     return result
 
 
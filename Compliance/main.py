@@ -23,7 +23,6 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 
 import compliance_apis
 import logging
-import urllib3
 import sys
 import os
 import argparse
@@ -33,14 +32,10 @@ currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
-from utils import auth, logger, get_config
+from utils import auth, logger, get_config, columnar, metrics, profiler
 from pprint import pprint as pp
 from multiprocessing.pool import ThreadPool
 from configparser import ConfigParser, Error
-from urllib3.exceptions import InsecureRequestWarning
-
-# Disable certificate warnings
-urllib3.disable_warnings(InsecureRequestWarning)
 
 
 def get_device_uuid(device_info):
@@ -52,7 +47,7 @@ def get_device_uuid(device_info):
     for item in device_info:
         device = {'hostname': item['hostname'], 'id': item['id']}
         device_uuids.append(device)
-    logging.debug(f'List of unique devices: {device_uuids}')
+    logging.debug('List of unique devices: %s', logger.Preview(device_uuids))
     return device_uuids
 
 
@@ -75,12 +70,21 @@ def compliance_status(dnac_token, baseUrl, device_uuid):
         iterable_list.append((dnac_token, baseUrl, hostname, id))
     with ThreadPool(10) as pool:
         # Call the "get_compliance_details" function with arguments from "iterable_list"
-        for output in pool.imap_unordered(compliance_apis.get_compliance_details, iterable_list):
-            logging.debug(f'Compliance result: {output}')
+        for output in pool.imap_unordered(*metrics.queued(compliance_apis.get_compliance_details, iterable_list)):
+            logging.debug('Compliance result: %s', logger.Preview(output))
             result.append(output)
     return result
 
 
+def compliance_rows(compliance_info):
+    # param compliance_info: List of per-device lists of compliance dictionaries, as returned by "compliance_status"
+    # return: Generator of one flat dictionary per device and compliance type
+
+    for device_result in compliance_info:
+        for item in device_result or []:
+            yield item
+
+
 def main(arguments):
     # param arguments: Dictionary of logging settings and accepted query params for
     # "/dna/intent/api/v1/network-device" endpoint
@@ -90,16 +94,28 @@ def main(arguments):
     query_params = {}
     logging_level = ''
     logging_file = ''
+    metrics_dir = None
+    profile_options = {}
+    parquet_file = None
     for key, value in arguments.items():
         if key == 'logging_level':
             logging_level = value
         elif key == 'logging_file':
             logging_file = value
+        elif key == 'metrics_dir':
+            metrics_dir = value
+        elif key in ['profile', 'profile_dir']:
+            profile_options[key] = value
+        elif key == 'parquet':
+            parquet_file = value
         else:
             query_params[key] = value
 
     # Configure Logging
     logger.logger(logging_level, logging_file)
+    metrics.report_at_exit(metrics_dir, 'compliance')
+    if profile_options.get('profile'):
+        profiler.enable(profile_options['profile'], 'compliance', profile_options['profile_dir'])
     logging.debug(f'Setting "query_params" to: {query_params}')
 
     # Pull in DNAC config details from "config.ini"
@@ -107,7 +123,9 @@ def main(arguments):
 
     # Authenticate to DNAC
     logging.info('Authenticating to DNAC.')
-    dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server, port=dnac_port)
+    with profiler.stage('auth'):
+        dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server,
+                                       port=dnac_port)
     logging.debug(f'Setting "dnac_token" to: {dnac_token}')
 
     baseUrl = f'https://{dnac_server}:{dnac_port}/dna/intent/api'
@@ -115,39 +133,61 @@ def main(arguments):
     # Check for existence of arguments, determine whether list of device UUIDs was provided or must be obtained.
     device_uuid = []
     logging.info('Checking for "Get Device List" query parameters.')
-    try:
-        if query_params:
-            # Get list of device UUIDs from full device list JSON output.
-            device_info = compliance_apis.get_device_info(dnac_token, baseUrl, query_params=query_params)
-            device_uuid = get_device_uuid(device_info)
-            logging.debug(f'Obtained list of device UUIDs: {device_uuid}')
-        else:
+    with profiler.stage('inventory'):
+        try:
+            if query_params:
+                # Get list of device UUIDs from full device list JSON output.
+                device_info = compliance_apis.get_device_info(dnac_token, baseUrl, query_params=query_params)
+                device_uuid = get_device_uuid(device_info)
+                logging.debug('Obtained list of device UUIDs: %s', logger.Preview(device_uuid))
+            else:
+                # Get list of device UUIDs from full device list JSON output
+                device_info = compliance_apis.get_device_info(dnac_token, baseUrl)
+                device_uuid = get_device_uuid(device_info)
+                logging.debug('Obtained list of device UUIDs: %s', logger.Preview(device_uuid))
+        except TypeError:
             # Get list of device UUIDs from full device list JSON output
+            logging.warning('Function argument is not of type "dict".')
             device_info = compliance_apis.get_device_info(dnac_token, baseUrl)
             device_uuid = get_device_uuid(device_info)
-            logging.debug(f'Obtained list of device UUIDs: {device_uuid}')
-    except TypeError:
-        # Get list of device UUIDs from full device list JSON output
-        logging.warning('Function argument is not of type "dict".')
-        device_info = compliance_apis.get_device_info(dnac_token, baseUrl)
-        device_uuid = get_device_uuid(device_info)
-        logging.debug(f'Obtained list of device UUIDs: {device_uuid}')
+            logging.debug('Obtained list of device UUIDs: %s', logger.Preview(device_uuid))
 
     # Initiate parallel processes to obtain compliance status for each device
     logging.info('Getting device compliance status and info.')
-    compliance_info = compliance_status(dnac_token, baseUrl, device_uuid)
-    logging.debug(f'Obtained list of device compliance info: {compliance_info}')
+    with profiler.stage('fan-out'):
+        compliance_info = compliance_status(dnac_token, baseUrl, device_uuid)
+    logging.debug('Obtained list of device compliance info: %s', logger.Preview(compliance_info))
+
+    if parquet_file:
+        # Typed, compressed columnar copy of the results; nested values such as "sourceInfoList" are stored as JSON
+        with profiler.stage('write'):
+            parquet_file = get_config.cluster_path(parquet_file)  # One file per cluster with --clusters
+            count = columnar.write_parquet(compliance_rows(compliance_info), parquet_file)
+        logging.info(f'Saved {count} compliance records to "{parquet_file}".')
 
     return compliance_info
 
 
-if __name__ == '__main__':
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
     # Parse incoming arguments
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(prog=prog)
     log_settings = parser.add_argument_group('Log Settings')
     log_settings.add_argument('-l', '--logging_level', help='Set logging level. Available levels are: CRITICAL, ERROR,'
                                                       ' WARNING, INFO, DEBUG, NOTSET')
     log_settings.add_argument('-f', '--logging_file', help='Filename to use for log file.')
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics, as a '
+                              'Prometheus text file and a JSON run summary.')
+    log_settings.add_argument('--profile', nargs='?', const='time', choices=profiler.MODES, help='Time each stage '
+                              '(auth, inventory, fan-out, write) and save a flame graph of sampled stacks. "cprofile" '
+                              'also runs each stage under cProfile, "tracemalloc" reports the lines allocating the most '
+                              'memory per stage. Default mode is "time".')
+    log_settings.add_argument('--profile_dir', type=str, default='profile', help='Directory for profile output. '
+                              'Default is "profile".')
+    parser.add_argument('-p', '--parquet', help='Also save the compliance results to this Parquet file. Requires the '
+                                                '"pyarrow" package.')
     query_settings = parser.add_argument_group('Query Parameters')
     query_settings.add_argument('--hostname', help='Hostname query parameter for "/dna/intent/api/v1/network-device"')
     query_settings.add_argument('--managementIpAddress', help='Management IP address query parameter for '
@@ -160,8 +200,22 @@ if __name__ == '__main__':
     query_settings.add_argument('--role', help='Role query parameter for "/dna/intent/api/v1/network-device"')
     query_settings.add_argument('--id', help='Device UUID query parameter for "/dna/intent/api/v1/network-device".'
                                      ' Accepts comma separated list of device UUIDs.')
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return args
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Print the result
+    # return: Result of "main"
     arg_dict = vars(args)  # Convert "args" Namespace to a Dictionary
 
     compliance_info = main(arg_dict)
-    pp(compliance_info, indent=4)
+    if show:
+        with profiler.stage('output'):
+            pp(compliance_info, indent=4)
+    return compliance_info
+
+
+if __name__ == '__main__':
+    run(parse_args())
@@ -21,14 +21,21 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
 import logging
 import pathlib
+import sys
 import os
 import json
 import csv
 import time
 
+# Append parent directory to path so we can import from top-level packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import get_config, http_client, logger
+
 
 def get_csv_device_uuids(csv_file):
     # params csv_file: String containing path to CSV input file
@@ -87,7 +94,7 @@ def get_hostname(dnac_token, baseUrl, deviceUuid):
     query_params = {'id': deviceUuid}
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device/'
-    r = requests.get(url, headers=header, params=query_params, verify=False)
+    r = http_client.get(url, headers=header, params=query_params, verify=False)
     output = r.json()
     if output['response']:
         for value in output['response']:
@@ -106,14 +113,14 @@ def get_sanitized_config(iterable_list):
     # return result: String, plain text output of device configuration
 
     logging.info('Requesting sanitized configuration files.')
-    logging.debug(f'Received parameters: {iterable_list}')
     dnac_token, baseUrl, hostname, deviceUuid = iterable_list
+    logging.debug('Requesting sanitized configuration for device: %s (%s)', hostname, deviceUuid)
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device/' + deviceUuid + '/config'
-    r = requests.get(url, headers=header, verify=False)
+    r = http_client.get(url, headers=header, verify=False)
     output = r.json()
     result = output['response']
-    logging.debug(f'Sanitized configuration request status was: {r.status_code}')
+    logger.log_response('Sanitized configuration response', r)
 
     return r.status_code, hostname, deviceUuid, result
 
@@ -124,14 +131,12 @@ def get_config_archive(dnac_token, baseUrl, body_params):
     # return result: Dictionary containing "status_code", "status", "filename", "location", "password"
 
     logging.info('Requesting configuration archives.')
-    logging.debug(f'Received parameters: {body_params}')
+    logging.debug('Received parameters for %s devices', len(body_params['deviceUuids']))
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device-archive/cleartext'
     payload = {'password': body_params['password'], 'deviceId': body_params['deviceUuids']}
-    logging.debug(f'Generated payload: {payload}')
-    logging.debug(f'JSON Dump of payload: {json.dumps(payload)}')
-    response = requests.post(url, headers=header, data=json.dumps(payload), verify=False)
-    logging.debug(f'Obtained response: {response}')
+    response = http_client.post(url, headers=header, data=json.dumps(payload), verify=False)
+    logger.log_response('Obtained response', response)
 
     output = response.json()
     result = output['response']
@@ -147,8 +152,8 @@ def get_task_status(dnac_token, baseUrl, task_id):
     logging.debug(f'Task ID: {task_id}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/task/' + task_id
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Obtained response: {response.status_code}: {response.text}')
+    response = http_client.get(url, headers=header, verify=False)
+    logger.log_response('Obtained response', response)
 
     # Check the status of the task and respond accordingly
     output = response.json()
@@ -168,6 +173,7 @@ def write_config_to_file(hostname, deviceUuid, config):
         filename = f'{hostname}_{deviceUuid}_{timestamp}.txt'
     else:
         filename = f'{deviceUuid}_{timestamp}.txt'
+    filename = get_config.cluster_path(filename)  # Prefixed with the cluster name when several are queried at once
     logging.info(f'Attempting to write config for {hostname} to file: {filename}')
 
     try:
@@ -198,18 +204,18 @@ def download_file_by_id(dnac_token, baseUrl, file_url):
     header = {'Content-Type': 'application/json', 'Accept-Encoding': 'gzip, deflate, br', 'Accept': '*/*',
               'x-auth-token': dnac_token}
     url = baseUrl + new_file_url
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Response headers: {response.headers}')
+    # Stream the archive so it is written to disk in chunks rather than held in memory
+    response = http_client.get(url, headers=header, verify=False, stream=True)
 
     # Create dictionary for reporting results, including filename and path where it is saved.
     result = {}
 
     # Check if response was successful (200 OK)
-    logging.debug(f'File download response was: {response.status_code}: {response.text}')
+    logger.log_response('File download response was', response, headers=True, streamed=True)
     if response.status_code == 200:
         result['status_code'] = response.status_code
         result['status'] = 'The request was successful. The result is contained in the response body.'
-        filename = response.headers['fileName']
+        filename = get_config.cluster_path(response.headers['fileName'])
         pathlib.Path('files/').mkdir(parents=True, exist_ok=True)  # Create a "files/" subdirectory if it doesn't exist
 
         # Create file and open for writing; stream data in chunks into the file.
@@ -23,25 +23,19 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 
 import config_archive_apis
 import logging
-import urllib3
 import sys
 import os
 import argparse
 import json
-import time
 
 # Append parent directory to path so we can import from external packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
-from utils import auth, logger, get_config
+from utils import auth, logger, get_config, metrics, profiler, webhook
 from multiprocessing.pool import ThreadPool
 from pprint import pprint as pp
-from urllib3.exceptions import InsecureRequestWarning
-
-# Disable certificate warnings
-urllib3.disable_warnings(InsecureRequestWarning)
 
 
 def process_sanitized_config(dnac_token, baseUrl, device_list):
@@ -61,8 +55,8 @@ def process_sanitized_config(dnac_token, baseUrl, device_list):
         iterable_list.append((dnac_token, baseUrl, hostname, uuid))
     with ThreadPool(10) as pool:
         # Call the "get_sanitized_config" function with arguments from "iterable_list"
-        for status_code, hostname, deviceUuid, output in pool.imap_unordered(config_archive_apis.get_sanitized_config,
-                                                                             iterable_list):
+        tasks = metrics.queued(config_archive_apis.get_sanitized_config, iterable_list)
+        for status_code, hostname, deviceUuid, output in pool.imap_unordered(*tasks):
             if status_code == 200:
                 # If config was retrieved successfully, write output to a file
                 file_status = config_archive_apis.write_config_to_file(hostname, deviceUuid, output)
@@ -84,15 +78,24 @@ def main(arguments):
     body_params = {}
     logging_level = ''
     logging_file = ''
+    metrics_dir = None
+    profile_options = {}
     full_config = False
+    webhook_options = {}
     for key, value in arguments.items():
         if key == 'logging_level':
             logging_level = value
         elif key == 'logging_file':
             logging_file = value
+        elif key == 'metrics_dir':
+            metrics_dir = value
+        elif key in ['profile', 'profile_dir']:
+            profile_options[key] = value
         elif key == 'full':
             if value:
                 full_config = True
+        elif key in ['webhook', 'webhook_host', 'webhook_auth']:
+            webhook_options[key] = value
         elif key in ['password', 'csv_file'] or value is None:
             body_params[key] = value
         else:
@@ -101,6 +104,9 @@ def main(arguments):
 
     # Configure Logging
     logger.logger(logging_level, logging_file)
+    metrics.report_at_exit(metrics_dir, 'config_archive')
+    if profile_options.get('profile'):
+        profiler.enable(profile_options['profile'], 'config_archive', profile_options['profile_dir'])
     logging.debug(f'Setting "body_params" to: {body_params}')
 
     # Get DNAC environment configuration
@@ -109,7 +115,9 @@ def main(arguments):
 
     # Authenticate to DNAC
     logging.info('Authenticating to DNAC.')
-    dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server, port=dnac_port)
+    with profiler.stage('auth'):
+        dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server,
+                                       port=dnac_port)
     logging.debug(f'Setting "dnac_token" to: {dnac_token}')
 
     # Check if device UUIDs were specified or if a CSV file is being used for input
@@ -119,17 +127,19 @@ def main(arguments):
     elif body_params['csv_file']:
         # Call CSV function to extract device UUIDs, overwrite "deviceUuids" value in "body_params"
         logging.info('CSV filename was specified, obtaining device UUIDs from CSV file.')
-        device_ids = config_archive_apis.get_csv_device_uuids(body_params['csv_file'])
+        with profiler.stage('inventory'):
+            device_ids = config_archive_apis.get_csv_device_uuids(body_params['csv_file'])
         body_params['deviceUuids'] = device_ids
-        logging.debug(f'List of device UUIDs obtained from CSV file: {device_ids}')
+        logging.debug('List of device UUIDs obtained from CSV file: %s', logger.Preview(device_ids))
     else:
         logging.error(f'Device UUIDs or input CSV file were not found in arguments. Device UUIDs must be provided.')
         raise Exception('Proper inputs were not found.')
 
     # Check which type of config is requested, then obtain configurations from DNAC
     if full_config:
-        archive_result, archive_password, archive_status_code = config_archive_apis.get_config_archive(
-            dnac_token, baseUrl, body_params)
+        with profiler.stage('request'):
+            archive_result, archive_password, archive_status_code = config_archive_apis.get_config_archive(
+                dnac_token, baseUrl, body_params)
 
         # Check output of Configuration Archive results
         if archive_status_code == 200:
@@ -156,36 +166,42 @@ def main(arguments):
             result['location'] = None
             return result
 
-        # If Configuration Archive POST successful, get status of task and check if finished
-        counter = 1
-        while True:
-            task_status = config_archive_apis.get_task_status(dnac_token, baseUrl, archive_task_id)
-            if task_status['isError']:
-                logging.error(f'Configuration Archive has reported an error: {task_status}')
-                result['status_code'] = 500
-                result['status'] = task_status
-                result['filename'] = None
-                result['location'] = None
-                break
-            elif 'endTime' in task_status.keys():
-                file_url = task_status['additionalStatusURL']
-                # Initiate file download once File ID becomes available.
+        # If Configuration Archive POST successful, get status of task and check if finished. With a webhook receiver
+        # running, a task notification triggers the next status check immediately instead of after the poll interval.
+        waiter = None
+        receiver = None
+        if webhook_options.get('webhook'):
+            waiter = webhook.TaskWaiter()
+            receiver = webhook.WebhookReceiver(waiter.notify,
+                                               webhook_options.get('webhook_host') or webhook.DEFAULT_HOST,
+                                               webhook_options['webhook'],
+                                               authorization=webhook_options.get('webhook_auth')).start()
+        try:
+            get_status = lambda: config_archive_apis.get_task_status(dnac_token, baseUrl, archive_task_id)
+            with profiler.stage('task-wait'):
+                task_status = webhook.wait_for_task(get_status, archive_task_id, waiter=waiter)
+        finally:
+            if receiver:
+                receiver.stop()
+        if task_status['isError']:
+            logging.error(f'Configuration Archive has reported an error: {task_status}')
+            result['status_code'] = 500
+            result['status'] = task_status
+            result['filename'] = None
+            result['location'] = None
+        elif 'endTime' in task_status.keys():
+            file_url = task_status['additionalStatusURL']
+            # Initiate file download once File ID becomes available.
+            with profiler.stage('write'):
                 result = config_archive_apis.download_file_by_id(dnac_token, baseUrl, file_url)
-                result['password'] = archive_password  # Append configured password for archive ZIP file
-                break
-            elif counter <= 4:
-                logging.info(f'Currently waiting on Task ID {archive_task_id} to finish. Attempt #{counter}')
-                logging.debug(f'Task is still pending, attempt #{counter}: {task_status}')
-                counter += 1
-                time.sleep(3)
-            else:
-                logging.info(f'Task ID {archive_task_id} has not completed yet. Please check for a problem in DNAC.')
-                logging.error(f'Task may be stuck, key "endTime" not found in status output: {task_status}')
-                result['status_code'] = 500
-                result['status'] = task_status
-                result['filename'] = None
-                result['location'] = None
-                break
+            result['password'] = archive_password  # Append configured password for archive ZIP file
+        else:
+            logging.info(f'Task ID {archive_task_id} has not completed yet. Please check for a problem in DNAC.')
+            logging.error(f'Task may be stuck, key "endTime" not found in status output: {task_status}')
+            result['status_code'] = 500
+            result['status'] = task_status
+            result['filename'] = None
+            result['location'] = None
     else:
         # If sanitized configuration option selected, request that version
         uuid_input = body_params['deviceUuids']
@@ -193,30 +209,43 @@ def main(arguments):
         logging.info(f'Requesting sanitized configuration files for devices: {uuid_input}')
 
         # Obtain hostname from DNAC for each device UUID
-        for device in uuid_input:
-            single_device = {}
-            hostname = config_archive_apis.get_hostname(dnac_token, baseUrl, device)
-            single_device['hostname'] = hostname
-            single_device['deviceUuid'] = device
-            device_list.append(single_device)
+        with profiler.stage('inventory'):
+            for device in uuid_input:
+                single_device = {}
+                hostname = config_archive_apis.get_hostname(dnac_token, baseUrl, device)
+                single_device['hostname'] = hostname
+                single_device['deviceUuid'] = device
+                device_list.append(single_device)
 
         # Initiate parallel processes to obtain device configurations
-        logging.debug(f'Compiled device list for requesting sanitized configs: {device_list}')
-        result = process_sanitized_config(dnac_token, baseUrl, device_list)
+        logging.debug('Compiled device list for requesting sanitized configs: %s', logger.Preview(device_list))
+        with profiler.stage('fan-out'):
+            result = process_sanitized_config(dnac_token, baseUrl, device_list)
 
     return result
 
 
-if __name__ == '__main__':
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
     # Parse incoming arguments
     parser = argparse.ArgumentParser(description='This script requires at a minimum one or more Device UUIDs, or a '
                                                  'CSV file containing those IDs. The script will use the '
                                                  '"Configuration Archive" API endpoint to request encrypted ZIP files '
-                                                 'containing those device configurations.')
+                                                 'containing those device configurations.', prog=prog)
     log_settings = parser.add_argument_group('Log Settings')
     log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
                                                                       'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET')
     log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.')
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics, as a '
+                              'Prometheus text file and a JSON run summary.')
+    log_settings.add_argument('--profile', nargs='?', const='time', choices=profiler.MODES, help='Time each stage '
+                              '(auth, inventory, request, task-wait, fan-out, write) and save a flame graph of sampled '
+                              'stacks. "cprofile" also runs each stage under cProfile, "tracemalloc" reports the lines '
+                              'allocating the most memory per stage. Default mode is "time".')
+    log_settings.add_argument('--profile_dir', type=str, default='profile', help='Directory for profile output. '
+                              'Default is "profile".')
 
     # Create subparser to request full configuration files encrypted in ZIP files
     subparser = parser.add_subparsers(help='Choose to request full configuration data, including passwords and '
@@ -232,6 +261,14 @@ if __name__ == '__main__':
                                                           'Default is "Cisco123!"', default='Cisco123!')
     parser_full.add_argument('--deviceUuids', type=str, help='Comma separated double-quoted list of device '
                                                                         'UUIDs.', default=None)
+    parser_full.add_argument('--webhook', type=int, help='Listen on this TCP port for task notifications pushed by '
+                                                         'DNAC to a REST webhook destination, so the finished archive '
+                                                         'is downloaded without waiting for the next poll.')
+    parser_full.add_argument('--webhook_host', type=str, default=webhook.DEFAULT_HOST, help='Address the webhook '
+                             'receiver listens on. Default is "127.0.0.1", which only accepts notifications relayed '
+                             'on this host; use "0.0.0.0" with --webhook_auth to accept them from DNAC directly.')
+    parser_full.add_argument('--webhook_auth', type=str, help='"Authorization" header value the webhook destination '
+                                                              'is configured to send.')
     parser_full.set_defaults(full=True)
     parser_full.add_argument('--csv_file', type=str, help='Filename of a CSV input file, to be used in '
                                                                      'place of the "deviceUuids" argument. CSV file '
@@ -250,8 +287,22 @@ if __name__ == '__main__':
                                                                      'MUST have a column titled "id" containing device '
                                                                      'UUIDs.', default=None)
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    return args
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Print the result
+    # return: Result of "main"
     arg_dict = vars(args)  # Convert "args" Namespace to a Dictionary
 
     result = main(arg_dict)
-    pp(result, indent=4)
+    if show:
+        with profiler.stage('output'):
+            pp(result, indent=4)
+    return result
+
+
+if __name__ == '__main__':
+    run(parse_args())
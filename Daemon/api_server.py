@@ -0,0 +1,150 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import json
+import logging
+import sys
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import metrics
+from warm_cache import WarmCache
+from workflows import QueryError, NotFoundError
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+# Query parameters handled by the API itself rather than passed on as inventory filters
+RESERVED = {'refresh'}
+
+
+def _filters(query):
+    # return (dict): Query parameters other than RESERVED ones, each a list of values
+    return {name: values for name, values in query.items() if name not in RESERVED}
+
+
+def _one(query, name, required=False):
+    # return (str): Single value of a query parameter
+    values = query.get(name)
+    if not values:
+        if required:
+            raise QueryError(f'The "{name}" query parameter is required.')
+        return None
+    return values[0]
+
+
+def _events(workflows, query, refresh):
+    minutes = _one(query, 'minutes')
+    try:
+        options = {'minutes': float(minutes)} if minutes else {}
+    except ValueError:
+        raise QueryError(f'"minutes" must be a number, not "{minutes}".')
+    return workflows.device_events(_one(query, 'device', True), _one(query, 'before'), _one(query, 'after'),
+                                   refresh=refresh, **options)
+
+
+# Path: function returning the response data. Each function receives the Workflows instance, the parsed query string
+# and the "refresh" flag.
+ROUTES = {
+    '/devices': lambda workflows, query, refresh: workflows.devices(_filters(query), refresh),
+    '/compliance': lambda workflows, query, refresh: workflows.compliance(_filters(query), refresh),
+    '/advisories/summary': lambda workflows, query, refresh: workflows.advisory_summary(refresh),
+    '/events': _events,
+    '/config': lambda workflows, query, refresh: workflows.sanitized_config(_one(query, 'device', True), refresh)
+}
+
+
+class ApiServer(ThreadingHTTPServer):
+    # Serves the workflows as a local HTTP/JSON API. Encoded responses are kept in their own WarmCache, so a repeated
+    # query is answered without running the workflow or encoding its result again; identical queries arriving
+    # while one is being answered wait for it instead of calling DNAC themselves.
+
+    daemon_threads = True
+
+    def __init__(self, workflows, host=DEFAULT_HOST, port=DEFAULT_PORT, authorization=None):
+        super().__init__((host, port), ApiHandler)
+        self.workflows = workflows
+        self.authorization = authorization
+        self.responses = WarmCache()
+        self.started = time.monotonic()
+
+    def health(self):
+        return {'status': 'ok', 'uptimeSeconds': round(time.monotonic() - self.started, 1),
+                'responseCache': self.responses.stats(), 'dataCache': self.workflows.cache.stats()}
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        logging.debug(f'{self.address_string()} {format % args}')
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({'error': message}).encode())
+
+    def do_GET(self):
+        server = self.server
+        if server.authorization and self.headers.get('authorization') != server.authorization:
+            return self._error(401, 'Unauthorized')
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/') or '/'
+        query = parse_qs(url.query)
+        if path == '/health':
+            return self._send(200, json.dumps(server.health()).encode())
+        if path == '/metrics':
+            return self._send(200, metrics.REGISTRY.prometheus().encode(), 'text/plain; version=0.0.4')
+        if path not in ROUTES:
+            return self._error(404, f'Unknown path "{path}".')
+
+        function = ROUTES[path]
+        refresh = (_one(query, 'refresh') or '').lower() in ('1', 'true', 'yes')
+        start = time.monotonic()
+        load = lambda: json.dumps(function(server.workflows, query, refresh)).encode()
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in _filters(query).items())))
+        try:
+            body, status, age = server.responses.get(key, load, server.workflows.result_ttl, refresh)
+        except NotFoundError as e:
+            return self._error(404, str(e))
+        except QueryError as e:
+            return self._error(400, str(e))
+        except Exception as e:
+            logging.exception(f'Request for {self.path} failed.')
+            return self._error(502, str(e))
+        logging.info(f'{path} answered in {(time.monotonic() - start) * 1000:.1f} ms ({status}).')
+        self._send(200, body, headers={'X-Cache': status.upper(), 'Age': str(int(age))})
@@ -0,0 +1,112 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import sys
+import os
+import argparse
+import threading
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import logger, get_config, http_client, metrics
+import api_server
+import workflows
+
+
+def main(arguments):
+    # param arguments (Namespace): Parsed CLI arguments
+    # Serves the workflows until interrupted
+
+    logger.logger(arguments.logging_level, arguments.logging_file)
+    metrics.report_at_exit(arguments.metrics_dir, 'daemon')
+
+    # Pull in DNAC config details from "config.ini"
+    dnac_server, dnac_port, dnac_username, dnac_password = get_config.get_config()
+    flows = workflows.Workflows(dnac_server, dnac_port, dnac_username, dnac_password, arguments.threads,
+                                arguments.inventory_ttl, arguments.result_ttl)
+    if arguments.rate:
+        http_client.set_rate_limit(flows.baseUrl, arguments.rate)
+    if arguments.preload:
+        threading.Thread(target=flows.preload, name='preload', daemon=True).start()
+
+    server = api_server.ApiServer(flows, arguments.host, arguments.port, arguments.api_auth)
+    print(f'Serving the DNAC API workflows on http://{arguments.host}:{server.server_port} (Ctrl+C to stop)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        flows.close()
+        http_client.close_all()
+
+
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
+    parser = argparse.ArgumentParser(description='Long-running daemon serving the compliance, advisory summary, '
+                                                 'device event and sanitized configuration workflows over a local '
+                                                 'HTTP/JSON API, with the DNAC token, connections, inventory and '
+                                                 'results kept warm in memory.', prog=prog)
+    log_settings = parser.add_argument_group('Log Settings')
+    log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
+                                                                      'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET')
+    log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.')
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics at exit, '
+                              'as a Prometheus text file and a JSON run summary. Live metrics are served on '
+                              '"/metrics".')
+    server_settings = parser.add_argument_group('Server')
+    server_settings.add_argument('--host', type=str, default=api_server.DEFAULT_HOST, help='Address to listen on. '
+                                 f'Default is "{api_server.DEFAULT_HOST}" (local clients only).')
+    server_settings.add_argument('--port', type=int, default=api_server.DEFAULT_PORT, help='TCP port to listen on. '
+                                 f'Default is {api_server.DEFAULT_PORT}.')
+    server_settings.add_argument('--api_auth', type=str, help='"Authorization" header value clients must send, '
+                                 'e.g. "Bearer <secret>".')
+    cache_settings = parser.add_argument_group('Caching')
+    cache_settings.add_argument('--inventory_ttl', type=int, default=workflows.INVENTORY_TTL, help='Seconds the '
+                                f'device inventory is reused. Default is {workflows.INVENTORY_TTL}.')
+    cache_settings.add_argument('--result_ttl', type=int, default=workflows.RESULT_TTL, help='Seconds workflow '
+                                f'results are reused. Default is {workflows.RESULT_TTL}.')
+    cache_settings.add_argument('--preload', action='store_true', help='Load the inventory and advisory summary '
+                                'at startup instead of on the first request.')
+    concurrency_settings = parser.add_argument_group('Concurrency')
+    concurrency_settings.add_argument('--threads', type=int, default=10, help='Number of devices queried '
+                                      'concurrently. Default is 10.')
+    concurrency_settings.add_argument('--rate', type=float, help='Maximum number of API requests per second sent '
+                                      'to DNAC.')
+    return parser.parse_args(argv)
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Unused; the daemon serves its results over HTTP
+    return main(args)
+
+
+if __name__ == '__main__':
+    run(parse_args())
@@ -0,0 +1,104 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import threading
+import time
+
+# Entries kept before the oldest ones are evicted
+MAX_ENTRIES = 10000
+
+
+class _Load:
+    # A load in progress; requests for the same key wait on "done" instead of starting their own
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class WarmCache:
+    # In-memory cache with a time to live per lookup. Concurrent lookups of a key that is being loaded wait for that
+    # single load and share its result (request coalescing), so a burst of identical dashboard queries costs one set
+    # of API calls. Failed loads are not cached.
+
+    def __init__(self, max_entries=MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.loading = {}
+        self.counts = {'hit': 0, 'miss': 0, 'coalesced': 0}
+
+    def get(self, key, loader, ttl, refresh=False):
+        # param key: Hashable cache key
+        # param loader: Function without arguments returning the value to cache
+        # param ttl (float): Maximum age in seconds of a cached value
+        # param refresh (bool): Ignore a cached value and load it again
+        # return value, status, age: Cached or loaded value, one of "hit", "miss" or "coalesced", and the age of the
+        # value in seconds
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and not refresh and time.monotonic() - entry[1] < ttl:
+                self.counts['hit'] += 1
+                return entry[0], 'hit', time.monotonic() - entry[1]
+            load = self.loading.get(key)
+            leader = load is None
+            if leader:
+                load = self.loading[key] = _Load()
+            self.counts['miss' if leader else 'coalesced'] += 1
+
+        if not leader:
+            load.done.wait()
+            if load.error:
+                raise load.error
+            return load.value, 'coalesced', 0.0
+        try:
+            load.value = loader()
+        except Exception as e:
+            load.error = e
+            raise
+        finally:
+            with self.lock:
+                del self.loading[key]
+                if load.error is None:
+                    self._store(key, load.value)
+            load.done.set()
+        return load.value, 'miss', 0.0
+
+    def _store(self, key, value):
+        # Re-inserting moves the key to the end, so the dict stays ordered from oldest to newest
+        self.entries.pop(key, None)
+        self.entries[key] = (value, time.monotonic())
+        while len(self.entries) > self.max_entries:
+            del self.entries[next(iter(self.entries))]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        # return (dict): Number of cached entries and lookup counts by status
+        with self.lock:
+            return dict(self.counts, entries=len(self.entries), loading=len(self.loading))
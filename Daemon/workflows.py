@@ -0,0 +1,216 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import logging
+import sys
+import os
+from datetime import datetime as dt
+from multiprocessing.pool import ThreadPool
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+# The workflows reuse the API functions of the use case folders
+for folder in ('Compliance', 'Configuration Archive', 'Security Advisories', 'Device Events'):
+    sys.path.append(os.path.join(parentdir, folder))
+
+from utils import auth, http_client, metrics
+from warm_cache import WarmCache
+import compliance_apis
+import config_archive_apis
+import advisory_apis
+import events_apis
+
+# Default time to live, in seconds, of cached inventory and of cached workflow results
+INVENTORY_TTL = 300
+RESULT_TTL = 60
+# Default time range of device event queries without "before" and "after"
+EVENT_MINUTES = 60
+
+
+class QueryError(ValueError):
+    # Invalid input in a query, answered with 400 Bad Request. Other errors, including a ValueError raised while
+    # decoding a DNAC reply, are failures of the upstream cluster.
+    pass
+
+
+class NotFoundError(LookupError):
+    # The requested device does not exist, answered with 404 Not Found
+    pass
+
+
+def _key(params):
+    # Hashable form of a query parameter dict whose values are lists
+    return tuple(sorted((name, tuple(values)) for name, values in (params or {}).items()))
+
+
+def _epoch_ms(value):
+    # param value (str): ISO 8601 date/time
+    try:
+        return int(dt.fromisoformat(value).timestamp() * 1000)
+    except ValueError:
+        raise QueryError(f'"{value}" is not a valid ISO 8601 date/time.')
+
+
+class Workflows:
+    # The use case workflows run against one DNAC cluster with warm state: the pooled HTTP client, a token manager
+    # that renews the token before it expires, a worker pool, and a WarmCache of inventory and per-device results.
+    # Every method may be called from several request threads at once.
+
+    def __init__(self, server, port, username, password, threads=10, inventory_ttl=INVENTORY_TTL,
+                 result_ttl=RESULT_TTL):
+        self.baseUrl = f'https://{server}:{port}/dna/intent/api'
+        self.tokens = auth.TokenManager(server, port, username, password)
+        self.pool = ThreadPool(threads)
+        self.cache = WarmCache()
+        self.inventory_ttl = inventory_ttl
+        self.result_ttl = result_ttl
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+
+    def _call(self, function):
+        # param function: Function taking a DNAC token and calling the API with it
+        # return: Result of "function". If DNAC rejected the token, e.g. after the cluster restarted, the token is
+        # renewed and the function is called once more instead of failing until the token's scheduled renewal.
+        rejected = http_client.unauthorized_count()
+        try:
+            return function(self.tokens.get_token())
+        except Exception as e:
+            if not isinstance(e, events_apis.TokenRejectedError) and http_client.unauthorized_count() == rejected:
+                raise
+        logging.info('DNAC rejected the token, requesting a new token.')
+        self.tokens.invalidate()
+        return function(self.tokens.get_token())
+
+    def devices(self, params=None, refresh=False):
+        # param params (dict): "/dna/intent/api/v1/network-device" query parameters, each a list of values
+        # return devices (list): Dicts containing "hostname" and "id" of the matching devices
+
+        def fetch(token):
+            devices = events_apis.get_devices(self.baseUrl, token, params)
+            if devices is None:
+                raise RuntimeError('The device list could not be obtained from DNAC.')
+            return devices
+
+        return self.cache.get(('devices', _key(params)), lambda: self._call(fetch), self.inventory_ttl, refresh)[0]
+
+    def _device_index(self, refresh=False):
+        # return index (dict): Devices of the cached full inventory by lowercase hostname and by UUID
+
+        def load():
+            index = {}
+            for device in self.devices(refresh=refresh):
+                index[device['hostname'].lower()] = device
+                index[device['id']] = device
+            return index
+
+        return self.cache.get(('device-index',), load, self.inventory_ttl, refresh)[0]
+
+    def device(self, name):
+        # param name (str): Device hostname (case insensitive) or UUID
+        # return device (dict): "hostname" and "id" of the device
+        index = self._device_index()
+        device = index.get(name) or index.get(name.lower())
+        if device is None:
+            raise NotFoundError(f'Device "{name}" was not found in DNAC.')
+        return device
+
+    def _device_compliance(self, device, refresh):
+        def fetch(token):
+            return compliance_apis.get_compliance_details((token, self.baseUrl, device['hostname'], device['id']))
+
+        return self.cache.get(('compliance', device['id']), lambda: self._call(fetch), self.result_ttl, refresh)[0]
+
+    def compliance(self, params=None, refresh=False):
+        # param params (dict): Inventory query parameters selecting the devices
+        # return (list): Per-device lists of compliance dicts, as returned by the Compliance use case. Each device's
+        # result is cached separately, so overlapping queries share them.
+        devices = self.devices(params, refresh)
+        return self.pool.map(*metrics.queued(lambda device: self._device_compliance(device, refresh), devices,
+                                             'compliance'))
+
+    def advisory_summary(self, refresh=False):
+        # return (dict): Aggregate counts of current Security Advisories
+
+        def fetch(token):
+            summary = advisory_apis.get_advisory_summary(token, self.baseUrl)
+            if summary is None:
+                raise RuntimeError('The Security Advisory summary could not be obtained from DNAC.')
+            return summary
+
+        return self.cache.get(('advisory-summary',), lambda: self._call(fetch), self.result_ttl, refresh)[0]
+
+    def device_events(self, name, before=None, after=None, minutes=EVENT_MINUTES, refresh=False):
+        # param name (str): Device hostname or UUID
+        # param before, after (str): ISO 8601 date/time range; without them the last "minutes" minutes are returned
+        # return events (list): Events of the device, newest first, with ISO timestamps
+
+        device = self.device(name)
+        if before or after:
+            if not (before and after):
+                raise QueryError('Both "before" and "after" are required.')
+            before_ts, after_ts = _epoch_ms(before), _epoch_ms(after)
+        else:
+            before_ts = after_ts = None
+
+        def fetch(token):
+            end = before_ts or int(dt.now().timestamp() * 1000)
+            start = after_ts or end - int(minutes * 60000)
+            events = events_apis.get_device_events(self.baseUrl, token, device['id'], end, start)
+            if events is None:
+                raise RuntimeError(f'Events for "{device["hostname"]}" could not be obtained from DNAC.')
+            return events
+
+        key = ('events', device['id'], before_ts, after_ts, None if before_ts else minutes)
+        return self.cache.get(key, lambda: self._call(fetch), self.result_ttl, refresh)[0]
+
+    def sanitized_config(self, name, refresh=False):
+        # param name (str): Device hostname or UUID
+        # return (dict): "hostname", "id" and the sanitized running "config" of the device
+
+        device = self.device(name)
+
+        def fetch(token):
+            status_code, hostname, uuid, config = config_archive_apis.get_sanitized_config(
+                (token, self.baseUrl, device['hostname'], device['id']))
+            if status_code != 200:
+                raise RuntimeError(f'Configuration request for "{hostname}" failed with status code: {status_code}')
+            return {'hostname': hostname, 'id': uuid, 'config': config}
+
+        return self.cache.get(('config', device['id']), lambda: self._call(fetch), self.result_ttl, refresh)[0]
+
+    def preload(self):
+        # Warm the inventory and advisory caches, e.g. in a background thread at startup
+        try:
+            self._device_index()
+            logging.info(f'Preloaded {len(self.devices())} devices.')
+        except Exception:
+            logging.exception('Preloading the inventory failed.')
+        try:
+            self.advisory_summary()
+        except Exception:
+            logging.exception('Preloading the Security Advisory summary failed.')
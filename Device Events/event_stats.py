@@ -0,0 +1,214 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import threading
+from datetime import datetime as dt
+
+import numpy as np  # External package from PyPi, only needed for event statistics
+
+# Event fields stored as categorical codes
+FIELDS = ('mnemonic', 'severity', 'facility')
+# Number of events collected in Python lists before they are converted to NumPy arrays
+CHUNK_SIZE = 65536
+UNKNOWN = ''
+
+
+def event_values(event):
+    # param event (dict): Event from the "deviceEventsView" API
+    # return values (dict): Value of each of FIELDS, taken from the event or from its nested "details" list
+
+    values = {field: event.get(field) for field in FIELDS}
+    if any(value is None for value in values.values()):
+        for item in event.get('details') or []:
+            key = str(item.get('key', '')).lower().replace(' ', '_')
+            if key in values and values[key] is None:
+                values[key] = item.get('value')
+    return {field: UNKNOWN if value is None else str(value) for field, value in values.items()}
+
+
+def epoch_ms(timestamp):
+    # Accept epoch millisecond timestamps as well as ISO date/time strings written by "get_device_events"
+    if isinstance(timestamp, str):
+        return int(dt.fromisoformat(timestamp).timestamp() * 1000)
+    return int(timestamp)
+
+
+class EventStats:
+    # Columnar store of event batches for fast aggregation. Each event is reduced to a device code, an epoch
+    # millisecond timestamp and categorical codes for FIELDS, held in NumPy arrays; all statistics are computed
+    # with vectorized operations over those arrays. "add" may be called from several threads.
+
+    def __init__(self):
+        self.devices = {}
+        self.categories = {field: {} for field in FIELDS}
+        self.columns = ('device', 'timestamp') + FIELDS
+        self._pending = {column: [] for column in self.columns}
+        self._chunks = {column: [] for column in self.columns}
+        self._lock = threading.Lock()
+
+    def add(self, events, hostname):
+        # param events (iterable): Events of one device
+        # param hostname (str): Hostname of the device
+        with self._lock:
+            device = self.devices.setdefault(hostname, len(self.devices))
+            pending = self._pending
+            for event in events:
+                pending['device'].append(device)
+                pending['timestamp'].append(epoch_ms(event['timestamp']))
+                for field, value in event_values(event).items():
+                    codes = self.categories[field]
+                    pending[field].append(codes.setdefault(value, len(codes)))
+                if len(pending['device']) >= CHUNK_SIZE:
+                    self._flush()
+
+    def _flush(self):
+        dtypes = {'timestamp': np.int64}
+        for column in self.columns:
+            self._chunks[column].append(np.array(self._pending[column], dtype=dtypes.get(column, np.int32)))
+            self._pending[column] = []
+
+    def arrays(self):
+        # return (dict): One NumPy array per column, covering every event added so far
+        with self._lock:
+            if self._pending['device'] or not self._chunks['device']:
+                self._flush()
+            for column in self.columns:
+                if len(self._chunks[column]) > 1:
+                    self._chunks[column] = [np.concatenate(self._chunks[column])]
+            return {column: self._chunks[column][0] for column in self.columns}
+
+    def labels(self, field):
+        # return (list): Category values of "field" (or device hostnames for "device"), indexed by code
+        codes = self.devices if field == 'device' else self.categories[field]
+        return list(codes)
+
+    def _buckets(self, timestamps, bucket_minutes):
+        # return origin, size, index: Start of the first bucket (epoch ms), bucket size (ms) and bucket of each event
+        size = int(bucket_minutes * 60000)
+        origin = int(timestamps.min()) // size * size
+        return origin, size, (timestamps - origin) // size
+
+    def histogram(self, field='mnemonic', bucket_minutes=60):
+        # param field (str): One of FIELDS
+        # param bucket_minutes (int): Width of each time bucket
+        # return columns (dict): Equal length lists "hostname", "bucket" (ISO start time), the field value and "count",
+        # one entry per non-empty combination, ordered by device, bucket and value. The column layout loads directly
+        # into a dataframe.
+
+        data = self.arrays()
+        columns = {'hostname': [], 'bucket': [], field: [], 'count': []}
+        if not len(data['device']):
+            return columns
+        origin, size, bucket = self._buckets(data['timestamp'], bucket_minutes)
+        n_buckets = int(bucket.max()) + 1
+        n_values = len(self.categories[field])
+        # Combine device, bucket and value codes into one integer key and count the unique keys
+        key = (data['device'].astype(np.int64) * n_buckets + bucket) * n_values + data[field]
+        keys, counts = np.unique(key, return_counts=True)
+        devices, rest = np.divmod(keys, n_buckets * n_values)
+        buckets, values = np.divmod(rest, n_values)
+        bucket_names = [dt.fromtimestamp((origin + b * size) / 1000).isoformat() for b in range(n_buckets)]
+        columns['hostname'] = np.array(self.labels('device'), dtype=object)[devices].tolist()
+        columns['bucket'] = np.array(bucket_names, dtype=object)[buckets].tolist()
+        columns[field] = np.array(self.labels(field), dtype=object)[values].tolist()
+        columns['count'] = counts.tolist()
+        return columns
+
+    def top_devices(self, n=10):
+        # param n (int): Number of devices to return
+        # return rows (list): Dicts of "hostname", event "count" and most frequent "mnemonic" of the n devices with
+        # the most events, noisiest first
+
+        data = self.arrays()
+        if not len(data['device']):
+            return []
+        counts = np.bincount(data['device'], minlength=len(self.devices))
+        top = np.argsort(-counts, kind='stable')[:n]
+        # Most frequent mnemonic of each top device, counted only over the top devices' events
+        n_values = len(self.categories['mnemonic'])
+        rank = np.full(len(self.devices), -1)
+        rank[top] = np.arange(len(top))
+        selected = rank[data['device']]
+        mask = selected >= 0
+        pairs = np.bincount(selected[mask] * n_values + data['mnemonic'][mask], minlength=len(top) * n_values)
+        leading = pairs.reshape(len(top), n_values).argmax(axis=1)
+        hostnames, mnemonics = self.labels('device'), self.labels('mnemonic')
+        return [{'hostname': hostnames[d], 'count': int(counts[d]), 'mnemonic': mnemonics[m]}
+                for d, m in zip(top.tolist(), leading.tolist())]
+
+    def rate_spikes(self, bucket_minutes=60, threshold=3.0, min_count=10):
+        # param bucket_minutes (int): Width of each time bucket
+        # param threshold (float): Number of standard deviations above the device's mean bucket count
+        # param min_count (int): Minimum events in a bucket for it to count as a spike
+        # return rows (list): Dicts of "hostname", "bucket", "count", "mean" and "zscore" for every bucket whose
+        # event count stands out from that device's own baseline, highest z-score first
+
+        data = self.arrays()
+        if not len(data['device']):
+            return []
+        origin, size, bucket = self._buckets(data['timestamp'], bucket_minutes)
+        n_buckets = int(bucket.max()) + 1
+        n_devices = len(self.devices)
+        # Count only the non-empty (device, bucket) cells, like "histogram", rather than a dense device by bucket
+        # matrix, which for a month of 1-minute buckets would take hundreds of MB
+        keys, counts = np.unique(data['device'].astype(np.int64) * n_buckets + bucket, return_counts=True)
+        devices, buckets = np.divmod(keys, n_buckets)
+        # Empty buckets add nothing to the sums, so the mean and standard deviation over all of a device's buckets
+        # follow from the sum and the sum of squares of its non-empty ones
+        sums = np.bincount(devices, weights=counts, minlength=n_devices)
+        squares = np.bincount(devices, weights=counts.astype(np.float64) ** 2, minlength=n_devices)
+        mean = sums / n_buckets
+        std = np.sqrt(np.maximum(squares / n_buckets - mean ** 2, 0))[devices]
+        zscore = np.divide(counts - mean[devices], std, out=np.zeros(len(counts)), where=std > 0)
+        cells = np.nonzero((zscore >= threshold) & (counts >= min_count))[0]
+        cells = cells[np.argsort(-zscore[cells], kind='stable')]
+        hostnames = self.labels('device')
+        return [{'hostname': hostnames[devices[c]],
+                 'bucket': dt.fromtimestamp((origin + int(buckets[c]) * size) / 1000).isoformat(),
+                 'count': int(counts[c]), 'mean': round(float(mean[devices[c]]), 2),
+                 'zscore': round(float(zscore[c]), 2)}
+                for c in cells.tolist()]
+
+    def summary(self, bucket_minutes=60, top=10, threshold=3.0):
+        # return summary (dict): Event totals, per-bucket histograms for each of FIELDS, top devices and rate spikes
+        data = self.arrays()
+        return {
+            'events': int(len(data['device'])),
+            'devices': len(self.devices),
+            'bucketMinutes': bucket_minutes,
+            'totals': {field: dict(zip(self.labels(field),
+                                       np.bincount(data[field], minlength=len(self.categories[field])).tolist()))
+                       for field in FIELDS},
+            'topDevices': self.top_devices(top),
+            'rateSpikes': self.rate_spikes(bucket_minutes, threshold),
+            'histograms': {field: self.histogram(field, bucket_minutes) for field in FIELDS}
+        }
+
+
+def save_summary(summary, filename):
+    # param summary (dict): Output of "EventStats.summary"
+    # param filename (str): JSON file name
+    with open(filename, 'w') as f:
+        json.dump(summary, f, indent=4)
+    return filename
@@ -0,0 +1,254 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import abc
+import csv
+import json
+import sys
+import os
+from datetime import datetime as dt
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import columnar
+
+# Columns always written to CSV output, in this order. Merged output adds "hostname" and "deviceUuid" in front.
+BASE_FIELDS = [
+    'name',
+    'eventName',
+    'timestamp',
+    'id',
+    'severity',
+    'mnemonic',
+    'facility',
+    'switch_number',
+    'message_text',
+    'additionalinfo',
+    'message_type',
+    'color_level'
+]
+DEVICE_FIELDS = ['hostname', 'deviceUuid']
+# Number of events buffered to discover additional CSV columns before the header is written
+SCHEMA_SAMPLE = 1000
+# CSV column holding, as JSON, any fields first seen after the header was written
+EXTRA_FIELD = 'extra'
+# Event fields stored as integer Parquet columns, so they can be filtered and aggregated numerically. A value that is
+# not a whole number is stored as null and kept as received in EXTRA_FIELD.
+INTEGER_FIELDS = ('severity', 'switch_number')
+
+
+def flatten_event(event):
+    # param event (dict): Event from the "deviceEventsView" API
+    # return row (dict): New dict with the entries of the nested "details" list promoted to normalized top level
+    # keys. The event itself is not modified.
+
+    row = {key: value for key, value in event.items() if key != 'details'}
+    for item in event.get('details') or []:
+        if 'key' in item:
+            row[item['key'].lower().replace(' ', '_')] = item.get('value')
+    return row
+
+
+def _integer(value):
+    # return (int): "value" as an integer, or None if it is not a whole number
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _cell(value):
+    # Nested values are written to a single CSV cell as JSON text
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+class EventWriter(abc.ABC):
+    # Base class for streaming event writers. Events are written one at a time with "write", or from any iterable
+    # with "write_all", so output can start before every event has been received. A subclass that does not define
+    # "write" cannot be instantiated.
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self.file = None
+
+    @abc.abstractmethod
+    def write(self, event):
+        # param event (dict): Event to write; implementations also increment "count"
+        pass
+
+    def write_all(self, events):
+        # param events (iterable): Events to write
+        # return (int): Number of events written so far
+        for event in events:
+            self.write(event)
+        return self.count
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class NdjsonWriter(EventWriter):
+    # Writes one JSON encoded event per line
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.file = open(filename, 'w')
+
+    def write(self, event):
+        self.file.write(json.dumps(event) + '\n')
+        self.count += 1
+
+
+class JsonWriter(EventWriter):
+    # Writes an indented JSON list, encoding one event at a time instead of the whole list at once. The output is
+    # identical to "json.dumps(events, indent=4)".
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.file = open(filename, 'w')
+        self.file.write('[')
+
+    def write(self, event):
+        text = json.dumps(event, indent=4).replace('\n', '\n    ')
+        self.file.write(('\n    ' if self.count == 0 else ',\n    ') + text)
+        self.count += 1
+
+    def close(self):
+        if self.file:
+            self.file.write('\n]' if self.count else ']')
+        super().close()
+
+
+class CsvWriter(EventWriter):
+    # Writes flattened events as CSV rows. The first "sample_size" events are buffered to discover the columns
+    # beyond BASE_FIELDS; fields first seen after the header was written go to the EXTRA_FIELD column as JSON.
+
+    def __init__(self, filename, sample_size=SCHEMA_SAMPLE):
+        super().__init__(filename)
+        self.sample_size = sample_size
+        self.buffer = []
+        self.fields = None
+        self.writer = None
+
+    def _start(self):
+        seen = {}
+        for row in self.buffer:
+            seen.update(dict.fromkeys(row))
+        fields = [field for field in DEVICE_FIELDS if field in seen] + BASE_FIELDS
+        fields += [field for field in seen if field not in fields]
+        self.fields = set(fields)
+        self.file = open(self.filename, 'w', encoding='UTF8', newline='')
+        self.writer = csv.DictWriter(self.file, fieldnames=fields + [EXTRA_FIELD])
+        self.writer.writeheader()
+        for row in self.buffer:
+            self._write_row(row)
+        self.buffer = []
+
+    def _write_row(self, row):
+        extra = {key: row.pop(key) for key in [key for key in row if key not in self.fields]}
+        if extra:
+            row[EXTRA_FIELD] = json.dumps(extra)
+        self.writer.writerow({key: _cell(value) for key, value in row.items()})
+
+    def write(self, event):
+        row = flatten_event(event)
+        if self.writer:
+            self._write_row(row)
+        else:
+            self.buffer.append(row)
+            if len(self.buffer) >= self.sample_size:
+                self._start()
+        self.count += 1
+
+    def close(self):
+        if not self.writer:
+            self._start()
+        super().close()
+
+
+def event_schema():
+    # return schema (pyarrow.Schema): Columns of Parquet event output. Timestamps are kept as epoch milliseconds,
+    # INTEGER_FIELDS as integers and the free-form fields as strings.
+    pa, _ = columnar.load_pyarrow()
+    types = dict({field: pa.int32() for field in INTEGER_FIELDS}, timestamp=pa.int64())
+    return pa.schema([pa.field(field, types.get(field, pa.string()))
+                      for field in DEVICE_FIELDS + BASE_FIELDS + [EXTRA_FIELD]])
+
+
+def event_record(event, device):
+    # param event (dict): Event with an epoch millisecond timestamp
+    # param device (dict): Device dict containing "hostname" and "id"
+    # return record (dict): Flattened event matching "event_schema"; other fields, and INTEGER_FIELDS values that are
+    # not whole numbers, are stored as JSON in EXTRA_FIELD
+
+    record = {'hostname': device['hostname'], 'deviceUuid': device['id']}
+    extra = {}
+    for key, value in flatten_event(event).items():
+        if key in INTEGER_FIELDS:
+            record[key] = _integer(value)
+            if record[key] is None and value not in (None, ''):
+                extra[key] = value
+        elif key in BASE_FIELDS:
+            record[key] = value
+        elif key not in DEVICE_FIELDS:
+            extra[key] = value
+    if extra:
+        record[EXTRA_FIELD] = json.dumps(extra)
+    return record
+
+
+def event_partition(record):
+    # Partition Parquet event output by device and by day
+    day = dt.fromtimestamp(record['timestamp'] / 1000).date().isoformat()
+    return [('device', record['hostname']), ('date', day)]
+
+
+def open_dataset(base_dir):
+    # param base_dir (str): Directory of the Parquet dataset
+    # return: utils.columnar.PartitionedWriter accepting records from "event_record". Events arrive newest first, so
+    # only the current and previous day of each device are kept open.
+    return columnar.PartitionedWriter(base_dir, event_partition, event_schema(), max_open=2)
+
+
+WRITERS = {'json': JsonWriter, 'ndjson': NdjsonWriter, 'csv': CsvWriter}
+
+
+def open_writer(output, filename):
+    # param output (str): Output format, one of WRITERS
+    # param filename (str): Output file name
+    # return: EventWriter instance
+    return WRITERS[output.lower()](filename)
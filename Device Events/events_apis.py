@@ -0,0 +1,297 @@
+"""
+Copyright (c) 2024 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2024 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime as dt
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client, logger
+
+# Maximum number of devices returned by one "Get Device List" call
+DEVICE_PAGE_SIZE = 500
+# Number of hostnames sent in each bulk "Get Device List" lookup
+HOSTNAME_CHUNK_SIZE = 50
+# Maximum number of events requested per "deviceEventsView" call; the largest accepted value observed was 5131
+PAGE_LIMIT = 5000
+# Number of event time windows fetched concurrently for one device
+WINDOW_THREADS = 4
+
+
+class TokenRejectedError(RuntimeError):
+    # DNAC answered 401 to an events query. A RuntimeError like the other query failures, but re-raised by
+    # "get_device_events" so that long-running callers know to request a new token.
+    pass
+
+
+def get_device_uuid(baseUrl, dnac_token, hostname):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param hostname (str): Hostname of device to obtain UUID for.
+    # return uuid (str): UUID of device.
+
+    url = f'{baseUrl}/v1/network-device'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
+    device_info = http_client.get(url, headers=header, params={'hostname': hostname}, verify=False)
+
+    if device_info.status_code == 200:
+        uuid = device_info.json()['response'][0]['id']
+        logger.log_response('Device list info obtained', device_info)
+    else:
+        logger.log_response('Attempt to obtain device UUID resulted in', device_info, logging.CRITICAL, headers=True)
+        sys.exit(1)
+    return uuid
+
+
+def get_devices(baseUrl, dnac_token, query_params=None):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param query_params (dict): Query parameters for "/dna/intent/api/v1/network-device". List values are sent as
+    # repeated parameters, which the API treats as "any of".
+    # return devices (list): Dicts containing "hostname" and "id" of every matching device, across all pages.
+
+    url = f'{baseUrl}/v1/network-device'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
+    devices = []
+    offset = 1  # The "offset" parameter of this API is 1-based
+    while True:
+        params = dict(query_params or {}, offset=offset, limit=DEVICE_PAGE_SIZE)
+        response = http_client.get(url, headers=header, params=params, verify=False)
+        if response.status_code != 200:
+            logging.critical(f'Attempt to obtain device list resulted in: \n{response.status_code}\n{response.text}')
+            return None
+        page = response.json()['response']
+        devices.extend({'hostname': item['hostname'], 'id': item['id']} for item in page)
+        if len(page) < DEVICE_PAGE_SIZE:
+            break
+        offset += DEVICE_PAGE_SIZE
+    logging.debug(f'Obtained {len(devices)} devices for query: {query_params}')
+    return devices
+
+
+def get_device_uuids(baseUrl, dnac_token, hostnames):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param hostnames (list): Device hostnames
+    # return devices (list): Dicts containing "hostname" and "id", resolved in bulk with a few API calls.
+
+    devices = []
+    for i in range(0, len(hostnames), HOSTNAME_CHUNK_SIZE):
+        chunk = get_devices(baseUrl, dnac_token, {'hostname': hostnames[i:i + HOSTNAME_CHUNK_SIZE]})
+        if chunk is None:
+            return None
+        devices.extend(chunk)
+    found = {device['hostname'].lower() for device in devices}
+    for hostname in hostnames:
+        if hostname.lower() not in found:
+            logging.warning(f'Device hostname "{hostname}" was not found in DNAC.')
+    return devices
+
+
+def get_site_devices(baseUrl, dnac_token, site_name):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param site_name (str): Full site hierarchy name, e.g. "Global/US/New York"
+    # return devices (list): Dicts containing "hostname" and "id" of every device in the site and its child sites.
+
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
+    response = http_client.get(f'{baseUrl}/v1/site', headers=header, params={'name': site_name}, verify=False)
+    if response.status_code != 200 or not response.json().get('response'):
+        logging.critical(f'Site "{site_name}" was not found: \n{response.status_code}\n{response.text}')
+        return None
+    site_id = response.json()['response'][0]['id']
+
+    response = http_client.get(f'{baseUrl}/v1/membership/{site_id}', headers=header, verify=False)
+    if response.status_code != 200:
+        logging.critical(f'Attempt to obtain site membership resulted in: \n{response.status_code}\n{response.text}')
+        return None
+    devices = {}
+    for group in response.json().get('device') or []:
+        for item in group.get('response') or []:
+            devices[item['id']] = {'hostname': item['hostname'], 'id': item['id']}
+    logging.debug(f'Obtained {len(devices)} devices for site "{site_name}"')
+    return list(devices.values())
+
+
+def query_events(baseUrl, dnac_token, uuid, start_ts, end_ts, limit=PAGE_LIMIT, offset=None):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param uuid (str): UUID of device.
+    # param start_ts, end_ts (int): Epoch timestamps (with millisecond precision) bounding the query.
+    # param limit, offset (int): Page size and 1-based page offset.
+    # return events (list): One page of events, newest first, with epoch timestamps. None on failure; raises
+    # TokenRejectedError on a 401 response.
+
+    # Construct new base URL - CAUTION: This is an undocumented API and is not supported by Cisco at this time
+    url = baseUrl.split('/dna/intent/api')[0] + '/api/assurance/v1/events/deviceEventsView'
+    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
+    # Query param 'entityType' is required, but it appears that the value doesn't affect the output.
+    params = {
+        'entityId': uuid,
+        'entityType': 'switch',
+        'order': 'desc',
+        'startTime': start_ts,
+        'endTime': end_ts,
+        'limit': limit
+    }
+    if offset:
+        params['offset'] = offset
+    response = http_client.get(url, headers=header, params=params, verify=False)
+    if response.status_code == 401:
+        raise TokenRejectedError(f'DNAC rejected the API token while obtaining events for device {uuid}')
+    if response.status_code != 200:
+        logging.critical(f'Attempt to obtain device events resulted in: \n{response.status_code}\n{response.headers}\n{response.text}')
+        return None
+    output = response.json()
+    logging.debug(f'Received {len(output["response"])} events (totalCount {output.get("totalCount")}) for window '
+                  f'{start_ts}-{end_ts}, offset {offset}')
+    return output['response']
+
+
+def fetch_window(iterable_list):
+    # param iterable_list (tuple): "baseUrl", "dnac_token", "uuid", "start_ts", "end_ts", "limit"
+    # return window, events: The requested (start_ts, end_ts) window and one page of its events, newest first.
+    # A single-millisecond window cannot be split further, so all of its events are paged with "offset".
+
+    baseUrl, dnac_token, uuid, start_ts, end_ts, limit = iterable_list
+    if start_ts < end_ts:
+        return (start_ts, end_ts), query_events(baseUrl, dnac_token, uuid, start_ts, end_ts, limit)
+    events = []
+    while True:
+        page = query_events(baseUrl, dnac_token, uuid, start_ts, end_ts, limit, offset=len(events) + 1)
+        if page is None:
+            return (start_ts, end_ts), None
+        events.extend(page)
+        if len(page) < limit:
+            return (start_ts, end_ts), events
+
+
+def iter_device_events(baseUrl, dnac_token, uuid, before_ts, after_ts, limit=PAGE_LIMIT, threads=WINDOW_THREADS):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param uuid (str): UUID of device.
+    # param before_ts, after_ts (str): Epoch timestamps (with millisecond precision).
+    # param limit (int): Maximum number of events requested per API call.
+    # param threads (int): Number of time windows fetched concurrently.
+    # return: Generator of event lists with epoch timestamps, newest first across all lists, yielded as soon as no
+    # window still being fetched can contain newer events. Raises RuntimeError if an API call fails.
+    # The "totalCount" value returned by the API is capped and unreliable, so a full page is taken to mean the window
+    # was truncated. The events received cover the newest part of the window and are kept; the older remainder is
+    # split in two and both halves are fetched in parallel, repeating until every window fits in a single page.
+
+    segments = []
+    # Windows do not overlap apart from shared boundary milliseconds, so duplicates can only share the timestamp of
+    # the last event yielded; only the IDs seen at that millisecond are remembered.
+    last_ts, last_ids = None, set()
+    after_ts, before_ts = int(after_ts), int(before_ts)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending = {executor.submit(fetch_window, (baseUrl, dnac_token, uuid, after_ts, before_ts, limit)):
+                   (after_ts, before_ts)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                del pending[future]
+                (start_ts, end_ts), events = future.result()
+                if events is None:
+                    for other in pending:
+                        other.cancel()
+                    raise RuntimeError(f'Failed to obtain events for device {uuid}')
+                if len(events) < limit or start_ts == end_ts:
+                    segments.append((end_ts, start_ts, events))
+                    continue
+                newest, oldest = events[0]['timestamp'], events[-1]['timestamp']
+                windows = []
+                if newest == oldest:
+                    # Every event on the page shares one millisecond; page through it separately
+                    windows.append((oldest, oldest))
+                    if oldest > start_ts:
+                        windows.append((start_ts, oldest - 1))
+                else:
+                    # Events newer than the oldest one received are complete for this window
+                    segments.append((end_ts, oldest + 1, [e for e in events if e['timestamp'] > oldest]))
+                    if oldest - start_ts >= 2:
+                        middle = start_ts + (oldest - start_ts) // 2
+                        windows.extend([(middle, oldest), (start_ts, middle)])
+                    else:
+                        windows.append((start_ts, oldest))
+                logging.debug(f'Splitting event window {start_ts}-{end_ts} into {windows}')
+                for window in windows:
+                    pending[executor.submit(fetch_window, (baseUrl, dnac_token, uuid, window[0], window[1],
+                                                           limit))] = window
+
+            # Windows still being fetched (and any windows split from them) end at or before "frontier", so finished
+            # segments starting at or after it hold the newest events not yet yielded
+            frontier = max((window[1] for window in pending.values()), default=None)
+            segments.sort(key=lambda x: (x[0], x[1]))
+            while segments and (frontier is None or segments[-1][1] >= frontier):
+                end_ts, start_ts, segment = segments.pop()
+                page = []
+                for event in segment:
+                    if event['timestamp'] != last_ts:
+                        last_ts, last_ids = event['timestamp'], set()
+                    if event['id'] not in last_ids:
+                        last_ids.add(event['id'])
+                        page.append(event)
+                if page:
+                    yield page
+
+
+def get_device_events(baseUrl, dnac_token, uuid, before_ts, after_ts, limit=PAGE_LIMIT, threads=WINDOW_THREADS,
+                      iso_timestamps=True):
+    # param baseUrl (str): Base URL for DNAC
+    # param dnac_token (str): DNA Center API token
+    # param uuid (str): UUID of device.
+    # param before_ts, after_ts (str): Epoch timestamps (with millisecond precision).
+    # param limit (int): Maximum number of events requested per API call.
+    # param threads (int): Number of time windows fetched concurrently.
+    # param iso_timestamps (bool): Convert epoch timestamps to ISO date/time strings.
+    # return events (list): JSON formatted list of dicts containing device event data, newest first. None on failure.
+    # Raises TokenRejectedError if the token was rejected, so long-running callers can renew it.
+
+    events = []
+    try:
+        for page in iter_device_events(baseUrl, dnac_token, uuid, before_ts, after_ts, limit, threads):
+            events.extend(page)
+    except TokenRejectedError:
+        raise
+    except RuntimeError:
+        return None
+    logging.info(f'Received {len(events)} events')
+
+    # Convert epoch timestamps to ISO date/time format
+    if iso_timestamps:
+        for i in events:
+            i['timestamp'] = iso_timestamp(i['timestamp'])
+    return events
+
+
+def iso_timestamp(timestamp):
+    # param timestamp (int): Epoch timestamp with millisecond precision
+    # return (str): ISO date/time string in local time
+    return dt.fromtimestamp(timestamp / 1000).isoformat()
@@ -0,0 +1,227 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import pathlib
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime as dt
+from multiprocessing.pool import ThreadPool
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import webhook
+import events_apis
+
+DEFAULT_WATERMARK_FILE = 'event_watermarks.json'
+DEFAULT_OUTPUT_DIR = 'event_feed'
+
+
+def load_watermarks(filename):
+    # param filename (str): Watermark file
+    # return watermarks (dict): {device UUID: {"timestamp": epoch ms of newest event, "ids": [event IDs at that ms]}}
+
+    if not os.path.isfile(filename):
+        return {}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_watermarks(filename, watermarks):
+    # Replace the watermark file atomically so an interrupted run never leaves a truncated file
+    with open(filename + '.tmp', 'w') as f:
+        json.dump(watermarks, f)
+    os.replace(filename + '.tmp', filename)
+
+
+def new_events(events, watermark):
+    # param events (list): Events with epoch millisecond timestamps
+    # param watermark (dict): Device watermark, or None
+    # return events (list): Events newer than the watermark, oldest first, without duplicate IDs
+
+    result = []
+    seen = set(watermark['ids']) if watermark else set()
+    since = watermark['timestamp'] if watermark else None
+    for event in sorted(events, key=lambda e: e['timestamp']):
+        if since is not None and event['timestamp'] < since:
+            continue
+        if event['id'] in seen:
+            continue
+        seen.add(event['id'])
+        result.append(event)
+    return result
+
+
+def advance_watermark(watermark, events):
+    # param watermark (dict): Current device watermark, or None
+    # param events (list): New events, oldest first
+    # return watermark (dict): Watermark moved to the newest event, keeping every event ID seen at that millisecond
+
+    if not events:
+        return watermark
+    newest = events[-1]['timestamp']
+    ids = [e['id'] for e in events if e['timestamp'] == newest]
+    if watermark and watermark['timestamp'] == newest:
+        ids = watermark['ids'] + ids
+    return {'timestamp': newest, 'ids': ids}
+
+
+def append_events(output_dir, hostname, events):
+    # param output_dir (str): Directory for rolling output files
+    # param hostname (str): Device hostname
+    # param events (list): New events, oldest first, with epoch millisecond timestamps
+    # return: Number of events written. Events are appended to one newline delimited JSON file per device per day.
+
+    files = {}
+    try:
+        for event in events:
+            event_time = dt.fromtimestamp(event['timestamp'] / 1000)
+            filename = os.path.join(output_dir, f'{hostname}_{event_time.date().isoformat()}.ndjson')
+            if filename not in files:
+                files[filename] = open(filename, 'a')
+            files[filename].write(json.dumps(dict(event, timestamp=event_time.isoformat())) + '\n')
+    finally:
+        for f in files.values():
+            f.close()
+    return len(events)
+
+
+def poll_device(iterable_list):
+    # param iterable_list (tuple): "baseUrl", "dnac_token", device dict, watermark, "start_ts", "end_ts", "page_limit"
+    # return device, events, rejected: Device dict, its new events (None if the request failed), and whether the
+    # failure was DNAC rejecting the token. Errors are caught here so one device cannot end the follow loop.
+
+    baseUrl, dnac_token, device, watermark, start_ts, end_ts, page_limit = iterable_list
+    # Re-query from the watermark millisecond itself so events sharing it are not missed; they are deduplicated by ID
+    since = watermark['timestamp'] if watermark else start_ts
+    try:
+        events = events_apis.get_device_events(baseUrl, dnac_token, device['id'], end_ts, since, page_limit,
+                                               iso_timestamps=False)
+    except events_apis.TokenRejectedError:
+        return device, None, True
+    except Exception as e:
+        logging.exception(f'Error while polling events for {device["hostname"]}: {e}')
+        return device, None, False
+    if events is None:
+        return device, None, False
+    return device, new_events(events, watermark), False
+
+
+def follow(token_manager, baseUrl, devices, start_ts, interval=60, watermark_file=DEFAULT_WATERMARK_FILE,
+           output_dir=DEFAULT_OUTPUT_DIR, threads=10, page_limit=events_apis.PAGE_LIMIT, iterations=None):
+    # param token_manager: utils.auth.TokenManager supplying a reused DNAC token
+    # param baseUrl (str): Base URL for DNAC
+    # param devices (list): Dicts containing "hostname" and "id"
+    # param start_ts (int): Epoch ms to start from for devices that have no watermark yet
+    # param interval (int): Seconds between polls
+    # param iterations (int): Number of polls to run, or None to run until interrupted
+    # return total (int): Number of new events written
+
+    pathlib.Path(output_dir).mkdir(parents=True, exist_ok=True)
+    watermarks = load_watermarks(watermark_file)
+    total = 0
+    count = 0
+    try:
+        with ThreadPool(max(1, min(threads, len(devices)))) as pool:
+            while iterations is None or count < iterations:
+                started = time.monotonic()
+                end_ts = int(time.time() * 1000)
+                polled = 0
+                rejected = False
+                try:
+                    dnac_token = token_manager.get_token()
+                    iterable_list = [(baseUrl, dnac_token, device, watermarks.get(device['id']), start_ts, end_ts,
+                                      page_limit) for device in devices]
+                    for device, events, device_rejected in pool.imap_unordered(poll_device, iterable_list):
+                        if events is None:
+                            rejected = rejected or device_rejected
+                            logging.error(f'Failed to poll events for {device["hostname"]}, will retry next '
+                                          f'interval.')
+                            continue
+                        if events:
+                            polled += append_events(output_dir, device['hostname'], events)
+                            watermarks[device['id']] = advance_watermark(watermarks.get(device['id']), events)
+                except Exception as e:
+                    logging.exception(f'Poll #{count + 1} failed: {e}')
+                finally:
+                    # Events already appended must never be appended again after a restart
+                    save_watermarks(watermark_file, watermarks)
+                if rejected:
+                    logging.info('DNAC token was rejected, requesting a new token for the next poll.')
+                    token_manager.invalidate()
+                logging.info(f'Poll #{count + 1} wrote {polled} new events.')
+                total += polled
+                count += 1
+                if iterations is not None and count >= iterations:
+                    break
+                remaining = interval - (time.monotonic() - started)
+                if remaining > 0:
+                    time.sleep(remaining)
+    except KeyboardInterrupt:
+        logging.info('Event follow mode stopped by user.')
+    return total
+
+
+def listen(devices, port=webhook.DEFAULT_PORT, output_dir=DEFAULT_OUTPUT_DIR, authorization=None, duration=None,
+           host=webhook.DEFAULT_HOST):
+    # param devices (list): Dicts containing "hostname" and "id"; events for other devices are ignored. An empty list
+    # accepts events for every device.
+    # param port (int): TCP port for the webhook receiver
+    # param output_dir (str): Directory for rolling output files, the same files written by "follow"
+    # param authorization (str): "Authorization" header value the webhook destination sends, if any
+    # param duration (int): Seconds to listen for, or None to run until interrupted
+    # param host (str): Address the webhook receiver listens on
+    # return total (int): Number of events written
+    # Events pushed by DNAC are written as soon as they arrive, so no API calls are made to the cluster.
+
+    pathlib.Path(output_dir).mkdir(parents=True, exist_ok=True)
+    hostnames = {device['id']: device['hostname'] for device in devices}
+    lock = threading.Lock()
+    total = 0
+
+    def handle(event):
+        nonlocal total
+        device_uuid = event.get('deviceUuid')
+        if hostnames and device_uuid not in hostnames:
+            return
+        with lock:
+            total += append_events(output_dir, hostnames.get(device_uuid) or device_uuid or 'unknown', [event])
+
+    receiver = webhook.WebhookReceiver(handle, host, port, authorization=authorization).start()
+    try:
+        if duration is None:
+            while True:
+                time.sleep(1)
+        else:
+            time.sleep(duration)
+    except KeyboardInterrupt:
+        logging.info('Webhook receiver stopped by user.')
+    finally:
+        receiver.stop()
+    return total
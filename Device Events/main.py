@@ -22,12 +22,12 @@ __copyright__ = "Copyright (c) 2024 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
 import logging
-import urllib3
 import sys
 import os
 import argparse
 import json
-import csv
+import shutil
+import tempfile
 from datetime import datetime as dt
 
 # Append parent directory to path so we can import from external packages
@@ -35,113 +35,112 @@ currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
-import requests
-from urllib3.exceptions import InsecureRequestWarning
+from multiprocessing.pool import ThreadPool
 # From utils directory in repository, import helper functions
-from utils import auth, logger, get_config
+from utils import auth, logger, get_config, http_client, metrics, profiler, webhook
+import events_apis
+import event_writers
+import follow
+import timeline
 
 
-# Disable certificate warnings
-urllib3.disable_warnings(InsecureRequestWarning)
-
-def get_device_uuid(baseUrl, dnac_token, hostname):
+def resolve_devices(baseUrl, dnac_token, arguments):
     # param baseUrl (str): Base URL for DNAC
     # param dnac_token (str): DNA Center API token
-    # param hostname (str): Hostname of device to obtain UUID for.
-    # return uuid (str): UUID of device.
-
-    url = f'{baseUrl}/v1/network-device'
-    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
-    device_info = requests.get(url, headers=header, params={'hostname': hostname}, verify=False)
-
-    if device_info.status_code == 200:
-        uuid = device_info.json()['response'][0]['id']
-        logging.debug(f'Device list info obtained: {device_info.json()}')
+    # param arguments (Namespace): Parsed CLI arguments containing "device", "device_file", "site" and "filter"
+    # return devices (list): Unique dicts containing "hostname" and "id" of every selected device.
+
+    devices = {}
+    hostnames = []
+    if arguments.device:
+        hostnames.extend(x.strip() for x in arguments.device.split(',') if x.strip())
+    if arguments.device_file:
+        with open(arguments.device_file) as f:
+            hostnames.extend(line.strip() for line in f if line.strip())
+    groups = []
+    if hostnames:
+        groups.append(events_apis.get_device_uuids(baseUrl, dnac_token, hostnames))
+    if arguments.site:
+        groups.append(events_apis.get_site_devices(baseUrl, dnac_token, arguments.site))
+    if arguments.filter:
+        query_params = {}
+        for item in arguments.filter:
+            key, _, value = item.partition('=')
+            query_params.setdefault(key.strip(), []).append(value.strip())
+        groups.append(events_apis.get_devices(baseUrl, dnac_token, query_params))
+    for group in groups:
+        if group is None:
+            sys.exit(1)
+        for device in group:
+            devices[device['id']] = device
+    return list(devices.values())
+
+
+def save_device_events(iterable_list):
+    # param iterable_list (tuple): "baseUrl", "dnac_token", device dict, "before_ts", "after_ts", "page_limit",
+    # "output", "target_dir" (Parquet dataset directory, or directory for other output files; None for the current
+    # directory), "stats" (event_stats.EventStats collecting statistics, or None), "tag" (add "hostname" and
+    # "deviceUuid" to each event), "cluster" (cluster whose name prefixes the output file, or None)
+    # return device, filename: Device dict and the name of the file (or Parquet dataset directory) where output was
+    # saved, or None if the request failed
+    # Pages of events are written as soon as they arrive instead of after the whole time range has been fetched.
+
+    baseUrl, dnac_token, device, before_ts, after_ts, page_limit, output, target_dir, stats, tag, cluster = \
+        iterable_list
+    logging.info(f'Getting events for {device["hostname"]}')
+    if output == 'parquet':
+        # Parquet output keeps epoch millisecond timestamps and is partitioned by device and day
+        filename = target_dir
+        writer = event_writers.open_dataset(target_dir)
+        convert = lambda event: event_writers.event_record(event, device)
     else:
-        logging.critical(f'Attempt to obtain device UUID resulted in: \n{device_info.status_code}\n{device_info.headers}\n{device_info.text}')
-        sys.exit(1)
-    return uuid
+        filename = os.path.join(target_dir or '', get_config.cluster_path(
+            f'{device["hostname"]}_{dt.now().isoformat()}.{output}', cluster))
+        writer = event_writers.open_writer(output, filename)
+        device_fields = {'hostname': device['hostname'], 'deviceUuid': device['id']} if tag else {}
+        convert = lambda event: dict(event, timestamp=events_apis.iso_timestamp(event['timestamp']), **device_fields)
+    try:
+        with writer:
+            for page in events_apis.iter_device_events(baseUrl, dnac_token, device['id'], before_ts, after_ts,
+                                                       page_limit):
+                if stats:
+                    stats.add(page, device['hostname'])
+                writer.write_all(convert(event) for event in page)
+    except RuntimeError:
+        if output == 'parquet':
+            shutil.rmtree(os.path.join(target_dir, f'device={device["hostname"]}'), ignore_errors=True)
+        else:
+            os.remove(filename)
+        return device, None
+    logging.info(f'Wrote {writer.count} events for {device["hostname"]}')
+    return device, filename
 
 
-def get_device_events(baseUrl, dnac_token, uuid, before_ts, after_ts):
-    # param baseUrl (str): Base URL for DNAC
-    # param dnac_token (str): DNA Center API token
-    # param uuid (str): UUID of device.
-    # param before_ts, after_ts (str): Epoch timestamps (with millisecond precision).
-    # return events (list): JSON formatted list of dicts containing device event data.
-
-    # Construct new base URL - CAUTION: This is an undocumented API and is not supported by Cisco at this time
-    url = baseUrl.split('/dna/intent/api')[0] + '/api/assurance/v1/events/deviceEventsView'
-    header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
-    # Query param 'entityType' is required, but it appears that the value doesn't affect the output.
-    params = {
-        'entityId': uuid,
-        'entityType': 'switch',
-        'order': 'desc',
-        'startTime': after_ts,
-        'endTime': before_ts
-    }
-    response = requests.get(url, headers=header, params=params, verify=False)
-    if response.status_code == 200:
-        logging.info(f'Received {response.json()['totalCount']} events')
-        logging.debug(f'Obtained device event data: {response.json()}')
-    else:
-        logging.critical(f'Attempt to obtain device events resulted in: \n{response.status_code}\n{response.headers}\n{response.text}')
-        sys.exit(1)
-    
-    # Convert epoch timestamps to ISO date/time format
-    events = response.json()['response']
-    for i in events:
-        i['timestamp'] = dt.fromtimestamp(i['timestamp'] / 1000).isoformat()
-    return events
+def save_events(hostname, events, output):
+    # param hostname (str): Hostname of device
+    # param events (iterable): JSON formatted dicts containing event data
+    # param output (str): Output format, one of "json", "ndjson" or "csv"
+    # return filename (str): Name of file where output was saved
+
+    filename = get_config.cluster_path(f'{hostname}_{dt.now().isoformat()}.{output.lower()}')
+    with event_writers.open_writer(output, filename) as writer:
+        writer.write_all(events)
+    return filename
 
 
 def save_to_json(hostname, events):
     # param hostname (str): Hostname of device
-    # param events (list): JSON formatted list of dicts containing event data
+    # param events (iterable): JSON formatted dicts containing event data
     # return filename (str): Name of file where output was saved
-
-    filename = f'{hostname}_{dt.now().isoformat()}.json'
-    with open(filename, 'w') as f:
-        f.write(json.dumps(events, indent=4))
-    f.close()
-    return filename
+    return save_events(hostname, events, 'json')
 
 
 def save_to_csv(hostname, events):
     # param hostname (str): Hostname of device
-    # param events (list): JSON formatted list of dicts containing event data
+    # param events (iterable): JSON formatted dicts containing event data. Entries of each nested "details" list
+    # become columns; the events are not modified.
     # return filename (str): Name of file where output was saved
-
-    filename = f'{hostname}_{dt.now().isoformat()}.csv'
-    # Predefine CSV column headers
-    field_names = [
-        'name',
-        'eventName',
-        'timestamp',
-        'id',
-        'severity',
-        'mnemonic',
-        'facility',
-        'switch_number',
-        'message_text',
-        'additionalinfo',
-        'message_type',
-        'color_level'
-    ]
-    with open(filename, 'w') as f:
-        writer = csv.DictWriter(f, fieldnames=field_names)
-        writer.writeheader()
-        for i in events:
-            # Extract dictionaries from nested "details" list and insert them in parent dictionary
-            for item in i['details']:
-                # Normalize key names
-                i[item['key'].lower().replace(' ', '_')] = item['value']
-            # Remove redundant dictionary key
-            i.pop('details')
-            writer.writerow(i)
-    f.close()
-    return filename
+    return save_events(hostname, events, 'csv')
 
 
 def main(arguments):
@@ -149,69 +148,254 @@ def main(arguments):
     query_params = {}
     logging_level = ''
     logging_file = ''
+    metrics_dir = None
+    profile_options = {}
     for key, value in vars(arguments).items():
         if key == 'logging_level':
             logging_level = value
         elif key == 'logging_file':
             logging_file = value
+        elif key == 'metrics_dir':
+            metrics_dir = value
+        elif key in ['profile', 'profile_dir']:
+            profile_options[key] = value
         else:
             query_params[key] = value
 
     # Configure Logging
     logger.logger(logging_level, logging_file)
+    metrics.report_at_exit(metrics_dir, 'device_events')
+    if profile_options.get('profile'):
+        profiler.enable(profile_options['profile'], 'device_events', profile_options['profile_dir'])
     logging.debug(f'Setting "query_params" to: {query_params}')
 
-    # Convert ISO date/time values to epoch timestamps, millisecond precision
+    # Convert ISO date/time values to epoch timestamps, millisecond precision. In follow mode "before" is not used
+    # and "after" defaults to the current time.
     try:
-        before_ts = int((dt.fromisoformat(arguments.before).timestamp()) * 1000)
+        before_ts = int((dt.fromisoformat(arguments.before).timestamp()) * 1000) if arguments.before else None
         logging.debug(f'Converted before date/time to epoch value: {before_ts}')
     except ValueError:
         logging.critical(f'Before date/time value could not be parsed.  Please ensure your date/time value is in a valid ISO 8601 format.')
         sys.exit(1)
     try:
-        after_ts = int((dt.fromisoformat(arguments.after).timestamp()) * 1000)
+        if arguments.after:
+            after_ts = int((dt.fromisoformat(arguments.after).timestamp()) * 1000)
+        else:
+            after_ts = int(dt.now().timestamp() * 1000)
         logging.debug(f'Converted after date/time to epoch value: {after_ts}')
     except ValueError:
         logging.critical(f'After date/time value could not be parsed.  Please ensure your date/time value is in a valid ISO 8601 format.')
         sys.exit(1)
 
+    # Rolling output of follow and webhook mode is kept per cluster when several clusters are queried at once
+    feed_dir = get_config.cluster_path(arguments.feed_dir)
+    watermark_file = get_config.cluster_path(arguments.watermark_file)
+
+    if arguments.webhook and not (arguments.device or arguments.device_file or arguments.site or arguments.filter):
+        # Without a device selection, events pushed for every device are kept and no API calls are needed
+        total = follow.listen([], arguments.webhook, feed_dir, arguments.webhook_auth,
+                              host=arguments.webhook_host)
+        print(f'Webhook receiver wrote {total} events to {feed_dir}')
+        return
+
     # Pull in DNAC config details from "config.ini"
     dnac_server, dnac_port, dnac_username, dnac_password = get_config.get_config()
 
-    # Authenticate to DNAC
-    logging.info('Authenticating to DNAC.')
-    dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server, port=dnac_port)
+    # Authenticate to DNAC; the token manager renews the token when it nears expiry in follow mode
+    token_manager = auth.TokenManager(dnac_server, dnac_port, dnac_username, dnac_password)
+    with profiler.stage('auth'):
+        dnac_token = token_manager.get_token()
     logging.debug(f'Setting "dnac_token" to: {dnac_token}')
 
     baseUrl = f'https://{dnac_server}:{dnac_port}/dna/intent/api'
 
-    # Attempt to obtain device UUID
-    device_uuid = get_device_uuid(baseUrl, dnac_token, arguments.device)
-    logging.debug(f'Obtained device UUID {device_uuid} from hostname {arguments.device}')
+    if arguments.rate:
+        http_client.set_rate_limit(baseUrl, arguments.rate)
 
-    # Attempt to get device events
-    events = get_device_events(baseUrl, dnac_token, device_uuid, before_ts, after_ts)
+    # Attempt to obtain device UUIDs
+    with profiler.stage('inventory'):
+        devices = resolve_devices(baseUrl, dnac_token, arguments)
+    logging.debug('Obtained device UUIDs: %s', logger.Preview(devices))
+    if not devices:
+        logging.critical('No devices matched the given hostnames, site or filters.')
+        sys.exit(1)
 
-    # Write events to file
-    if arguments.output.lower() == 'json':
-        filename = save_to_json(arguments.device, events)
+    if arguments.webhook:
+        total = follow.listen(devices, arguments.webhook, feed_dir, arguments.webhook_auth,
+                              host=arguments.webhook_host)
+        print(f'Webhook receiver wrote {total} events to {feed_dir}')
+        return
+
+    if arguments.follow:
+        total = follow.follow(token_manager, baseUrl, devices, after_ts, arguments.interval, watermark_file,
+                              feed_dir, arguments.threads, arguments.page_limit)
+        print(f'Follow mode wrote {total} new events to {feed_dir}')
+        return
+
+    stats = None
+    if arguments.stats:
+        import event_stats  # Requires the external "numpy" package, only needed for statistics
+        stats = event_stats.EventStats()
+
+    # Attempt to get device events, then write events to file
+    failed = []
+    merge = arguments.merge and arguments.output != 'parquet'
+    if merge:
+        # Each device's events are spooled to a temporary file, then the files are merged into one timeline
+        target_dir = tempfile.mkdtemp(prefix='events_')
+        output = 'ndjson'
+    elif arguments.output == 'parquet':
+        # A Parquet dataset holds the events of all devices, partitioned by device and day
+        target_dir = get_config.cluster_path(f'events_{dt.now().isoformat()}')
+        output = arguments.output
     else:
-        filename = save_to_csv(arguments.device, events)
-    print(f'Output file saved as {filename}')
-
-
-if __name__ == '__main__':
+        target_dir = None
+        output = arguments.output
+    iterable_list = [(baseUrl, dnac_token, device, before_ts, after_ts, arguments.page_limit, output, target_dir,
+                      stats, merge, get_config.current_cluster()) for device in devices]
+    spooled = []
+    with profiler.stage('fan-out'):
+        with ThreadPool(max(1, min(arguments.threads, len(iterable_list)))) as pool:
+            for device, filename in pool.imap_unordered(*metrics.queued(save_device_events, iterable_list)):
+                if filename is None:
+                    failed.append(device['hostname'])
+                elif merge:
+                    spooled.append(filename)
+                elif arguments.output == 'parquet':
+                    print(f'Events for {device["hostname"]} saved in {filename}')
+                else:
+                    print(f'Output file saved as {filename}')
+
+    if merge:
+        incidents = []
+        merged_events = timeline.merge_files(spooled)
+        if arguments.correlate:
+            correlator = timeline.Correlator(arguments.window, arguments.min_devices)
+            merged_events = timeline.observe(merged_events, correlator, incidents)
+        # Merging is lazy, so this stage covers reading the spooled files, the merge, correlation and the write
+        with profiler.stage('post-process'):
+            filename = save_events('events', merged_events, arguments.output)
+        shutil.rmtree(target_dir, ignore_errors=True)
+        print(f'Output file saved as {filename}')
+        if arguments.correlate:
+            filename = get_config.cluster_path(f'incidents_{dt.now().isoformat()}.json')
+            with open(filename, 'w') as f:
+                json.dump(incidents, f, indent=4)
+            print(f'{len(incidents)} correlated incidents saved as {filename}')
+
+    if stats:
+        with profiler.stage('statistics'):
+            summary = stats.summary(arguments.bucket, arguments.top)
+            filename = event_stats.save_summary(summary,
+                                                get_config.cluster_path(f'event_stats_{dt.now().isoformat()}.json'))
+        print(f'{summary["events"]} events from {summary["devices"]} devices. Noisiest devices:')
+        for row in summary['topDevices']:
+            print(f'  {row["hostname"]:<40} {row["count"]:>10}  {row["mnemonic"]}')
+        print(f'{len(summary["rateSpikes"])} event rate spikes found. Statistics saved as {filename}')
+    if failed:
+        logging.critical(f'Failed to obtain events for: {", ".join(failed)}')
+        if len(failed) == len(devices):
+            sys.exit(1)
+
+
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
     # Parse incoming arguments
-    parser = argparse.ArgumentParser(description='This script obtains Assurance event data from Catalyst Center, including Syslog messages collected from devices.')
+    parser = argparse.ArgumentParser(description='This script obtains Assurance event data from Catalyst Center, including Syslog messages collected from devices.', prog=prog)
     log_settings = parser.add_argument_group('Log Settings')
     log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
                                                                       'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET',
                                                                       dest='logging_level')
     log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.', dest='logging_file')
-    parser.add_argument('-d', '--device', type=str, help='Enter device hostname.', required=True)
-    parser.add_argument('-b', '--before', required=True, help='Enter a date/time (in ISO 8601 format) for limiting results to messages before that time. (Example: 2023-09-01T10:15:00.000Z)')
-    parser.add_argument('-a', '--after', required=True, help='Enter a date/time (in ISO 8601 format) for limiting results to messages after that time. (Example: 2023-09-01T10:15:00.000Z)')
-    parser.add_argument('-o', '--output', type=str, help='Select output format. Possible values are: json, csv',
-                        dest='output', required=True)
-    args = parser.parse_args()
-    main(args)
\ No newline at end of file
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics, as a '
+                              'Prometheus text file and a JSON run summary.')
+    log_settings.add_argument('--profile', nargs='?', const='time', choices=profiler.MODES, help='Time each stage '
+                              '(auth, inventory, fan-out, post-process, statistics) and save a flame graph of sampled '
+                              'stacks. "cprofile" also runs each stage under cProfile, "tracemalloc" reports the lines '
+                              'allocating the most memory per stage. Default mode is "time".')
+    log_settings.add_argument('--profile_dir', type=str, default='profile', help='Directory for profile output. '
+                              'Default is "profile".')
+    device_settings = parser.add_argument_group('Device Selection', 'One or more of these options is required.')
+    device_settings.add_argument('-d', '--device', type=str, help='Enter device hostname, or a comma separated list of '
+                                                                  'hostnames.')
+    device_settings.add_argument('--device_file', type=str, help='File containing device hostnames, one per line.')
+    device_settings.add_argument('-s', '--site', type=str, help='Full site name; all devices in the site and its child '
+                                                                'sites are included. (Example: "Global/US/New York")')
+    device_settings.add_argument('--filter', type=str, action='append', help='Inventory filter in KEY=VALUE form using '
+                                 '"/dna/intent/api/v1/network-device" query parameters, e.g. "family=Switches and '
+                                 'Hubs". May be repeated.')
+    parser.add_argument('-b', '--before', help='Enter a date/time (in ISO 8601 format) for limiting results to messages before that time. (Example: 2023-09-01T10:15:00.000Z)')
+    parser.add_argument('-a', '--after', help='Enter a date/time (in ISO 8601 format) for limiting results to messages after that time. (Example: 2023-09-01T10:15:00.000Z)')
+    parser.add_argument('-o', '--output', type=str.lower, choices=['json', 'ndjson', 'csv', 'parquet'],
+                        help='Select output format. Possible values are: json, ndjson, csv, parquet',
+                        dest='output')
+    parser.add_argument('-m', '--merge', action='store_true', help='Write the events of all devices to a single file '
+                                                                   'instead of one file per device. Parquet output is '
+                                                                   'always a single dataset.')
+    correlate_settings = parser.add_argument_group('Correlation (merged output only)')
+    correlate_settings.add_argument('--correlate', action='store_true', help='Find the same mnemonic logged by at '
+                                    'least MIN_DEVICES devices within WINDOW seconds, and save the incidents to an '
+                                    '"incidents_<timestamp>.json" file.')
+    correlate_settings.add_argument('--window', type=int, default=60, help='Correlation window in seconds. Default '
+                                                                           'is 60.')
+    correlate_settings.add_argument('--min_devices', type=int, default=3, help='Number of devices required for an '
+                                                                               'incident. Default is 3.')
+    batch_settings = parser.add_argument_group('Concurrency')
+    batch_settings.add_argument('--threads', type=int, default=10, help='Number of devices queried concurrently. '
+                                                                        'Default is 10.')
+    batch_settings.add_argument('--page_limit', type=int, default=events_apis.PAGE_LIMIT, help='Maximum number of '
+                                'events requested per API call. Time windows returning a full page are split and '
+                                f'fetched in parallel. Default is {events_apis.PAGE_LIMIT}.')
+    batch_settings.add_argument('--rate', type=float, help='Maximum number of API requests per second sent to Catalyst '
+                                                           'Center.')
+    stats_settings = parser.add_argument_group('Statistics', 'Requires the "numpy" package.')
+    stats_settings.add_argument('--stats', action='store_true', help='Summarize the events by mnemonic, severity and '
+                                'facility per time bucket per device, list the noisiest devices and flag event rate '
+                                'spikes. Saved to an "event_stats_<timestamp>.json" file.')
+    stats_settings.add_argument('--bucket', type=int, default=60, help='Width of each statistics time bucket in '
+                                                                       'minutes. Default is 60.')
+    stats_settings.add_argument('--top', type=int, default=10, help='Number of noisiest devices to list. Default is '
+                                                                    '10.')
+    follow_settings = parser.add_argument_group('Follow Mode')
+    follow_settings.add_argument('--follow', action='store_true', help='Keep polling for new events every INTERVAL '
+                                 'seconds and append them to rolling files. Use -a/--after to set where devices without '
+                                 'a saved watermark start; the default is now.')
+    follow_settings.add_argument('--interval', type=int, default=60, help='Seconds between polls. Default is 60.')
+    follow_settings.add_argument('--watermark_file', type=str, default=follow.DEFAULT_WATERMARK_FILE,
+                                 help='File storing the newest event seen for each device. Default is '
+                                      f'"{follow.DEFAULT_WATERMARK_FILE}".')
+    follow_settings.add_argument('--feed_dir', type=str, default=follow.DEFAULT_OUTPUT_DIR,
+                                 help='Directory for rolling output files, one per device per day. Default is '
+                                      f'"{follow.DEFAULT_OUTPUT_DIR}".')
+    follow_settings.add_argument('--webhook', type=int, help='Instead of polling, listen on this TCP port for events '
+                                 'pushed by Catalyst Center to a REST webhook destination and append them to the '
+                                 'rolling files in FEED_DIR as they arrive. Device selection is optional; without it '
+                                 'events for every device are kept.')
+    follow_settings.add_argument('--webhook_host', type=str, default=webhook.DEFAULT_HOST, help='Address the '
+                                 'webhook receiver listens on. Default is "127.0.0.1", which only accepts events '
+                                 'relayed on this host; use "0.0.0.0" with --webhook_auth to accept them from '
+                                 'Catalyst Center directly.')
+    follow_settings.add_argument('--webhook_auth', type=str, help='"Authorization" header value the webhook '
+                                                                  'destination is configured to send.')
+    args = parser.parse_args(argv)
+    if not (args.device or args.device_file or args.site or args.filter or args.webhook):
+        parser.error('one of the arguments -d/--device --device_file -s/--site --filter is required')
+    if not (args.follow or args.webhook) and not (args.before and args.after and args.output):
+        parser.error('the arguments -b/--before, -a/--after and -o/--output are required unless --follow or '
+                     '--webhook is used')
+    if args.correlate and not args.merge:
+        parser.error('the argument --correlate requires -m/--merge')
+    return args
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Unused; this script writes its results to files rather than printing them
+    # return: Result of "main"
+    return main(args)
+
+
+if __name__ == '__main__':
+    run(parse_args())
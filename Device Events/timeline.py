@@ -0,0 +1,231 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter, deque
+from datetime import datetime as dt
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import json_stream
+import event_writers
+
+# Maximum number of files read at once; larger merges are done in several passes
+MAX_OPEN_FILES = 256
+
+
+def event_time(event):
+    # param event (dict): Event with an epoch millisecond or ISO date/time "timestamp"
+    # return (int): Epoch milliseconds
+    timestamp = event['timestamp']
+    if isinstance(timestamp, str):
+        return int(dt.fromisoformat(timestamp).timestamp() * 1000)
+    return int(timestamp)
+
+
+def hostname_from_file(filename):
+    # Per-device output files are named "<hostname>_<ISO timestamp>.<format>"
+    return os.path.basename(filename).rsplit('_', 1)[0]
+
+
+def iter_file_events(filename):
+    # param filename (str): JSON, NDJSON or CSV event file written by this script
+    # return: Generator of events in file order
+
+    extension = os.path.splitext(filename)[1].lower()
+    with open(filename, encoding='UTF8', newline='' if extension == '.csv' else None) as f:
+        if extension == '.ndjson':
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif extension == '.csv':
+            yield from csv.DictReader(f)
+        else:
+            yield from json_stream.iter_json_array(f)
+
+
+def tag_events(events, hostname, device_uuid=None):
+    # param events (iterable): Events of one device
+    # return: Generator of copies of the events identifying the device, unless they already do
+    for event in events:
+        if 'hostname' in event:
+            yield event
+        else:
+            yield dict(event, hostname=hostname, deviceUuid=device_uuid or event.get('deviceUuid'))
+
+
+def merge_streams(streams, newest_first=True):
+    # param streams (list): Iterables of events, each already ordered by time
+    # param newest_first (bool): Order of the input streams and of the result
+    # return: Generator of all events in one time ordered sequence. A heap holds one event per stream, so the merge
+    # takes O(total * log streams) time and memory grows with the number of streams, not the number of events.
+    return heapq.merge(*streams, key=event_time, reverse=newest_first)
+
+
+def merge_files(filenames, newest_first=True, max_open=MAX_OPEN_FILES):
+    # param filenames (list): Event files, each ordered by time
+    # return: Generator of the events of every file in one time ordered sequence. Events of files without a
+    # "hostname" field are tagged with the hostname taken from the file name. When there are more than "max_open"
+    # files, groups of files are first merged into temporary NDJSON files.
+
+    streams = [tag_events(iter_file_events(name), hostname_from_file(name)) for name in filenames]
+    if len(filenames) <= max_open:
+        yield from merge_streams(streams, newest_first)
+        return
+    spool_dir = tempfile.mkdtemp(prefix='timeline_')
+    try:
+        spooled = []
+        for i in range(0, len(streams), max_open):
+            spooled.append(os.path.join(spool_dir, f'pass_{i // max_open}.ndjson'))
+            with event_writers.NdjsonWriter(spooled[-1]) as writer:
+                writer.write_all(merge_streams(streams[i:i + max_open], newest_first))
+        yield from merge_files(spooled, newest_first, max_open)
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+
+
+class Correlator:
+    # Finds incidents where the same value of "field" (by default the mnemonic) is logged by at least
+    # "min_devices" devices within "window" seconds of each other. Events must be added in time order (either
+    # direction). Only events inside the current window are kept, per value.
+
+    def __init__(self, window=60, min_devices=3, field='mnemonic'):
+        self.window = int(window * 1000)
+        self.min_devices = min_devices
+        self.field = field
+        self.recent = {}
+        self.active = {}
+        self.added = 0
+
+    def _value(self, event):
+        value = event.get(self.field)
+        if value is None:
+            for item in event.get('details') or []:
+                if str(item.get('key', '')).lower().replace(' ', '_') == self.field:
+                    return item.get('value')
+        return value
+
+    def _close(self, value):
+        incident = self.active.pop(value)
+        first, last = sorted((incident['first'], incident['last']))
+        return {self.field: value, 'start': dt.fromtimestamp(first / 1000).isoformat(),
+                'end': dt.fromtimestamp(last / 1000).isoformat(), 'devices': sorted(incident['devices']),
+                'events': incident['events']}
+
+    def _expire(self, now):
+        # Close incidents and drop windows that no longer overlap the current time
+        closed = [self._close(value) for value, incident in list(self.active.items())
+                  if abs(now - incident['last']) > self.window]
+        for value in [value for value, (events, _) in self.recent.items()
+                      if not events or abs(now - events[-1][0]) > self.window]:
+            del self.recent[value]
+        return closed
+
+    def add(self, event):
+        # param event (dict): Next event in time order, containing "hostname"
+        # return closed (list): Incidents that ended before this event
+        now = event_time(event)
+        self.added += 1
+        closed = self._expire(now) if self.added % 1000 == 0 else []
+        value = self._value(event)
+        if value in (None, ''):
+            return closed
+        if value in self.active and abs(now - self.active[value]['last']) > self.window:
+            closed.append(self._close(value))
+        events, devices = self.recent.setdefault(value, (deque(), Counter()))
+        events.append((now, event.get('hostname')))
+        devices[event.get('hostname')] += 1
+        while abs(now - events[0][0]) > self.window:
+            _, hostname = events.popleft()
+            devices[hostname] -= 1
+            if not devices[hostname]:
+                del devices[hostname]
+        if len(devices) < self.min_devices:
+            return closed
+        incident = self.active.get(value)
+        if incident:
+            incident['last'] = now
+            incident['devices'].add(event.get('hostname'))
+            incident['events'] += 1
+        else:
+            self.active[value] = {'first': events[0][0], 'last': now, 'devices': set(devices),
+                                  'events': len(events)}
+        return closed
+
+    def flush(self):
+        # return (list): Incidents still open at the end of the timeline
+        return [self._close(value) for value in list(self.active)]
+
+
+def correlate(events, window=60, min_devices=3, field='mnemonic'):
+    # param events (iterable): Time ordered events containing "hostname"
+    # return: Generator of incidents, each with the "field" value, "start" and "end" times, "devices" and number of
+    # "events"
+    correlator = Correlator(window, min_devices, field)
+    for event in events:
+        yield from correlator.add(event)
+    yield from correlator.flush()
+
+
+def observe(events, correlator, incidents):
+    # Pass events through unchanged while collecting the incidents found by "correlator" into "incidents"
+    for event in events:
+        incidents.extend(correlator.add(event))
+        yield event
+    incidents.extend(correlator.flush())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Merge per-device event files written by "main.py" into a single '
+                                                 'time ordered timeline, and optionally find events logged by '
+                                                 'several devices within a short time window.')
+    parser.add_argument('files', nargs='+', help='Event files (JSON, NDJSON or CSV), each ordered newest first.')
+    parser.add_argument('-o', '--output', type=str, default='timeline.ndjson', help='Output file; the format is '
+                        'taken from the extension (.json, .ndjson or .csv). Default is "timeline.ndjson".')
+    parser.add_argument('--correlate', action='store_true', help='Find the same mnemonic logged by at least '
+                        'MIN_DEVICES devices within WINDOW seconds and save the incidents to "incidents.json".')
+    parser.add_argument('--window', type=int, default=60, help='Correlation window in seconds. Default is 60.')
+    parser.add_argument('--min_devices', type=int, default=3, help='Devices required for an incident. Default is 3.')
+    args = parser.parse_args()
+
+    found = []
+    timeline = merge_files(args.files)
+    if args.correlate:
+        timeline = observe(timeline, Correlator(args.window, args.min_devices), found)
+    with event_writers.open_writer(os.path.splitext(args.output)[1].lstrip('.'), args.output) as writer:
+        count = writer.write_all(timeline)
+    print(f'Merged {count} events into {args.output}')
+    if args.correlate:
+        with open('incidents.json', 'w') as f:
+            json.dump(found, f, indent=4)
+        print(f'{len(found)} correlated incidents saved to incidents.json')
@@ -21,8 +21,16 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
 import logging
+import sys
+import os
+
+# Append parent directory to path so we can import from top-level packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client, logger
 
 
 def get_device_by_id(dnac_token, baseUrl, deviceUuid):
@@ -32,8 +40,8 @@ def get_device_by_id(dnac_token, baseUrl, deviceUuid):
     logging.info(f'Getting device information for device UUID: {deviceUuid}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device/' + deviceUuid
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Received response: {response.status_code}: {response.text}')
+    response = http_client.get(url, headers=header, verify=False)
+    logger.log_response('Received response', response)
 
     output = response.json()
     result = output['response']
@@ -47,8 +55,8 @@ def get_device_chassis_detail(dnac_token, baseUrl, deviceUuid):
     logging.info(f'Getting device chassis information for device UUID: {deviceUuid}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/network-device/' + deviceUuid + '/chassis'
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Received response: {response.status_code}: {response.text}')
+    response = http_client.get(url, headers=header, verify=False)
+    logger.log_response('Received response', response)
 
     output = response.json()
     result = output['response']
@@ -79,13 +87,13 @@ def get_device_by_other(dnac_token, baseUrl, query_params):
     header = {'content-type': 'application/json', 'x-auth-token': dnac_token}
 
     if params:
-        device_info = requests.get(url, headers=header, params=query_params, verify=False)
+        device_info = http_client.get(url, headers=header, params=query_params, verify=False)
     else:
         # If no parameters are specified, get details of all devices. This could be process intensive - may want to
         # throw an error instead, for large deployments.
-        device_info = requests.get(url, headers=header, verify=False)
+        device_info = http_client.get(url, headers=header, verify=False)
     result = device_info.json()
-    logging.debug(f'Device list info obtained: {result}')
+    logging.debug('Device list info obtained: %s', logger.Preview(result))
     return result['response']
 
 
@@ -96,8 +104,8 @@ def get_interface_info_by_device(dnac_token, baseUrl, deviceUuid):
     logging.info(f'Getting device interface information for device UUID: {deviceUuid}')
     header = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     url = baseUrl + '/v1/interface/network-device/' + deviceUuid
-    response = requests.get(url, headers=header, verify=False)
-    logging.debug(f'Received response: {response.status_code}: {response.text}')
+    response = http_client.get(url, headers=header, verify=False)
+    logger.log_response('Received response', response)
 
     output = response.json()
     result = output['response']
@@ -0,0 +1,371 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import random
+import re
+import time
+from functools import lru_cache
+
+# Device models: (family, type, series, platformId, role, hostname prefix). Devices cycle through DEVICE_MIX, so the
+# fleet is mostly access switches, like a typical campus.
+MODELS = {
+    'switch': ('Switches and Hubs', 'Cisco Catalyst 9300 Switch', 'Cisco Catalyst 9300 Series Switches',
+               'C9300-48P', 'ACCESS', 'sw'),
+    'core': ('Switches and Hubs', 'Cisco Catalyst 9500 Switch', 'Cisco Catalyst 9500 Series Switches',
+             'C9500-24Y4C', 'DISTRIBUTION', 'core'),
+    'router': ('Routers', 'Cisco Catalyst 8300 Edge Platform', 'Cisco Catalyst 8300 Series Edge Platforms',
+               'C8300-1N1S-6T', 'BORDER ROUTER', 'rtr'),
+    'wlc': ('Wireless Controller', 'Cisco Catalyst 9800-40 Wireless Controller',
+            'Cisco Catalyst 9800 Wireless Controllers', 'C9800-40-K9', 'ACCESS', 'wlc'),
+    'ap': ('Unified AP', 'Cisco Catalyst 9130AXI Unified Access Point', 'Cisco Catalyst 9100 Series Access Points',
+           'C9130AXI-B', 'ACCESS', 'ap')
+}
+DEVICE_MIX = ['switch'] * 12 + ['core', 'router', 'wlc'] + ['ap'] * 5
+SOFTWARE_VERSIONS = ['17.6.5', '17.9.4a', '17.12.2']
+COMPLIANCE_TYPES = ['RUNNING_CONFIG', 'IMAGE', 'PSIRT', 'NETWORK_SETTINGS', 'NETWORK_PROFILE', 'EOX']
+SIR_LEVELS = ['Critical', 'High', 'Medium', 'Low']
+# Syslog mnemonics used for synthetic device events: (facility, mnemonic, severity)
+MNEMONICS = [('LINK', 'UPDOWN', 3), ('LINEPROTO', 'UPDOWN', 5), ('SYS', 'CONFIG_I', 5),
+             ('SEC_LOGIN', 'LOGIN_SUCCESS', 5), ('OSPF', 'ADJCHG', 5), ('PLATFORM', 'ENVMON', 2)]
+# Number of devices per building site, and buildings per area
+BUILDING_SIZE = 50
+AREA_SIZE = 10
+# Days of event history kept by every device
+EVENT_HISTORY_DAYS = 90
+# Kinds of generated UUIDs
+DEVICE, SITE = 1, 2
+# Salts of the values derived with "Fleet._mix"
+VERSION, EXPOSURE, EVENT = 1, 2, 3
+MASK = (1 << 64) - 1
+
+
+class Fleet:
+    # Synthetic inventory of "size" devices with their sites, configurations, compliance state, security advisories
+    # and syslog events. Nothing is stored per device: every value is derived from the device index and "seed", so
+    # a fleet of 50,000 devices starts instantly, uses little memory and is identical on every run with the same
+    # seed. UUIDs encode the seed, kind and index, so they can be mapped back to a device without a lookup table.
+
+    def __init__(self, size=1000, seed=1, advisories=30, events_per_hour=6):
+        self.size = size
+        self.seed = seed
+        self.advisory_count = advisories
+        self.events_per_hour = events_per_hour
+        self.buildings = (size + BUILDING_SIZE - 1) // BUILDING_SIZE
+        self.areas = (self.buildings + AREA_SIZE - 1) // AREA_SIZE
+        self.started = int(time.time() * 1000)
+
+    def _uuid(self, kind, index):
+        return f'{self.seed:08x}-{kind:04x}-4000-8000-{index:012x}'
+
+    def _index(self, kind, value):
+        # return (int): Index encoded in a UUID of "kind", or None if the UUID does not belong to this fleet
+        parts = str(value).lower().split('-')
+        if len(parts) != 5 or parts[0] != f'{self.seed:08x}' or parts[1] != f'{kind:04x}':
+            return None
+        try:
+            return int(parts[4], 16)
+        except ValueError:
+            return None
+
+    def _random(self, *key):
+        return random.Random(f'{self.seed}:' + ':'.join(str(part) for part in key))
+
+    def _mix(self, *values):
+        # return (int): 64-bit hash of the seed and integer "values" (SplitMix64 steps). Much cheaper than seeding a
+        # random.Random, for values derived in bulk such as event times.
+        h = self.seed
+        for value in values:
+            z = (h + value + 0x9E3779B97F4A7C15) & MASK
+            z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9 & MASK
+            z = (z ^ (z >> 27)) * 0x94D049BB133111EB & MASK
+            h = z ^ (z >> 31)
+        return h
+
+    # Devices
+
+    def model(self, index):
+        return MODELS[DEVICE_MIX[index % len(DEVICE_MIX)]]
+
+    def hostname(self, index):
+        return f'{self.model(index)[5]}-{index:06d}'
+
+    def device_index(self, value):
+        # param value (str): Device UUID or hostname (case insensitive)
+        # return (int): Index of the device, or None if it is not part of the fleet
+        index = self._index(DEVICE, value)
+        if index is None:
+            match = re.fullmatch(r'([a-z]+)-(\d+)', str(value).lower())
+            if match and match.group(1) == self.model(int(match.group(2)))[5]:
+                index = int(match.group(2))
+        return index if index is not None and index < self.size else None
+
+    def device(self, index):
+        # return (dict): Device in the format of the "Get Device List" API
+        family, device_type, series, platform, role, _ = self.model(index)
+        rng = self._random('device', index)
+        reachable = rng.random() > 0.01
+        return {
+            'id': self._uuid(DEVICE, index),
+            'instanceUuid': self._uuid(DEVICE, index),
+            'hostname': self.hostname(index),
+            'managementIpAddress': f'10.{index >> 16 & 255}.{index >> 8 & 255}.{index & 255}',
+            'macAddress': ':'.join(f'{b:02x}' for b in (0, 0x1b, 0x54, index >> 16 & 255, index >> 8 & 255,
+                                                        index & 255)),
+            'serialNumber': f'FOC{self.seed % 100:02d}{index:07d}',
+            'platformId': platform,
+            'family': family,
+            'type': device_type,
+            'series': series,
+            'role': role,
+            'softwareType': 'IOS-XE',
+            'softwareVersion': self.software_version(index),
+            'reachabilityStatus': 'Reachable' if reachable else 'Unreachable',
+            'collectionStatus': 'Managed' if reachable else 'Partial Collection Failure',
+            'upTime': f'{rng.randint(1, 400)} days, {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00.00',
+            'lastUpdateTime': self.started - rng.randint(0, 3600000),
+            'location': self.site_name(self.building(index)),
+            'errorCode': None if reachable else 'DEV-UNREACHED'
+        }
+
+    def summary(self, index):
+        # return (dict): The device fields that do not need a random.Random, enough for most inventory filters
+        family, device_type, series, platform, role, _ = self.model(index)
+        return {'id': self._uuid(DEVICE, index), 'hostname': self.hostname(index), 'family': family,
+                'type': device_type, 'series': series, 'platformId': platform, 'role': role,
+                'softwareType': 'IOS-XE', 'softwareVersion': self.software_version(index)}
+
+    def software_version(self, index):
+        return SOFTWARE_VERSIONS[self._mix(VERSION, index) % len(SOFTWARE_VERSIONS)]
+
+    @lru_cache(maxsize=256)
+    def select(self, filters):
+        # param filters (tuple): Sorted (field, values) pairs of "Get Device List" query parameters. Values of one
+        # field match any of them; a value containing "*" is a regular expression, as accepted by DNAC.
+        # return (list): Indexes of the matching devices, in inventory order
+
+        if not filters:
+            return range(self.size)
+        indexes = None
+        for field, values in filters:
+            if field == 'id':
+                found = {self.device_index(v.strip()) for value in values for v in value.split(',')}
+                indexes = sorted(i for i in found if i is not None and (indexes is None or i in indexes))
+        patterns = [(field, [re.compile(v, re.I) if '*' in v else v.lower() for v in values])
+                    for field, values in filters if field != 'id']
+        if not patterns:
+            return indexes
+        if indexes is None and len(patterns) == 1 and patterns[0][0] == 'hostname' and \
+                all(isinstance(p, str) for p in patterns[0][1]):
+            # Exact hostname lookups, e.g. from a CSV of devices, need no scan
+            found = {self.device_index(value) for value in patterns[0][1]}
+            return sorted(i for i in found if i is not None)
+
+        def matches(device):
+            for field, values in patterns:
+                value = '' if device.get(field) is None else str(device[field]).lower()
+                if not any(p.fullmatch(value) if not isinstance(p, str) else p == value for p in values):
+                    return False
+            return True
+
+        lookup = self.summary if all(field in self.summary(0) for field, _ in patterns) else self.device
+        return [i for i in (indexes if indexes is not None else range(self.size)) if matches(lookup(i))]
+
+    def config(self, index):
+        # return (str): Running configuration of the device
+        device = self.device(index)
+        rng = self._random('config', index)
+        ports = 48 if device['family'] == 'Switches and Hubs' else 4
+        lines = [f'Building configuration...', '', f'Current configuration : {4000 + 160 * ports} bytes', '!',
+                 f'version {device["softwareVersion"].rsplit(".", 1)[0]}', 'service timestamps debug datetime msec',
+                 'service timestamps log datetime msec', 'service password-encryption', '!',
+                 f'hostname {device["hostname"]}', '!', 'aaa new-model', '!', 'ip domain name example.com', '!']
+        for port in range(1, ports + 1):
+            vlan = 100 + rng.randrange(10)
+            lines += [f'interface GigabitEthernet1/0/{port}', f' description User port {port}',
+                      ' switchport mode access', f' switchport access vlan {vlan}', ' spanning-tree portfast', '!']
+        lines += ['interface Vlan1', f' ip address {device["managementIpAddress"]} 255.255.0.0', '!',
+                  'logging host 10.255.0.10', 'snmp-server community <removed> RO', 'ntp server 10.255.0.1',
+                  'line vty 0 15', ' transport input ssh', '!', 'end']
+        return '\n'.join(lines) + '\n'
+
+    def compliance(self, index):
+        # return (list): Compliance status of each compliance type of the device
+        rng = self._random('compliance', index)
+        device_id = self._uuid(DEVICE, index)
+        result = []
+        for compliance_type in COMPLIANCE_TYPES:
+            status = 'NON_COMPLIANT' if rng.random() < 0.1 else 'COMPLIANT'
+            result.append({'deviceUuid': device_id, 'complianceType': compliance_type, 'status': status,
+                           'state': 'SUCCESS', 'lastSyncTime': self.started - 86400000,
+                           'lastUpdateTime': self.started - rng.randint(0, 86400000),
+                           'sourceInfoList': [] if status == 'COMPLIANT' else
+                           [{'name': compliance_type, 'type': 'DIFF', 'count': rng.randint(1, 5)}]})
+        return result
+
+    def show_command(self, index, command):
+        # return (str): Output of a "show" command on the device
+        device = self.device(index)
+        if command.startswith('show version'):
+            return (f'Cisco IOS XE Software, Version {device["softwareVersion"]}\n'
+                    f'{device["hostname"]} uptime is {device["upTime"]}\n'
+                    f'cisco {device["platformId"]} processor\nProcessor board ID {device["serialNumber"]}\n')
+        if command.startswith('show inventory'):
+            return (f'NAME: "Chassis", DESCR: "{device["type"]}"\n'
+                    f'PID: {device["platformId"]}        , VID: V02  , SN: {device["serialNumber"]}\n\n'
+                    f'NAME: "Power Supply 1", DESCR: "Power Supply"\n'
+                    f'PID: PWR-C1-715WAC       , VID: V01  , SN: LIT{index:08d}\n')
+        return f'{device["hostname"]}#{command}\n% Output of "{command}" generated by the mock DNAC server\n'
+
+    # Sites
+
+    def building(self, index):
+        return index // BUILDING_SIZE
+
+    def site_name(self, building):
+        return f'Global/Area {building // AREA_SIZE + 1}/Building {building + 1}'
+
+    def find_site(self, name):
+        # param name (str): Site hierarchy name
+        # return (dict): Site in the format of the "Get Site" API, or None
+        match = re.fullmatch(r'Global/Area (\d+)(?:/Building (\d+))?', name.strip().rstrip('/'), re.I)
+        if not match:
+            return None
+        area, building = int(match.group(1)) - 1, match.group(2) and int(match.group(2)) - 1
+        if building is None:
+            if area >= self.areas:
+                return None
+            number, site_type = self.buildings + area, 'area'
+        else:
+            if building >= self.buildings or building // AREA_SIZE != area:
+                return None
+            number, site_type = building, 'building'
+        return {'id': self._uuid(SITE, number), 'name': name.rstrip('/').rsplit('/', 1)[-1],
+                'siteNameHierarchy': name.rstrip('/'), 'additionalInfo': [{'attributes': {'type': site_type}}]}
+
+    def site_devices(self, site_id):
+        # return (list): Indexes of the devices in the site and its child sites, or None for an unknown site
+        number = self._index(SITE, site_id)
+        if number is None or number >= self.buildings + self.areas:
+            return None
+        if number < self.buildings:
+            buildings = [number]
+        else:
+            area = number - self.buildings
+            buildings = range(area * AREA_SIZE, min((area + 1) * AREA_SIZE, self.buildings))
+        return [i for b in buildings for i in range(b * BUILDING_SIZE, min((b + 1) * BUILDING_SIZE, self.size))]
+
+    # Security advisories
+
+    @lru_cache(maxsize=1)
+    def advisories(self):
+        # return (list): Advisories in the format of the "Get Advisories List" API, without device counts
+        result = []
+        for number in range(self.advisory_count):
+            rng = self._random('advisory', number)
+            sir = SIR_LEVELS[min(int(rng.expovariate(1.2)), len(SIR_LEVELS) - 1)]
+            detection = 'CONFIG' if rng.random() < 0.4 else 'VERSION'
+            result.append({
+                'advisoryId': f'cisco-sa-mock-{number + 1:04d}',
+                'cves': [f'CVE-2026-{20000 + number * 3 + n}' for n in range(rng.randint(1, 3))],
+                'publicationUrl': f'https://sec.cloudapps.cisco.com/security/center/content/CiscoSecurityAdvisory/'
+                                  f'cisco-sa-mock-{number + 1:04d}',
+                'sir': sir,
+                'cvssBaseScore': round({'Critical': 9.0, 'High': 7.0, 'Medium': 4.0, 'Low': 0.1}[sir]
+                                       + rng.random() * 0.9, 1),
+                'detectionType': detection,
+                'defaultDetectionType': detection,
+                'defaultConfigMatchPattern': 'ip http server' if detection == 'CONFIG' else None,
+                'fixedVersions': {'17': ['17.12.3']},
+                'hiddenDeviceCount': 0,
+                # Share of the fleet exposed, and the software versions affected
+                '_exposure': rng.uniform(0.02, 0.3),
+                '_versions': set(rng.sample(SOFTWARE_VERSIONS, rng.randint(1, len(SOFTWARE_VERSIONS))))
+            })
+        return result
+
+    @lru_cache(maxsize=1024)
+    def advisory_devices(self, advisory_id):
+        # return (list): UUIDs of the devices exposed to the advisory, or None for an unknown advisory
+        for number, advisory in enumerate(self.advisories()):
+            if advisory['advisoryId'] == advisory_id:
+                break
+        else:
+            return None
+        devices = []
+        for index in range(self.size):
+            if self.model(index)[0] == 'Unified AP':
+                continue
+            if self._mix(EXPOSURE, number, index) / MASK < advisory['_exposure'] and \
+                    self.software_version(index) in advisory['_versions']:
+                devices.append(self._uuid(DEVICE, index))
+        return devices
+
+    def advisory_list(self):
+        return [dict({k: v for k, v in advisory.items() if not k.startswith('_')},
+                     deviceCount=len(self.advisory_devices(advisory['advisoryId'])))
+                for advisory in self.advisories()]
+
+    def advisory_summary(self):
+        # return (dict): Advisory counts per SIR level and detection type, as the "Get Advisories Summary" API
+        summary = {level.upper(): {'CONFIG': 0, 'VERSION': 0, 'TOTAL': 0} for level in SIR_LEVELS}
+        summary['NA'] = {'CONFIG': 0, 'VERSION': 0, 'TOTAL': 0}
+        for advisory in self.advisories():
+            counts = summary[advisory['sir'].upper()]
+            counts[advisory['detectionType']] += 1
+            counts['TOTAL'] += 1
+        return summary
+
+    # Events
+
+    def events(self, index, start, end, offset=1, limit=5000):
+        # param start, end (int): Epoch milliseconds bounding the query, both inclusive
+        # param offset (int): 1-based position of the first event returned
+        # return events, total: One page of the device's events, newest first, and the number in the window.
+        # Events occur "events_per_hour" times an hour on average, at times derived from the device and the hour
+        # slot, so overlapping queries always see the same events. Events cover the last EVENT_HISTORY_DAYS days and none
+        # is later than the current time.
+
+        period = int(3600000 / self.events_per_hour) if self.events_per_hour > 0 else 0
+        end = min(end, int(time.time() * 1000))
+        start = max(start, self.started - EVENT_HISTORY_DAYS * 86400000)
+        if not period or end < start:
+            return [], 0
+        slots = range(end // period, start // period - 1, -1)
+        times = [(slot * period + self._mix(EVENT, index, slot) % period, slot) for slot in slots]
+        times = [(timestamp, slot) for timestamp, slot in times if start <= timestamp <= end]
+        page = times[offset - 1:offset - 1 + limit]
+        device_id = self._uuid(DEVICE, index)
+        events = []
+        for timestamp, slot in page:
+            facility, mnemonic, severity = MNEMONICS[(self._mix(EVENT, index, slot) >> 32) % len(MNEMONICS)]
+            events.append({
+                'id': f'{device_id}-{slot:x}',
+                'name': f'SYSLOG-{facility}-{mnemonic}',
+                'eventName': f'{facility}-{severity}-{mnemonic}',
+                'timestamp': timestamp,
+                'severity': str(severity),
+                'details': [{'key': 'Mnemonic', 'value': mnemonic}, {'key': 'Facility', 'value': facility},
+                            {'key': 'Severity', 'value': str(severity)},
+                            {'key': 'Message Text', 'value': f'%{facility}-{severity}-{mnemonic}: synthetic event'}]
+            })
+        return events, len(times)
@@ -0,0 +1,123 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import logging
+import sys
+import os
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import logger
+from fleet import Fleet
+import mock_server
+
+
+def start(arguments):
+    # param arguments (Namespace): Parsed CLI arguments
+    # return server (mock_server.MockServer): Server bound to its port, not yet serving
+
+    fleet = Fleet(arguments.devices, arguments.seed, arguments.advisories, arguments.events_per_hour)
+    return mock_server.MockServer(fleet, arguments.host, arguments.port, arguments.certfile, arguments.keyfile,
+                                  arguments.latency, arguments.jitter, arguments.rate_limit, arguments.burst,
+                                  arguments.error_rate, arguments.error_status, arguments.task_delay,
+                                  arguments.task_error_rate, arguments.username, arguments.password,
+                                  arguments.token_lifetime, arguments.seed)
+
+
+def main(arguments):
+    # param arguments (Namespace): Parsed CLI arguments
+    # Serves the mock DNAC API until interrupted
+
+    logger.logger(arguments.logging_level, arguments.logging_file)
+    server = start(arguments)
+    print(f'Mock DNAC serving {arguments.devices} devices on https://{arguments.host}:{server.server_port} '
+          f'(Ctrl+C to stop)', flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logging.info(f'Mock DNAC statistics: {server.stats()}')
+
+
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages
+    # return args (Namespace): Parsed arguments
+    parser = argparse.ArgumentParser(description='Local stand-in for the DNAC APIs used by this repository. Serves '
+                                                 'a synthetic fleet of devices over HTTPS, with configurable '
+                                                 'latency, throttling, errors and task delays, for testing the '
+                                                 'scripts offline and at scale.', prog=prog)
+    log_settings = parser.add_argument_group('Log Settings')
+    log_settings.add_argument('-l', '--logging_level', type=str, help='Set logging level. Available levels are: '
+                                                                      'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET')
+    log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.')
+    server_settings = parser.add_argument_group('Server')
+    server_settings.add_argument('--host', type=str, default=mock_server.DEFAULT_HOST, help='Address to listen on. '
+                                 f'Default is "{mock_server.DEFAULT_HOST}".')
+    server_settings.add_argument('--port', type=int, default=mock_server.DEFAULT_PORT, help='TCP port to listen on. '
+                                 f'Default is {mock_server.DEFAULT_PORT}; 0 picks a free port.')
+    server_settings.add_argument('--certfile', type=str, help='TLS certificate (PEM). By default a self-signed '
+                                 'certificate is created with the "openssl" command.')
+    server_settings.add_argument('--keyfile', type=str, help='Private key of --certfile (PEM).')
+    server_settings.add_argument('--username', type=str, help='Username accepted by the token API. Any credentials '
+                                 'are accepted if not given.')
+    server_settings.add_argument('--password', type=str, help='Password accepted by the token API.')
+    server_settings.add_argument('--token_lifetime', type=int, default=3600, help='Seconds a token is valid. '
+                                 'Default is 3600.')
+    fleet_settings = parser.add_argument_group('Fleet')
+    fleet_settings.add_argument('-n', '--devices', type=int, default=1000, help='Number of devices. Default is '
+                                '1000.')
+    fleet_settings.add_argument('--seed', type=int, default=1, help='Seed of the generated data; the same seed '
+                                'always gives the same fleet. Default is 1.')
+    fleet_settings.add_argument('--advisories', type=int, default=30, help='Number of security advisories. Default '
+                                'is 30.')
+    fleet_settings.add_argument('--events_per_hour', type=float, default=6, help='Average syslog events per device '
+                                'per hour. Default is 6.')
+    fault_settings = parser.add_argument_group('Latency and Faults')
+    fault_settings.add_argument('--latency', type=float, default=0, help='Milliseconds added to every API call. '
+                                'Default is 0.')
+    fault_settings.add_argument('--jitter', type=float, default=0, help='Random extra milliseconds, between 0 and '
+                                'this value, added to every API call. Default is 0.')
+    fault_settings.add_argument('--rate_limit', type=float, default=0, help='API calls per second accepted; calls '
+                                'above it are answered with 429 Too Many Requests. Default is 0 (no limit).')
+    fault_settings.add_argument('--burst', type=int, help='Calls accepted at once before --rate_limit applies. '
+                                'Default is one second of calls.')
+    fault_settings.add_argument('--error_rate', type=float, default=0, help='Share of API calls, between 0 and 1, '
+                                'answered with an error instead of their result. Default is 0.')
+    fault_settings.add_argument('--error_status', type=int, default=500, help='HTTP status of injected errors. '
+                                'Default is 500.')
+    fault_settings.add_argument('--task_delay', type=float, default=2, help='Seconds before a configuration archive '
+                                'or Command Runner task finishes. Default is 2.')
+    fault_settings.add_argument('--task_error_rate', type=float, default=0, help='Share of tasks, between 0 and 1, '
+                                'that finish with an error. Default is 0.')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    main(parse_args())
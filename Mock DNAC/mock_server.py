@@ -0,0 +1,547 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import base64
+import json
+import logging
+import math
+import os
+import random
+import re
+import shutil
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils.rate_limiter import RateLimiter
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8443
+INTENT = '/dna/intent/api/v1'
+# Largest page accepted by "Get Device List", and largest "limit" accepted by "deviceEventsView"
+DEVICE_PAGE_LIMIT = 500
+EVENT_PAGE_LIMIT = 5131
+# "Get Device List" query parameters that are not device filters
+PAGING = {'offset', 'limit', 'sortBy', 'order'}
+# First words of the commands accepted by Command Runner
+LEGIT_READS = ['cat', 'copy', 'debug', 'dir', 'lsmod', 'more', 'ping', 'pwd', 'show', 'test', 'traceroute',
+               'verify', 'who', 'whoami']
+# Device families rejected by the Configuration Archive API
+ARCHIVE_UNSUPPORTED = {'Unified AP', 'Wireless Sensor', 'Cisco Interfaces and Modules'}
+# Password rules of the Configuration Archive API
+PASSWORD_RULE = r'(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[^a-zA-Z\d]).{8,}'
+# Finished task results kept for download, and seconds a task is kept; older ones are dropped first
+MAX_FILES = 1000
+TASK_RETENTION = 3600
+
+
+class MockError(Exception):
+    # Raised by route handlers; answered with "status" and the DNAC style error body
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def self_signed_cert(directory):
+    # param directory (str): Directory in which to create the files
+    # return certfile, keyfile: Paths of a new self-signed certificate for "localhost" and its key, created with the
+    # "openssl" command. The scripts do not verify the certificate of DNAC.
+    if not shutil.which('openssl'):
+        raise RuntimeError('The "openssl" command was not found; give a certificate with --certfile and --keyfile.')
+    certfile, keyfile = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '30', '-subj',
+                    '/CN=localhost', '-keyout', keyfile, '-out', certfile], check=True, capture_output=True)
+    return certfile, keyfile
+
+
+class ChunkedWriter:
+    # File-like object sending what is written to it as an HTTP/1.1 chunked response body, so large files are
+    # generated while they are sent instead of being built in memory first.
+
+    def __init__(self, wfile, chunk_size=65536):
+        self.wfile = wfile
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += data.encode() if isinstance(data, str) else data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self.wfile.write(f'{len(self.buffer):x}\r\n'.encode() + bytes(self.buffer) + b'\r\n')
+            self.buffer.clear()
+
+    def close(self):
+        self.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+
+class MockServer(ThreadingHTTPServer):
+    # Local stand-in for the DNAC APIs used by this repository, serving a synthetic fleet over HTTPS.
+    # param fleet (fleet.Fleet): Devices and the data derived from them
+    # param latency, jitter (float): Milliseconds added to every API call, the jitter being uniformly distributed
+    # param rate_limit (float): API calls per second accepted; calls above it are answered with 429 and a
+    # "Retry-After" header. 0 for no limit.
+    # param error_rate (float): Share of API calls answered with "error_status" instead of their result
+    # param task_delay (float): Seconds before an archive or Command Runner task finishes
+    # param task_error_rate (float): Share of tasks that finish with "isError": true
+    # param username, password (str): Credentials accepted by the token API; any are accepted if not given
+
+    daemon_threads = True
+
+    def __init__(self, fleet, host=DEFAULT_HOST, port=DEFAULT_PORT, certfile=None, keyfile=None, latency=0,
+                 jitter=0, rate_limit=0, burst=None, error_rate=0, error_status=500, task_delay=0,
+                 task_error_rate=0, username=None, password=None, token_lifetime=3600, seed=1):
+        super().__init__((host, port), MockHandler)
+        self.fleet = fleet
+        self.latency = latency
+        self.jitter = jitter
+        self.limiter = RateLimiter(rate_limit, burst) if rate_limit else None
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.task_delay = task_delay
+        self.task_error_rate = task_error_rate
+        self.credentials = (username, password) if username else None
+        self.token_lifetime = token_lifetime
+        self.random = random.Random(seed)
+        self.tokens = {}
+        self.tasks = {}
+        self.files = {}
+        self.lock = threading.Lock()
+        self.calls = Counter()
+        self.totals = Counter()
+        self.started = time.monotonic()
+        self._cert_dir = None
+        if not certfile:
+            self._cert_dir = tempfile.mkdtemp(prefix='mock_dnac_')
+            certfile, keyfile = self_signed_cert(self._cert_dir)
+        self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ssl_context.load_cert_chain(certfile, keyfile)
+
+    def finish_request(self, request, client_address):
+        # The TLS handshake runs in the request thread rather than when accepting, so slow handshakes do not hold
+        # up other clients
+        try:
+            request = self.ssl_context.wrap_socket(request, server_side=True)
+        except (ssl.SSLError, OSError) as e:
+            logging.debug(f'TLS handshake with {client_address[0]} failed: {e}')
+            return
+        try:
+            super().finish_request(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        if self._cert_dir:
+            shutil.rmtree(self._cert_dir, ignore_errors=True)
+
+    def count(self, endpoint, outcome=None):
+        with self.lock:
+            self.calls[endpoint] += 1
+            self.totals['requests'] += 1
+            if outcome:
+                self.totals[outcome] += 1
+
+    def stats(self):
+        # return (dict): Number of API calls per endpoint, and totals of requests, throttled and injected errors
+        with self.lock:
+            return {'devices': self.fleet.size, 'uptimeSeconds': round(time.monotonic() - self.started, 1),
+                    'totals': dict(self.totals), 'calls': dict(self.calls.most_common()),
+                    'tasks': len(self.tasks)}
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+            self.totals.clear()
+
+    def issue_token(self):
+        token = base64.urlsafe_b64encode(os.urandom(24)).decode()
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = {t: expiry for t, expiry in self.tokens.items() if expiry > now}
+            self.tokens[token] = now + self.token_lifetime
+        return token
+
+    def valid_token(self, token):
+        with self.lock:
+            return self.tokens.get(token, 0) > time.monotonic()
+
+    def create_task(self, kind, **details):
+        # return (str): ID of a new task finishing "task_delay" seconds from now
+        task_id = str(uuid.uuid4())
+        with self.lock:
+            now = time.monotonic()
+            self.tasks = {t: task for t, task in self.tasks.items() if now - task['created'] < TASK_RETENTION}
+            self.tasks[task_id] = dict(details, kind=kind, created=now, startTime=int(time.time() * 1000),
+                                       failed=self.random.random() < self.task_error_rate)
+        return task_id
+
+    def task_status(self, task_id):
+        # return (dict): Task in the format of the "Get Task by ID" API. The result file is registered when the
+        # task is first seen finished.
+        with self.lock:
+            task = self.tasks.get(task_id)
+        if task is None:
+            raise MockError(404, f'Task {task_id} was not found.')
+        status = {'id': task_id, 'startTime': task['startTime'], 'version': task['startTime'], 'isError': False,
+                  'serviceType': 'Mock DNAC', 'progress': 'In Progress'}
+        if time.monotonic() - task['created'] < self.task_delay:
+            return status
+        status['endTime'] = task['startTime'] + int(self.task_delay * 1000)
+        if task['failed'] or task.get('failureReason'):
+            status.update(isError=True, progress='Task failed', errorCode='MOCK_TASK_ERROR',
+                          failureReason=task.get('failureReason') or 'Error injected by the mock DNAC server')
+            return status
+        with self.lock:
+            if 'fileId' not in task:
+                task['fileId'] = str(uuid.uuid4())
+                self.files[task['fileId']] = task
+                while len(self.files) > MAX_FILES:
+                    del self.files[next(iter(self.files))]
+        if task['kind'] == 'archive':
+            status.update(progress='Device configuration archive created',
+                          additionalStatusURL=f'/api/v1/file/{task["fileId"]}')
+        else:
+            status['progress'] = json.dumps({'fileId': task['fileId']})
+        return status
+
+
+def _one(query, name, default=None):
+    values = query.get(name)
+    return values[0] if values else default
+
+
+def _integer(query, name, default):
+    try:
+        return int(_one(query, name, default))
+    except ValueError:
+        raise MockError(400, f'Invalid value for "{name}".')
+
+
+def _device_index(fleet, device_id):
+    index = fleet.device_index(device_id)
+    if index is None:
+        raise MockError(404, f'Device {device_id} was not found.')
+    return index
+
+
+def get_devices(server, match, query, body):
+    offset = _integer(query, 'offset', 1)
+    limit = _integer(query, 'limit', DEVICE_PAGE_LIMIT)
+    if offset < 1 or not 0 < limit <= DEVICE_PAGE_LIMIT:
+        raise MockError(400, f'"offset" must be 1 or more and "limit" between 1 and {DEVICE_PAGE_LIMIT}.')
+    filters = tuple(sorted((name, tuple(values)) for name, values in query.items() if name not in PAGING))
+    indexes = server.fleet.select(filters)
+    return {'response': [server.fleet.device(i) for i in indexes[offset - 1:offset - 1 + limit]],
+            'version': '1.0'}
+
+
+def get_device(server, match, query, body):
+    return {'response': server.fleet.device(_device_index(server.fleet, match['id'])), 'version': '1.0'}
+
+
+def get_device_config(server, match, query, body):
+    return {'response': server.fleet.config(_device_index(server.fleet, match['id'])), 'version': '1.0'}
+
+
+def get_compliance(server, match, query, body):
+    result = server.fleet.compliance(_device_index(server.fleet, match['id']))
+    compliance_type = _one(query, 'complianceType')
+    if compliance_type:
+        result = [item for item in result if item['complianceType'] == compliance_type]
+    return {'response': result, 'version': '1.0'}
+
+
+def get_site(server, match, query, body):
+    name = _one(query, 'name')
+    if name:
+        site = server.fleet.find_site(name)
+        if site is None:
+            raise MockError(404, f'Site "{name}" was not found.')
+        return {'response': [site]}
+    fleet = server.fleet
+    names = [f'Global/Area {a + 1}' for a in range(fleet.areas)] + \
+            [fleet.site_name(b) for b in range(fleet.buildings)]
+    return {'response': [fleet.find_site(n) for n in names]}
+
+
+def get_membership(server, match, query, body):
+    indexes = server.fleet.site_devices(match['id'])
+    if indexes is None:
+        raise MockError(404, f'Site {match["id"]} was not found.')
+    return {'site': {'response': [], 'version': '1.0'},
+            'device': [{'response': [server.fleet.device(i) for i in indexes], 'siteId': match['id']}]}
+
+
+def archive_configs(server, match, query, body):
+    device_ids = body.get('deviceId') or []
+    if isinstance(device_ids, str):
+        device_ids = device_ids.split(',')
+    if not device_ids or not body.get('password'):
+        raise MockError(400, '"deviceId" and "password" are required.')
+    if not re.fullmatch(PASSWORD_RULE, body['password']):
+        raise MockError(400, 'The password must be at least 8 characters long and contain an uppercase letter, a '
+                             'lowercase letter, a digit and a special character.')
+    indexes = [server.fleet.device_index(device_id) for device_id in device_ids]
+    failure = None
+    if None in indexes:
+        failure = f'Device {device_ids[indexes.index(None)]} was not found.'
+    elif any(server.fleet.model(i)[0] in ARCHIVE_UNSUPPORTED for i in indexes):
+        failure = 'The request contains devices of a family that does not support configuration archives.'
+    task_id = server.create_task('archive', indexes=indexes, failureReason=failure)
+    return 202, {'response': {'taskId': task_id, 'url': f'/api/v1/task/{task_id}'}, 'version': '1.0'}
+
+
+def get_legit_reads(server, match, query, body):
+    return {'response': LEGIT_READS, 'version': '1.0'}
+
+
+def read_request(server, match, query, body):
+    commands, device_ids = body.get('commands'), body.get('deviceUuids')
+    if not isinstance(commands, list) or not commands or not isinstance(device_ids, list) or not device_ids:
+        raise MockError(400, '"commands" and "deviceUuids" must be non-empty lists.')
+    task_id = server.create_task('commands', commands=commands, deviceUuids=device_ids)
+    return 202, {'response': {'taskId': task_id, 'url': f'/api/v1/task/{task_id}'}, 'version': '1.0'}
+
+
+def get_task(server, match, query, body):
+    return {'response': server.task_status(match['id']), 'version': '1.0'}
+
+
+def get_file(server, match, query, body):
+    with server.lock:
+        task = server.files.get(match['id'])
+    if task is None:
+        raise MockError(404, f'File {match["id"]} was not found.')
+    if task['kind'] == 'archive':
+        return FileResponse(f'config_archive_{match["id"]}.zip', 'application/zip',
+                            lambda out: write_archive(server.fleet, task['indexes'], out))
+    return FileResponse(match['id'], 'application/json',
+                        lambda out: write_command_results(server.fleet, task['commands'], task['deviceUuids'], out))
+
+
+def write_archive(fleet, indexes, out):
+    # Running configuration of each device in a folder named after the device. Unlike DNAC, the ZIP file is not
+    # encrypted with the requested password, as "zipfile" cannot write encrypted files.
+    with zipfile.ZipFile(out, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for index in indexes:
+            device = fleet.device(index)
+            folder = f'{device["hostname"]}_{device["managementIpAddress"]}'
+            archive.writestr(f'{folder}/{folder}_RUNNINGCONFIG.cfg', fleet.config(index))
+
+
+def write_command_results(fleet, commands, device_ids, out):
+    # Command Runner result file: a JSON array with the outputs of each device, one device at a time
+    out.write('[')
+    for n, device_id in enumerate(device_ids):
+        responses = {'SUCCESS': {}, 'FAILURE': {}, 'BLACKLISTED': {}}
+        index = fleet.device_index(device_id)
+        reachable = index is not None and fleet.device(index)['reachabilityStatus'] == 'Reachable'
+        for command in commands:
+            if command.split(' ')[0].lower() not in LEGIT_READS:
+                responses['BLACKLISTED'][command] = 'Command not allowed by Command Runner'
+            elif not reachable:
+                responses['FAILURE'][command] = 'Device is unreachable or was not found'
+            else:
+                responses['SUCCESS'][command] = fleet.show_command(index, command)
+        out.write((',' if n else '') + json.dumps({'deviceUuid': device_id, 'commandResponses': responses}))
+    out.write(']')
+
+
+def advisory_summary(server, match, query, body):
+    return {'response': server.fleet.advisory_summary(), 'version': '1.0'}
+
+
+def advisory_list(server, match, query, body):
+    return {'response': server.fleet.advisory_list(), 'version': '1.0'}
+
+
+def advisory_devices(server, match, query, body):
+    devices = server.fleet.advisory_devices(match['id'])
+    if devices is None:
+        raise MockError(404, f'Advisory {match["id"]} was not found.')
+    return {'response': devices, 'version': '1.0'}
+
+
+def device_events(server, match, query, body):
+    device_id = _one(query, 'entityId')
+    if not device_id or _one(query, 'startTime') is None or _one(query, 'endTime') is None:
+        raise MockError(400, '"entityId", "startTime" and "endTime" are required.')
+    limit = min(_integer(query, 'limit', 100), EVENT_PAGE_LIMIT)
+    index = _device_index(server.fleet, device_id)
+    events, total = server.fleet.events(index, _integer(query, 'startTime', 0), _integer(query, 'endTime', 0),
+                                        max(_integer(query, 'offset', 1), 1), limit)
+    if (_one(query, 'order') or 'desc').lower() == 'asc':
+        events.reverse()
+    return {'response': events, 'totalCount': min(total, EVENT_PAGE_LIMIT), 'version': '1.0'}
+
+
+class FileResponse:
+    # Route result sent as a streamed file download with a "fileName" header
+    def __init__(self, filename, content_type, write):
+        self.filename = filename
+        self.content_type = content_type
+        self.write = write
+
+
+# (method, path pattern, handler). Handlers receive the server, the path match, the parsed query string and the
+# decoded JSON body, and return the response data or a (status, data) tuple.
+ROUTES = [(method, re.compile(pattern), handler) for method, pattern, handler in [
+    ('GET', f'{INTENT}/network-device', get_devices),
+    ('GET', f'{INTENT}/network-device/(?P<id>[^/]+)', get_device),
+    ('GET', f'{INTENT}/network-device/(?P<id>[^/]+)/config', get_device_config),
+    ('GET', f'{INTENT}/compliance/(?P<id>[^/]+)/detail', get_compliance),
+    ('GET', f'{INTENT}/site', get_site),
+    ('GET', f'{INTENT}/membership/(?P<id>[^/]+)', get_membership),
+    ('POST', f'{INTENT}/network-device-archive/cleartext', archive_configs),
+    ('GET', f'{INTENT}/network-device-poller/cli/legit-reads', get_legit_reads),
+    ('POST', f'{INTENT}/network-device-poller/cli/read-request', read_request),
+    ('GET', f'{INTENT}/task/(?P<id>[^/]+)', get_task),
+    ('GET', f'{INTENT}/file/(?P<id>[^/]+)', get_file),
+    ('GET', f'{INTENT}/security-advisory/advisory/aggregate', advisory_summary),
+    ('GET', f'{INTENT}/security-advisory/advisory', advisory_list),
+    ('GET', f'{INTENT}/security-advisory/advisory/(?P<id>[^/]+)/device', advisory_devices),
+    ('GET', '/api/assurance/v1/events/deviceEventsView', device_events)
+]]
+TOKEN_PATH = '/dna/system/api/v1/auth/token'
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without this, delayed ACKs add 40 ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        logging.debug(f'{self.address_string()} {format % args}')
+
+    def _send(self, status, data, headers=None):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(status, {'response': {'errorCode': f'MOCK_{status}', 'message': message,
+                                         'detail': message}, 'version': '1.0'}, headers)
+
+    def _send_file(self, result):
+        self.send_response(200)
+        self.send_header('Content-Type', result.content_type)
+        self.send_header('fileName', result.filename)
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        out = ChunkedWriter(self.wfile)
+        result.write(out)
+        out.close()
+
+    def _route(self, method, path):
+        # return endpoint, handler, match: Endpoint name used in the statistics, with IDs replaced by "{id}"
+        for route_method, pattern, handler in ROUTES:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                return f'{method} {pattern.pattern.replace("(?P<id>[^/]+)", "{id}")}', handler, match
+        return f'{method} (unknown)', None, None
+
+    def _handle(self, method):
+        server = self.server
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+        length = int(self.headers.get('content-length') or 0)
+        raw_body = self.rfile.read(length) if length else b''
+
+        if path == '/mock/stats':
+            return self._send(200, server.stats())
+        if path == '/mock/reset' and method == 'POST':
+            server.reset()
+            return self._send(200, server.stats())
+
+        delay = server.latency + (server.random.uniform(0, server.jitter) if server.jitter else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        endpoint, handler, match = (f'POST {TOKEN_PATH}', None, None) if path == TOKEN_PATH else \
+            self._route(method, path)
+        if server.limiter:
+            wait = server.limiter.try_acquire()
+            if wait:
+                server.count(endpoint, 'throttled')
+                # Retry-After is a whole number of seconds (RFC 9110), as a real cluster sends it
+                return self._error(429, 'Too many requests', {'Retry-After': str(max(1, math.ceil(wait)))})
+
+        if path == TOKEN_PATH and method == 'POST':
+            if server.credentials:
+                expected = base64.b64encode(':'.join(server.credentials).encode()).decode()
+                if self.headers.get('authorization') != f'Basic {expected}':
+                    server.count(endpoint, 'unauthorized')
+                    return self._error(401, 'Authentication failed')
+            server.count(endpoint)
+            return self._send(200, {'Token': server.issue_token()})
+        if handler is None:
+            server.count(endpoint, 'not_found')
+            return self._error(404, f'The mock DNAC server does not implement {method} {path}.')
+        if not server.valid_token(self.headers.get('x-auth-token')):
+            server.count(endpoint, 'unauthorized')
+            return self._error(401, 'Missing, invalid or expired "X-Auth-Token" header')
+        if server.error_rate and server.random.random() < server.error_rate:
+            server.count(endpoint, 'injected_errors')
+            return self._error(server.error_status, 'Error injected by the mock DNAC server')
+
+        server.count(endpoint)
+        try:
+            body = json.loads(raw_body) if raw_body else {}
+        except ValueError:
+            return self._error(400, 'The request body is not valid JSON.')
+        try:
+            result = handler(server, match.groupdict(), parse_qs(url.query), body)
+        except MockError as e:
+            return self._error(e.status, str(e))
+        if isinstance(result, FileResponse):
+            return self._send_file(result)
+        status, data = result if isinstance(result, tuple) else (200, result)
+        self._send(status, data)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
@@ -21,9 +21,16 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2022 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
 import logging
-import json
+import sys
+import os
+
+# Append parent directory to path so we can import from top-level packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client, logger
 
 def get_advisory_summary(dnac_token, baseUrl):
     """
@@ -35,11 +42,11 @@ def get_advisory_summary(dnac_token, baseUrl):
     url = baseUrl + '/v1/security-advisory/advisory/aggregate'
     headers = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     logging.info('Getting Security Advisory Summary.')
-    r = requests.get(url, headers=headers, verify=False)
-    logging.debug(f'Security Advisory Summary response:\n{r.status_code}\n{r.headers}\n{r.json()}')
+    r = http_client.get(url, headers=headers, verify=False)
+    logger.log_response('Security Advisory Summary response', r, headers=True)
     if r.status_code != 200:
         logging.critical(f'Security Advisory Summary API responded with code: {r.status_code}')
-        logging.critical(f'Response contents:\n{json.dumps(r.json(), indent=4)}')
+        logger.log_response('Response contents', r, logging.CRITICAL)
         return None
     else:
         return r.json()['response']
@@ -55,11 +62,11 @@ def get_advisory_list(dnac_token, baseUrl):
     url = baseUrl + '/v1/security-advisory/advisory'
     headers = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     logging.info('Getting Security Advisory List.')
-    r = requests.get(url, headers=headers, verify=False)
-    logging.debug(f'Security Advisory List response:\n{r.status_code}\n{r.headers}\n{r.json()}')
+    r = http_client.get(url, headers=headers, verify=False)
+    logger.log_response('Security Advisory List response', r, headers=True)
     if r.status_code != 200:
         logging.critical(f'Security Advisory List API responded with code: {r.status_code}')
-        logging.critical(f'Response contents:\n{json.dumps(r.json(), indent=4)}')
+        logger.log_response('Response contents', r, logging.CRITICAL)
         return None
     else:
         return r.json()['response']
@@ -75,11 +82,11 @@ def get_devices_per_advisory(dnac_token, baseUrl, advisory_id):
     url = baseUrl + '/v1/security-advisory/advisory/' + advisory_id + '/device'
     headers = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     logging.info(f'Getting affected device UUIDs for Security Advisory {advisory_id}.')
-    r = requests.get(url, headers=headers, verify=False)
-    logging.debug(f'Devices Per Security Advisory response:\n{r.status_code}\n{r.headers}\n{r.json()}')
+    r = http_client.get(url, headers=headers, verify=False)
+    logger.log_response('Devices Per Security Advisory response', r, headers=True)
     if r.status_code != 200:
         logging.critical(f'Devices per Security Advisory API responded with code: {r.status_code}')
-        logging.critical(f'Response contents:\n{json.dumps(r.json(), indent=4)}')
+        logger.log_response('Response contents', r, logging.CRITICAL)
         return None
     else:
         return r.json()['response']
@@ -90,26 +97,27 @@ def get_device_detials_by_device_id(dnac_token, baseUrl, device_ids):
     For a given list of Device UUIDs, return the device hostnames.
 
     params: dnac_token, baseUrl, device_ids (String)
-    returns: List of device hostnames, management IPs, serial numbers and UUIDs (JSON Format).
+    returns: List of device hostnames, management IPs, serial numbers, locations and UUIDs (JSON Format).
     Schema:
     [
         {
             'id': '<device_uuid>',
             'hostname': '<device_hostname>',
             'managementIPAddress': '<mgmt_ip>',
-            'serialNumber': '<serial_number>'
+            'serialNumber': '<serial_number>',
+            'location': '<site_hierarchy_or_None>'
         },
     ]
     """
     url = baseUrl + '/v1/network-device'
     headers = {'Content-Type': 'application/json', 'x-auth-token': dnac_token}
     params = {'id': device_ids}
-    logging.debug(f'Getting hostnames for device UUIDs: {device_ids}')
-    r = requests.get(url, headers=headers, params=params, verify=False)
-    logging.debug(f'Get Device List response:\n{r.status_code}\n{r.headers}\n{r.json()}')
+    logging.debug('Getting hostnames for device UUIDs: %s', logger.Preview(device_ids))
+    r = http_client.get(url, headers=headers, params=params, verify=False)
+    logger.log_response('Get Device List response', r, headers=True)
     if r.status_code != 200:
         logging.critical(f'Get Device List API responded with code: {r.status_code}')
-        logging.critical(f'Response contents:\n{json.dumps(r.json(), indent=4)}')
+        logger.log_response('Response contents', r, logging.CRITICAL)
         return None
     else:
         result = []
@@ -119,5 +127,6 @@ def get_device_detials_by_device_id(dnac_token, baseUrl, device_ids):
             device['hostname'] = item['hostname']
             device['managementIpAddress'] = item['managementIpAddress']
             device['serialNumber'] = item['serialNumber']
+            device['location'] = item.get('location')
             result.append(device)
         return result
@@ -0,0 +1,141 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import hashlib
+import json
+import os
+import time
+
+DEFAULT_SNAPSHOT_FILE = 'advisory_snapshot.json'
+
+
+def fingerprint(advisory):
+    """
+    Compute a stable fingerprint of an advisory's fields, ignoring the "affectedDevices" key added by this script.
+    The "deviceCount" field is part of the fingerprint, so a change in the number of affected devices also
+    marks the advisory as changed.
+
+    params: advisory (Dictionary from Get Advisories List API)
+    returns: SHA-256 hex digest (String)
+    """
+    fields = {k: v for k, v in advisory.items() if k != 'affectedDevices'}
+    return hashlib.sha256(json.dumps(fields, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def load_snapshot(filename):
+    """
+    Load a previously saved advisory snapshot.
+
+    params: filename
+    returns: Dictionary with "advisories" ({advisoryId: {"fingerprint", "deviceIds", "resolved"}}) and
+             "devices" ({device UUID: device details}) keys. Empty if no snapshot exists yet.
+    """
+    if not os.path.isfile(filename):
+        logging.info(f'No advisory snapshot found at "{filename}", all advisories will be resolved.')
+        return {'advisories': {}, 'devices': {}}
+    with open(filename) as f:
+        return json.load(f)
+
+
+def save_snapshot(filename, adv_list, previous, reused):
+    """
+    Save the advisory snapshot for the next run. The file is replaced atomically.
+
+    params: filename, adv_list (advisories with "affectedDevices"), previous (snapshot used for this run),
+            reused (Set of advisory IDs whose devices were taken from the previous snapshot)
+    """
+    now = time.time()
+    snapshot = {'advisories': {}, 'devices': {}}
+    for advisory in adv_list:
+        advisory_id = advisory['advisoryId']
+        # Keep the original resolution time for advisories that were reused from the snapshot
+        resolved = previous['advisories'][advisory_id]['resolved'] if advisory_id in reused else now
+        snapshot['advisories'][advisory_id] = {'fingerprint': fingerprint(advisory), 'resolved': resolved,
+                                               'deviceIds': [d['id'] for d in advisory['affectedDevices']]}
+        for device in advisory['affectedDevices']:
+            snapshot['devices'][device['id']] = device
+    with open(filename + '.tmp', 'w') as f:
+        json.dump(snapshot, f)
+    os.replace(filename + '.tmp', filename)
+    logging.info(f'Saved advisory snapshot to "{filename}".')
+
+
+def split_changed(adv_list, snapshot, refresh_days=7):
+    """
+    Separate advisories that must be resolved against DNAC from those whose affected devices can be reused from
+    the snapshot. Reused advisories get their "affectedDevices" key filled in from the snapshot.
+
+    params: adv_list, snapshot, refresh_days (cached entries older than this are always re-resolved)
+    returns: List of advisories that are new, changed or stale, and a Set of reused advisory IDs
+    """
+    cutoff = time.time() - refresh_days * 86400
+    changed = []
+    reused = set()
+    for advisory in adv_list:
+        old = snapshot['advisories'].get(advisory['advisoryId'])
+        if old and old['fingerprint'] == fingerprint(advisory) and old['resolved'] >= cutoff:
+            advisory['affectedDevices'] = [snapshot['devices'][i] for i in old['deviceIds']
+                                           if i in snapshot['devices']]
+            reused.add(advisory['advisoryId'])
+        else:
+            changed.append(advisory)
+    logging.info(f'{len(changed)} of {len(adv_list)} advisories are new or changed since the last snapshot.')
+    return changed, reused
+
+
+def build_delta(adv_list, snapshot):
+    """
+    Compare the current advisories and affected devices with the previous snapshot.
+
+    params: adv_list (advisories with "affectedDevices"), snapshot (previous snapshot)
+    returns: Dictionary with "newAdvisories", "removedAdvisories", "newlyExposed" and "remediated" keys. The last
+             two are lists of {"advisoryId", "id", "hostname", "managementIpAddress", "serialNumber"} dictionaries.
+    """
+    delta = {'newAdvisories': [], 'removedAdvisories': [], 'newlyExposed': [], 'remediated': []}
+    current_ids = set()
+    for advisory in adv_list:
+        advisory_id = advisory['advisoryId']
+        current_ids.add(advisory_id)
+        old = snapshot['advisories'].get(advisory_id)
+        if old is None:
+            delta['newAdvisories'].append(advisory_id)
+        old_devices = set(old['deviceIds']) if old else set()
+        new_devices = {d['id']: d for d in advisory['affectedDevices']}
+        for device_id, device in new_devices.items():
+            if device_id not in old_devices:
+                delta['newlyExposed'].append(dict(device, advisoryId=advisory_id))
+        for device_id in old_devices - set(new_devices):
+            device = snapshot['devices'].get(device_id, {'id': device_id})
+            delta['remediated'].append(dict(device, advisoryId=advisory_id))
+
+    for advisory_id, old in snapshot['advisories'].items():
+        if advisory_id in current_ids:
+            continue
+        delta['removedAdvisories'].append(advisory_id)
+        for device_id in old['deviceIds']:
+            device = snapshot['devices'].get(device_id, {'id': device_id})
+            delta['remediated'].append(dict(device, advisoryId=advisory_id))
+    logging.info(f'Advisory delta: {len(delta["newlyExposed"])} newly exposed, {len(delta["remediated"])} '
+                 f'remediated device/advisory pairs.')
+    return delta
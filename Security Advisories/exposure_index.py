@@ -0,0 +1,158 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import argparse
+import sqlite3
+import json
+import os
+
+DEFAULT_INDEX_FILE = 'exposure_index.db'
+
+# Security Impact Rating values used by the Security Advisory API
+SIR_LEVELS = ['critical', 'high', 'medium', 'low', 'informational']
+
+# CVSS v3 qualitative severity bands, highest first
+CVSS_BANDS = [('critical', 9.0), ('high', 7.0), ('medium', 4.0), ('low', 0.1)]
+
+DEVICE_FIELDS = ['id', 'hostname', 'managementIpAddress', 'serialNumber', 'location']
+
+
+def cvss_band(score):
+    """
+    Map a CVSS base score to its qualitative severity band.
+
+    params: score (Float or None)
+    returns: String band name, or None if there is no score
+    """
+    if score is None:
+        return None
+    for band, minimum in CVSS_BANDS:
+        if score >= minimum:
+            return band
+    return None
+
+
+def build_index(adv_list):
+    """
+    Invert the advisory-centric report into a device-centric index, counting each device's advisories by
+    Security Impact Rating (SIR) and CVSS band.
+
+    params: adv_list (advisories with "affectedDevices" from "main.get_affected_devices")
+    returns: Dictionary of {device UUID: {device details, "advisories": [...], "counts": {...}, "maxCvss": ...}}
+    """
+    index = {}
+    for advisory in adv_list:
+        sir = (advisory.get('sir') or '').lower()
+        try:
+            cvss = float(advisory['cvssBaseScore']) if advisory.get('cvssBaseScore') is not None else None
+        except (TypeError, ValueError):
+            cvss = None
+        band = cvss_band(cvss)
+        for device in advisory.get('affectedDevices') or []:
+            entry = index.get(device['id'])
+            if entry is None:
+                entry = {field: device.get(field) for field in DEVICE_FIELDS}
+                entry['advisories'] = []
+                entry['counts'] = {f'sir_{level}': 0 for level in SIR_LEVELS}
+                entry['counts'].update({f'cvss_{b}': 0 for b, _ in CVSS_BANDS})
+                entry['maxCvss'] = None
+                index[device['id']] = entry
+            entry['advisories'].append({'advisoryId': advisory['advisoryId'], 'sir': advisory.get('sir'),
+                                        'cvss': cvss})
+            if sir in SIR_LEVELS:
+                entry['counts'][f'sir_{sir}'] += 1
+            if band:
+                entry['counts'][f'cvss_{band}'] += 1
+            if cvss is not None and (entry['maxCvss'] is None or cvss > entry['maxCvss']):
+                entry['maxCvss'] = cvss
+    logging.info(f'Built exposure index for {len(index)} devices.')
+    return index
+
+
+def save_index(index, filename=DEFAULT_INDEX_FILE):
+    """
+    Persist the exposure index to a SQLite database, replacing any previous index. The "devices" table holds one
+    row per device with its counts, and the "exposures" table holds one row per device/advisory pair.
+
+    params: index (from "build_index"), filename
+    """
+    if os.path.exists(filename):
+        os.remove(filename)
+    count_columns = [f'sir_{level}' for level in SIR_LEVELS] + [f'cvss_{b}' for b, _ in CVSS_BANDS]
+    db = sqlite3.connect(filename)
+    db.execute(f'CREATE TABLE devices (id TEXT PRIMARY KEY, hostname TEXT, managementIpAddress TEXT, '
+               f'serialNumber TEXT, location TEXT, advisory_count INTEGER, '
+               f'{", ".join(c + " INTEGER" for c in count_columns)}, max_cvss REAL)')
+    db.execute('CREATE TABLE exposures (device_id TEXT, advisory_id TEXT, sir TEXT, cvss REAL)')
+    placeholders = ', '.join('?' * (len(DEVICE_FIELDS) + len(count_columns) + 2))
+    db.executemany(f'INSERT INTO devices VALUES ({placeholders})',
+                   ([entry[f] for f in DEVICE_FIELDS] + [len(entry['advisories'])]
+                    + [entry['counts'][c] for c in count_columns] + [entry['maxCvss']] for entry in index.values()))
+    db.executemany('INSERT INTO exposures VALUES (?, ?, ?, ?)',
+                   ((device_id, a['advisoryId'], a['sir'], a['cvss'])
+                    for device_id, entry in index.items() for a in entry['advisories']))
+    db.execute('CREATE INDEX devices_location ON devices (location, advisory_count)')
+    db.execute('CREATE INDEX exposures_advisory ON exposures (advisory_id)')
+    db.commit()
+    db.close()
+    logging.info(f'Exposure index saved to "{filename}".')
+
+
+def top_exposed(filename=DEFAULT_INDEX_FILE, site=None, limit=100, order_by='advisory_count'):
+    """
+    Query the persisted index for the most exposed devices.
+
+    params: filename, site (optional location prefix, e.g. "Global/US/NYC"), limit,
+            order_by ("advisory_count", "max_cvss" or one of the "sir_*"/"cvss_*" count columns)
+    returns: List of device dictionaries, most exposed first
+    """
+    allowed = ['advisory_count', 'max_cvss'] + [f'sir_{level}' for level in SIR_LEVELS] + \
+              [f'cvss_{b}' for b, _ in CVSS_BANDS]
+    if order_by not in allowed:
+        raise ValueError(f'Cannot order by "{order_by}". Options are: {", ".join(allowed)}')
+    db = sqlite3.connect(filename)
+    db.row_factory = sqlite3.Row
+    query = 'SELECT * FROM devices'
+    params = []
+    if site:
+        query += ' WHERE location = ? OR location LIKE ?'
+        params = [site, site.rstrip('/') + '/%']
+    query += f' ORDER BY {order_by} DESC, advisory_count DESC LIMIT ?'
+    params.append(limit)
+    result = [dict(row) for row in db.execute(query, params)]
+    db.close()
+    return result
+
+
+if __name__ == '__main__':
+    # Parse incoming arguments
+    parser = argparse.ArgumentParser(description='Query the device exposure index written by "main.py -r full '
+                                                 '--index".')
+    parser.add_argument('index_file', nargs='?', default=DEFAULT_INDEX_FILE, help='Exposure index database file.')
+    parser.add_argument('-s', '--site', type=str, help='Only include devices at this site or below it.')
+    parser.add_argument('-t', '--top', type=int, default=100, help='Number of devices to return. Default is 100.')
+    parser.add_argument('--order_by', type=str, default='advisory_count', help='Column to rank devices by, e.g. '
+                        'advisory_count, max_cvss, sir_critical, sir_high.')
+    args = parser.parse_args()
+    print(json.dumps(top_exposed(args.index_file, args.site, args.top, args.order_by), indent=4))
@@ -22,17 +22,16 @@ __copyright__ = "Copyright (c) 2022 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
 import advisory_apis
+import advisory_cache
+import exposure_index
+import report_writers
 import logging
-import urllib3
-from urllib3.exceptions import InsecureRequestWarning
 import sys
 import os
 import argparse
 import json
 import time
-
-# External package from PyPi
-from pandas import read_json
+from multiprocessing.pool import ThreadPool
 
 # Append parent directory to path so we can import from top-level packages
 currentdir = os.path.dirname(os.path.realpath(__file__))
@@ -40,35 +39,47 @@ parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
 # Import top-level common modules from this project
-from utils import auth, logger, get_config
+from utils import auth, logger, get_config, metrics, profiler
 
-# Disable certificate warnings
-urllib3.disable_warnings(InsecureRequestWarning)
 
 # Get current date/time in proper format
 timestamp = time.strftime("%Y-%m-%d_%I-%M-%S%p_%Z", time.localtime())
 
-def get_affected_devices(dnac_token, baseUrl, adv_list):
+def get_affected_devices(dnac_token, baseUrl, adv_list, threads=10, chunk_size=100):
     """
     Function that calls the "advisory_apis.get_devices_per_advisory" function and obtains the devices 
     affected by each Security Advisory. It then calls the "advisory_apis.get_device_details_by_device_id"
     function to obtain the hostname, management IP and serial number of each device.
 
-    params: dnac_token, baseUrl, adv_list (JSON response from Get Advisories List API)
+    The per-advisory lookups run concurrently. Device UUIDs are de-duplicated across all advisories so each
+    device's details are requested only once, in batches of "chunk_size" UUIDs, before being joined back
+    onto each advisory.
+
+    params: dnac_token, baseUrl, adv_list (JSON response from Get Advisories List API), threads, chunk_size
     returns: adv_list (Modified JSON to add affected device details)
     """
-    for advisory in adv_list:
-        affected_devices = advisory_apis.get_devices_per_advisory(dnac_token, baseUrl, advisory['advisoryId'])
-        if affected_devices == None:
+    iterable_list = [(dnac_token, baseUrl, advisory['advisoryId']) for advisory in adv_list]
+    with ThreadPool(threads) as pool:
+        device_lists = pool.map(*metrics.queued(advisory_apis.get_devices_per_advisory, iterable_list, star=True))
+        if any(affected_devices is None for affected_devices in device_lists):
             raise ValueError('"advisory_apis.get_devices_per_advisory" API returned a value of None.')
-        dev_string = ''
-        for item in affected_devices:
-            # Create comma-separated list of device UUIDs for next API call
-            dev_string += f'{item},'
-        # Trim off trailing comma
-        dev_string = dev_string[:-1]
-        # Add device details to new "affectedDevices" key in JSON payload
-        advisory['affectedDevices'] = advisory_apis.get_device_detials_by_device_id(dnac_token, baseUrl, dev_string)
+
+        # Collect each unique device UUID once, preserving the order they were first seen
+        unique_ids = list(dict.fromkeys(uuid for affected_devices in device_lists for uuid in affected_devices))
+        logging.info(f'Resolving details for {len(unique_ids)} unique devices across {len(adv_list)} advisories.')
+        iterable_list = [(dnac_token, baseUrl, ','.join(unique_ids[i:i + chunk_size]))
+                         for i in range(0, len(unique_ids), chunk_size)]
+        details = {}
+        for devices in pool.map(*metrics.queued(advisory_apis.get_device_detials_by_device_id, iterable_list,
+                                                star=True)):
+            if devices is None:
+                raise ValueError('"advisory_apis.get_device_detials_by_device_id" API returned a value of None.')
+            for device in devices:
+                details[device['id']] = device
+
+    # Add device details to new "affectedDevices" key in JSON payload
+    for advisory, affected_devices in zip(adv_list, device_lists):
+        advisory['affectedDevices'] = [details[uuid] for uuid in affected_devices if uuid in details]
     return adv_list
 
 
@@ -78,15 +89,19 @@ def main(args):
     If a full list is requested, the script will identify all affected devices per Security Advisory,
     and obtain details about the device.
 
-    The script can output the resulting information in JSON, CSV or Excel formats.
+    The script can output the resulting information in JSON, CSV, Excel or Parquet formats.
 
     params: args (argparse Namespace)
+    returns: The advisory summary, or the full advisory list with affected devices
     """
     if args.logging_level:
         if args.logging_file:
             logger.logger(args.logging_level, args.logging_file)
         else:
             logger.logger(args.logging_level, None)
+    metrics.report_at_exit(args.metrics_dir, 'security_advisories')
+    if args.profile:
+        profiler.enable(args.profile, 'security_advisories', args.profile_dir)
 
     # Get DNAC environment configuration
     dnac_server, dnac_port, dnac_username, dnac_password = get_config.get_config()
@@ -94,42 +109,73 @@ def main(args):
 
     # Authenticate to DNAC
     logging.info('Authenticating to DNAC.')
-    dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server, port=dnac_port)
+    with profiler.stage('auth'):
+        dnac_token = auth.get_dnac_jwt(username=dnac_username, password=dnac_password, server=dnac_server,
+                                       port=dnac_port)
     logging.debug(f'Setting "dnac_token" to: {dnac_token}')
 
     # Get Security Advisories
-    filename = f'advisory_{args.report.lower()}_{timestamp}'
+    # Prefixed with the cluster name when several clusters are queried at once
+    filename = get_config.cluster_path(f'advisory_{args.report.lower()}_{timestamp}')
+    snapshot_file = get_config.cluster_path(args.snapshot_file)
     if args.report.lower() == 'full':
-        adv_list = advisory_apis.get_advisory_list(dnac_token, baseUrl)
-        result = get_affected_devices(dnac_token, baseUrl, adv_list)
-        if result == None:
+        with profiler.stage('inventory'):
+            adv_list = advisory_apis.get_advisory_list(dnac_token, baseUrl)
+        if adv_list == None:
             raise ValueError('"advisory_apis.get_advisory_list" API returned a value of None.')
+        if args.delta:
+            # Only resolve affected devices for advisories that are new or changed since the last snapshot
+            with profiler.stage('cache'):
+                snapshot = advisory_cache.load_snapshot(snapshot_file)
+                changed, reused = advisory_cache.split_changed(adv_list, snapshot, args.refresh_days)
+            with profiler.stage('fan-out'):
+                get_affected_devices(dnac_token, baseUrl, changed)
+            result = adv_list
+            with profiler.stage('post-process'):
+                delta = advisory_cache.build_delta(result, snapshot)
+                delta_file = get_config.cluster_path(f'advisory_delta_{timestamp}.json')
+                with open(delta_file, 'w') as f:
+                    json.dump(delta, f, indent=4)
+                logging.info(f'Delta report saved to "{delta_file}".')
+                advisory_cache.save_snapshot(snapshot_file, result, snapshot, reused)
+        else:
+            with profiler.stage('fan-out'):
+                result = get_affected_devices(dnac_token, baseUrl, adv_list)
+        if args.index:
+            # Persist a device-centric view of the report for patch planning queries
+            with profiler.stage('index'):
+                exposure_index.save_index(exposure_index.build_index(result), get_config.cluster_path(args.index_file))
     else:
-        result = advisory_apis.get_advisory_summary(dnac_token, baseUrl)
+        with profiler.stage('inventory'):
+            result = advisory_apis.get_advisory_summary(dnac_token, baseUrl)
         if result == None:
             raise ValueError('"advisory_apis.get_advisory_summary" API returned a value of None.')
         
     # Format the output
-    if args.output.lower() == 'json':
-        with open(f'{filename}.json', 'w') as f:
-            f.write(json.dumps(result, indent=4))
-            f.close()
-        logging.info(f'Output saved to "{filename}.json".')
-    elif args.output.lower() == 'csv':
-        data = read_json(json.dumps(result))  # Here is where Pandas package is used
-        data.to_csv(f'{filename}.csv', index=False)
-        logging.info(f'Output saved to "{filename}.csv".')
-    else:
-        data = read_json(json.dumps(result)) # Here is where Pandas package is used
-        data.to_excel(f'{filename}.xlsx', index=False) 
-        logging.info(f'Output saved to "{filename}.xlsx".')
+    with profiler.stage('write'):
+        if args.output.lower() == 'json':
+            report_writers.write_json(result, f'{filename}.json')
+            logging.info(f'Output saved to "{filename}.json".')
+        elif args.output.lower() == 'csv':
+            report_writers.write_csv(result, f'{filename}.csv')
+            logging.info(f'Output saved to "{filename}.csv".')
+        elif args.output.lower() == 'parquet':
+            report_writers.write_parquet(result, f'{filename}.parquet')
+            logging.info(f'Output saved to "{filename}.parquet".')
+        else:
+            report_writers.write_excel(result, f'{filename}.xlsx')
+            logging.info(f'Output saved to "{filename}.xlsx".')
+    return result
 
 
-if __name__ == '__main__':
+def parse_args(argv=None, prog=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # param prog (str): Program name shown in usage messages, e.g. by "dnac.py"
+    # return args (Namespace): Parsed arguments, to be passed to "run"
     # Parse incoming arguments
     parser = argparse.ArgumentParser(description='This script queries the Security Advisory APIs '
                                                 'for information about current vulnerabilities and '
-                                                'any affected devices.')
+                                                'any affected devices.', prog=prog)
     parser.add_argument('-r', '--report', help='Choose the level of report you want.  Options are "full" or "summary".',
                         required=True)
     log_settings = parser.add_argument_group('Log Settings')
@@ -137,7 +183,40 @@ if __name__ == '__main__':
                                                                       'CRITICAL, ERROR, WARNING, INFO, DEBUG, NOTSET',
                                                                       dest='logging_level')
     log_settings.add_argument('-f', '--logging_file', type=str, help='Filename to use for log file.', dest='logging_file')
-    parser.add_argument('-o', '--output', type=str, help='Select output format. Possible values are: json, csv, excel',
+    log_settings.add_argument('--metrics_dir', type=str, help='Directory in which to save API call metrics, as a '
+                              'Prometheus text file and a JSON run summary.')
+    log_settings.add_argument('--profile', nargs='?', const='time', choices=profiler.MODES, help='Time each stage '
+                              '(auth, inventory, fan-out, post-process, write) and save a flame graph of sampled '
+                              'stacks. "cprofile" also runs each stage under cProfile, "tracemalloc" reports the lines '
+                              'allocating the most memory per stage. Default mode is "time".')
+    log_settings.add_argument('--profile_dir', type=str, default='profile', help='Directory for profile output. '
+                              'Default is "profile".')
+    parser.add_argument('-o', '--output', type=str, help='Select output format. Possible values are: json, csv, excel, '
+                                                              'parquet',
                         dest='output', required=True)
-    args = parser.parse_args()
-    main(args)
+    index_settings = parser.add_argument_group('Exposure Index (full report only)')
+    index_settings.add_argument('--index', action='store_true', help='Save a device-centric exposure index, with '
+                                'per-device advisory counts by SIR and CVSS, to a SQLite database.')
+    index_settings.add_argument('--index_file', type=str, default=exposure_index.DEFAULT_INDEX_FILE,
+                                help='Database file for the exposure index. Default is "exposure_index.db".')
+    delta_settings = parser.add_argument_group('Delta Mode (full report only)')
+    delta_settings.add_argument('--delta', action='store_true', help='Reuse affected devices from the previous '
+                                'snapshot for unchanged advisories, and write a report of newly exposed and '
+                                'remediated devices alongside the full report.')
+    delta_settings.add_argument('--snapshot_file', type=str, default=advisory_cache.DEFAULT_SNAPSHOT_FILE,
+                                help='Snapshot file used by delta mode. Default is "advisory_snapshot.json".')
+    delta_settings.add_argument('--refresh_days', type=int, default=7, help='Re-resolve cached advisories older '
+                                'than this many days even if unchanged. Default is 7.')
+    args = parser.parse_args(argv)
+    return args
+
+
+def run(args, show=True):
+    # param args (Namespace): Output of "parse_args"
+    # param show (bool): Unused; this script writes its results to files rather than printing them
+    # return: Result of "main"
+    return main(args)
+
+
+if __name__ == '__main__':
+    run(parse_args())
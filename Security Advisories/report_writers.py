@@ -0,0 +1,149 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import csv
+import json
+import sys
+import os
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import columnar
+
+DEVICE_PREFIX = 'device_'
+
+
+def _cell(value):
+    """
+    Convert a JSON value into a single spreadsheet cell value. Lists of plain values are joined with commas,
+    other nested values are written as JSON text.
+    """
+    if isinstance(value, list):
+        if all(not isinstance(v, (dict, list)) for v in value):
+            return ', '.join('' if v is None else str(v) for v in value)
+        return json.dumps(value)
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+def report_columns(result):
+    """
+    Determine the column headings for a report.
+
+    params: result (full report list of advisories, or summary report dictionary)
+    returns: List of column names
+    """
+    columns = {}
+    if isinstance(result, dict):
+        columns['key'] = None
+        for value in result.values():
+            if isinstance(value, dict):
+                columns.update(dict.fromkeys(value))
+            else:
+                columns['value'] = None
+        return list(columns)
+    device_columns = {}
+    for advisory in result:
+        for key in advisory:
+            if key != 'affectedDevices':
+                columns[key] = None
+        for device in advisory.get('affectedDevices') or []:
+            device_columns.update(dict.fromkeys(DEVICE_PREFIX + k for k in device))
+    return list(columns) + list(device_columns)
+
+
+def iter_report_rows(result):
+    """
+    Flatten a report into rows. A full report produces one row per advisory and affected device, repeating the
+    advisory fields and adding "device_" prefixed columns; advisories without affected devices produce one row.
+    A summary report produces one row per key.
+
+    params: result (full report list of advisories, or summary report dictionary)
+    returns: Generator of row dictionaries
+    """
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if isinstance(value, dict):
+                row = {k: _cell(v) for k, v in value.items()}
+            else:
+                row = {'value': _cell(value)}
+            row['key'] = key
+            yield row
+        return
+    for advisory in result:
+        row = {k: _cell(v) for k, v in advisory.items() if k != 'affectedDevices'}
+        devices = advisory.get('affectedDevices') or []
+        if not devices:
+            yield row
+        for device in devices:
+            device_row = dict(row)
+            device_row.update((DEVICE_PREFIX + k, _cell(v)) for k, v in device.items())
+            yield device_row
+
+
+def write_json(result, filename):
+    """
+    Write the report as indented JSON, encoding it directly to the file.
+    """
+    with open(filename, 'w') as f:
+        json.dump(result, f, indent=4)
+
+
+def write_csv(result, filename):
+    """
+    Write the report as CSV, one flattened row at a time.
+    """
+    columns = report_columns(result)
+    with open(filename, 'w', encoding='UTF8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for row in iter_report_rows(result):
+            writer.writerow(row)
+
+
+def write_excel(result, filename):
+    """
+    Write the report as an Excel workbook using openpyxl's write-only mode, which streams rows to the file
+    instead of holding every cell in memory.
+    """
+    from openpyxl import Workbook  # External package from PyPi, only needed for Excel output
+
+    columns = report_columns(result)
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Security Advisories')
+    sheet.append(columns)
+    for row in iter_report_rows(result):
+        sheet.append([row.get(column) for column in columns])
+    workbook.save(filename)
+
+
+def write_parquet(result, filename):
+    """
+    Write the report as a compressed Parquet file with typed columns, one row per advisory and affected device
+    (the same rows as the CSV report), for loading into dataframes without re-parsing text.
+    """
+    columnar.write_parquet(iter_report_rows(result), filename, columns=report_columns(result))
@@ -0,0 +1,200 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import time
+
+STARTED = time.perf_counter()
+
+import argparse
+import copy
+import importlib.util
+import json
+import os
+import sys
+from datetime import datetime as dt
+
+from utils import auth, clusters, http_cache, http_client, metrics
+
+# Subcommand: (use case folder, description). Each folder's "main.py" provides "parse_args" and "run".
+COMMANDS = {
+    'compliance': ('Compliance', 'Compliance status and details of devices.'),
+    'archive': ('Configuration Archive', 'Full (encrypted ZIP) or sanitized device configurations.'),
+    'commands': ('Command Runner', 'Run read-only CLI commands on devices.'),
+    'advisories': ('Security Advisories', 'Security advisories and the devices they affect.'),
+    'events': ('Device Events', 'Assurance events, including Syslog messages, of devices.'),
+    'serve': ('Daemon', 'Serve the workflows over a local HTTP/JSON API with warm caches.')
+}
+# Argument separating chained subcommands, e.g. "compliance + advisories -r summary -o json"
+CHAIN_SEPARATOR = '+'
+# Seconds allowed from the start of "dnac.py" until every chained subcommand is imported and its arguments parsed
+STARTUP_BUDGET = 0.25
+
+basedir = os.path.dirname(os.path.realpath(__file__))
+
+
+def load(command):
+    # param command (str): One of COMMANDS
+    # return module: The use case's "main.py". Its folder is added to "sys.path" so it finds its own modules; only
+    # the use cases named on the command line are imported.
+
+    module_name = f'dnac_{command}'
+    if module_name not in sys.modules:
+        folder = os.path.join(basedir, COMMANDS[command][0])
+        sys.path.insert(0, folder)
+        spec = importlib.util.spec_from_file_location(module_name, os.path.join(folder, 'main.py'))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return sys.modules[module_name]
+
+
+def split_chain(arguments):
+    # param arguments (list): Command line arguments following the first subcommand name
+    # return chain (list): One list per chained subcommand, each starting with the subcommand name
+    chain = [[]]
+    for argument in arguments:
+        if argument == CHAIN_SEPARATOR:
+            chain.append([])
+        else:
+            chain[-1].append(argument)
+    return chain
+
+
+def build_parser():
+    commands = '\n'.join(f'  {name:<12}{description}' for name, (_, description) in COMMANDS.items())
+    parser = argparse.ArgumentParser(prog='dnac', formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     description='Run one or more Catalyst Center use cases in a single process. '
+                                                 f'Chained subcommands are separated by "{CHAIN_SEPARATOR}" and '
+                                                 'share one login and one pooled connection per cluster.',
+                                     epilog=f'subcommands:\n{commands}\n\n'
+                                            'Use "dnac <subcommand> -h" for the options of each subcommand.\n'
+                                            f'Example: dnac compliance --family "Switches and Hubs" {CHAIN_SEPARATOR} '
+                                            f'advisories -r summary -o json {CHAIN_SEPARATOR} archive sanitized '
+                                            '--csv_file devices.csv')
+    parser.add_argument('--timing', action='store_true', help='Print the time taken to import and parse each '
+                                                              'subcommand to stderr.')
+    parser.add_argument('--startup_budget', type=float, default=STARTUP_BUDGET, help='Warn on stderr when startup '
+                        f'takes longer than this many seconds. Default is {STARTUP_BUDGET}.')
+    parser.add_argument('--clusters', type=str, help='Comma separated config.ini sections to run the subcommands '
+                        'against concurrently, or "all" for every section defining a server. The results of each '
+                        'subcommand are merged, tagged by cluster, into one JSON file.')
+    parser.add_argument('--http_cache', choices=http_cache.MODES, help='Record DNAC API responses to a local cache '
+                        'and answer from it: "auto" reuses fresh responses and records the rest, "record" refreshes '
+                        'every response, "replay" answers only from the cache without any network access. Overrides '
+                        f'the {http_cache.MODE_VARIABLE} environment variable.')
+    parser.add_argument('--http_cache_file', type=str, default=os.environ.get(http_cache.FILE_VARIABLE) or
+                        http_cache.DEFAULT_CACHE_FILE, help=f'HTTP cache file. Default is '
+                        f'"{http_cache.DEFAULT_CACHE_FILE}".')
+    parser.add_argument('--http_cache_ttl', type=float, default=os.environ.get(http_cache.TTL_VARIABLE) or
+                        http_cache.DEFAULT_TTL, help='Seconds a cached response is reused in auto mode; 0 for no '
+                        f'limit. Default is {http_cache.DEFAULT_TTL}.')
+    parser.add_argument('command', choices=COMMANDS, metavar='subcommand', help='Subcommand to run, see below.')
+    parser.add_argument('arguments', nargs=argparse.REMAINDER, help='Arguments of the subcommand, optionally '
+                        f'followed by "{CHAIN_SEPARATOR}" and further subcommands.')
+    return parser
+
+
+def main(argv=None):
+    # param argv (list): Command line arguments, default is "sys.argv[1:]"
+    # return results (list): Result of each chained subcommand
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    chain = split_chain([args.command] + args.arguments)
+    for segment in chain:
+        if not segment or segment[0] not in COMMANDS:
+            parser.error(f'expected one of {", ".join(COMMANDS)} after "{CHAIN_SEPARATOR}"')
+
+    selected = None
+    if args.clusters:
+        try:
+            selected = clusters.resolve(args.clusters)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # Import every subcommand and parse all arguments before anything runs, so a mistake in the last subcommand
+    # does not surface after the first one has finished
+    steps = []
+    timings = []
+    for command, *arguments in chain:
+        start = time.perf_counter()
+        module = load(command)
+        loaded = time.perf_counter()
+        steps.append((module, module.parse_args(arguments, prog=f'dnac {command}')))
+        timings.append((command, loaded - start, time.perf_counter() - loaded))
+    startup = time.perf_counter() - STARTED
+
+    if args.timing:
+        for command, imported, parsed in timings:
+            print(f'{command:<12} import {imported:.3f}s  parse {parsed:.3f}s', file=sys.stderr)
+        print(f'{"startup":<12} {startup:.3f}s', file=sys.stderr)
+    if startup > args.startup_budget:
+        print(f'Startup took {startup:.3f}s, over the {args.startup_budget}s budget. Run with "python -X importtime" '
+              f'to find slow imports.', file=sys.stderr)
+
+    if args.http_cache:
+        cache = None
+        if args.http_cache != 'off':
+            cache = http_cache.HttpCache(args.http_cache_file, args.http_cache, args.http_cache_ttl)
+        http_client.use_cache(cache)
+
+    # One token per cluster for the whole chain, and one combined metrics table at exit
+    auth.share_tokens()
+    if len(steps) > 1 or args.clusters:
+        metrics.report_at_exit(None, 'dnac')
+    if not args.clusters:
+        return [module.run(arguments) for module, arguments in steps]
+    return run_clusters(steps, selected, [command for command, *_ in chain])
+
+
+def run_clusters(steps, selected, commands):
+    # param steps (list): (module, parsed arguments) of each chained subcommand
+    # param selected (list): config.ini sections of the clusters
+    # param commands (list): Subcommand names, used for the output file names
+    # return results (list): Merged, cluster tagged result of each subcommand. Each cluster runs the whole chain in
+    # its own thread.
+
+    def run_chain():
+        # Each cluster gets its own copy of the arguments, as the scripts may modify them
+        return [module.run(copy.deepcopy(arguments), show=False) for module, arguments in steps]
+
+    results, errors = clusters.run(run_chain, selected)
+    timestamp = dt.now().strftime('%Y-%m-%dT%H-%M-%S')
+    merged = []
+    for i, command in enumerate(commands):
+        merged.append(clusters.merge({cluster: chain[i] for cluster, chain in results.items()}))
+        if merged[-1]:
+            filename = f'{command}_clusters_{timestamp}.json'
+            with open(filename, 'w') as f:
+                json.dump(merged[-1], f, indent=4)
+            print(f'Merged {command} results of {len(results)} cluster(s) saved as {filename}')
+    for cluster, error in errors.items():
+        print(f'Cluster [{cluster}] failed: {error!r}', file=sys.stderr)
+    if errors:
+        sys.exit(1)
+    return merged
+
+
+if __name__ == '__main__':
+    main()
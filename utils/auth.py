@@ -21,13 +21,44 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
-import requests
-import urllib3
+import logging
+import threading
+import time
+import sys
+import os
 from configparser import ConfigParser
-from urllib3.exceptions import InsecureRequestWarning
-from requests.auth import HTTPBasicAuth
 
-urllib3.disable_warnings(InsecureRequestWarning)  # Disable insecure https warnings
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client
+
+# DNAC tokens are valid for 60 minutes; renew a few minutes early to avoid using an expired token
+TOKEN_LIFETIME = 55 * 60
+
+# Tokens reused by every "get_dnac_jwt" call in this process, keyed by cluster and username; None unless enabled
+# with "share_tokens"
+_shared_tokens = None
+_shared_lock = threading.Lock()
+# One lock per (server, port, username), held while logging in so concurrent callers wait for a single login
+_login_locks = {}
+
+
+def share_tokens(enabled=True):
+    # Reuse one token per cluster and user for the rest of the process instead of logging in again on every call,
+    # e.g. when several workflows are chained in one "dnac.py" invocation
+    global _shared_tokens
+    with _shared_lock:
+        _shared_tokens = {} if enabled else None
+
+
+def forget_token(server, port, username):
+    # Drop a shared token so the next "get_dnac_jwt" call for the cluster logs in again
+    with _shared_lock:
+        if _shared_tokens is not None:
+            _shared_tokens.pop((server, str(port), username), None)
 
 
 def get_dnac_jwt(**kwargs):
@@ -35,16 +66,72 @@ def get_dnac_jwt(**kwargs):
     password = kwargs.get('password', None)
     server = kwargs.get('server', None)
     port = kwargs.get('port', None)
-    dnac_auth = HTTPBasicAuth(username, password)
+    tokens = _shared_tokens
+    if tokens is None:
+        return _request_token(server, port, username, password)
+    key = (server, str(port), username)
+    with _shared_lock:
+        login_lock = _login_locks.setdefault(key, threading.Lock())
+    # Only callers for the same cluster and user wait for each other's login; other clusters log in concurrently
+    with login_lock:
+        token, issued = tokens.get(key, (None, 0))
+        if token is None or time.monotonic() - issued >= TOKEN_LIFETIME:
+            token = _request_token(server, port, username, password)
+            tokens[key] = (token, time.monotonic())
+        else:
+            logging.debug(f'Reusing shared token for {server}.')
+        return token
+
+
+def _request_token(server, port, username, password):
+    # Imported on first login so scripts start quickly. Import the package rather than "requests.auth" directly:
+    # clusters log in concurrently, and a submodule import racing the package import sees it half initialized.
+    import requests
+    dnac_auth = requests.auth.HTTPBasicAuth(username, password)
     url = f'https://{server}:{port}/dna/system/api/v1/auth/token'
     header = {
         'content-type': 'application/json'
     }
-    response = requests.post(url, auth=dnac_auth, headers=header, verify=False)
+    response = http_client.post(url, auth=dnac_auth, headers=header, verify=False)
     dnac_jwt_token = response.json()['Token']
     return dnac_jwt_token
 
 
+class TokenManager:
+    # Holds a DNAC token for long-running processes and renews it before it expires, so that repeated workflows
+    # reuse one token instead of re-authenticating every time.
+
+    def __init__(self, server, port, username, password, lifetime=TOKEN_LIFETIME):
+        self.server = server
+        self.port = port
+        self.username = username
+        self.password = password
+        self.lifetime = lifetime
+        self.token = None
+        self.issued = 0
+        self.lock = threading.Lock()
+
+    def get_token(self):
+        # return: String containing a valid DNAC token, requesting a new one if needed
+        with self.lock:
+            if _shared_tokens is not None:
+                # Shared tokens are renewed by "get_dnac_jwt" itself
+                self.token = get_dnac_jwt(username=self.username, password=self.password, server=self.server,
+                                          port=self.port)
+            elif self.token is None or time.monotonic() - self.issued >= self.lifetime:
+                logging.info('Authenticating to DNAC.')
+                self.token = get_dnac_jwt(username=self.username, password=self.password, server=self.server,
+                                          port=self.port)
+                self.issued = time.monotonic()
+            return self.token
+
+    def invalidate(self):
+        # Force a new token on the next call to "get_token", e.g. after a 401 response
+        with self.lock:
+            self.token = None
+        forget_token(self.server, self.port, self.username)
+
+
 if __name__ == '__main__':
     # Parse "config.ini" file to get DNA Center configuration and credentials
     config = ConfigParser()
@@ -0,0 +1,118 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import logging
+import sys
+import os
+from multiprocessing.pool import ThreadPool
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import get_config, http_client
+
+# Key added to every result item to identify the cluster it came from
+CLUSTER_FIELD = 'cluster'
+
+
+def resolve(selector):
+    # param selector (str): Comma separated config.ini section names, or "all" for every section defining a cluster
+    # return clusters (list): Section names, in the order given
+    known = get_config.list_clusters()
+    if selector.strip().lower() == 'all':
+        if not known:
+            raise ValueError('No clusters are defined in "config.ini"; a cluster section must set "server".')
+        return known
+    clusters = list(dict.fromkeys(name.strip() for name in selector.split(',') if name.strip()))
+    if not clusters:
+        raise ValueError('No cluster names were given.')
+    unknown = [name for name in clusters if name not in known]
+    if unknown:
+        raise ValueError(f'Cluster(s) {", ".join(unknown)} not found in "config.ini". Defined clusters are: '
+                         f'{", ".join(known)}')
+    return clusters
+
+
+def tag(result, cluster):
+    # param result: Workflow result; dicts (also inside lists) get a "cluster" key, other values are wrapped in one
+    # return: Copy of the result with every dict tagged with the cluster name
+    if isinstance(result, dict):
+        return {CLUSTER_FIELD: cluster, **result}
+    if isinstance(result, list):
+        return [tag(item, cluster) for item in result]
+    return {CLUSTER_FIELD: cluster, 'value': result}
+
+
+def merge(results):
+    # param results (dict): Result of each cluster
+    # return merged (list): Tagged items of every cluster; list results are concatenated, other results become one
+    # item. Clusters without a result are left out.
+    merged = []
+    for cluster, result in results.items():
+        if result is None:
+            continue
+        if isinstance(result, list):
+            merged.extend(tag(result, cluster))
+        else:
+            merged.append(tag(result, cluster))
+    return merged
+
+
+def _apply_rate(cluster):
+    # A cluster section may set "rate", the maximum number of API requests per second sent to that cluster
+    config = get_config.read_config()
+    if config.has_option(cluster, 'rate'):
+        server, port, _, _ = get_config.get_config()
+        http_client.set_rate_limit(f'https://{server}:{port}', config.getfloat(cluster, 'rate'))
+
+
+def run(function, clusters):
+    # param function: Called once per cluster without arguments, in a thread where "get_config.get_config" returns
+    # that cluster's details. Each cluster thus gets its own pooled client, rate limiter and token.
+    # param clusters (list): config.ini section names
+    # return results, errors (dict, dict): Return value of each cluster that succeeded, and the exception of each
+    # that failed. All clusters run concurrently, so the total time is that of the slowest cluster.
+
+    def run_cluster(cluster):
+        get_config.use_cluster(cluster)
+        try:
+            _apply_rate(cluster)
+            return cluster, function(), None
+        except (Exception, SystemExit) as e:
+            logging.exception(f'Workflow failed for cluster [{cluster}].')
+            return cluster, None, e
+        finally:
+            get_config.use_cluster(None)
+
+    results, errors = {}, {}
+    with ThreadPool(len(clusters)) as pool:
+        for cluster, result, error in pool.imap_unordered(run_cluster, clusters):
+            if error is None:
+                results[cluster] = result
+            else:
+                errors[cluster] = error
+    # Keep the order the clusters were given in
+    return {cluster: results[cluster] for cluster in clusters if cluster in results}, errors
@@ -0,0 +1,291 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import logging
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+# Number of rows buffered and written as one Parquet row group
+ROW_GROUP_SIZE = 50000
+COMPRESSION = 'zstd'
+# Number of partition files a PartitionedWriter keeps open at once
+MAX_OPEN_PARTITIONS = 16
+
+
+def load_pyarrow():
+    # pyarrow is an external package from PyPi, only needed for Parquet output
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError('Parquet output requires the "pyarrow" package. Install it with: pip install pyarrow')
+    return pyarrow, pyarrow.parquet
+
+
+def _value(value):
+    # Nested values are stored as JSON text so every column has a flat type
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def _infer_types(rows):
+    # param rows (list): Dicts to derive column types from
+    # return types (OrderedDict): Column name to pyarrow type, in order of first appearance. Columns holding only
+    # nulls keep the null type, so a later row group can still decide their type.
+
+    pa, _ = load_pyarrow()
+    columns = OrderedDict()
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, [])
+    for row in rows:
+        for key, values in columns.items():
+            values.append(_value(row.get(key)))
+    types = OrderedDict()
+    for key, values in columns.items():
+        try:
+            types[key] = pa.array(values).type
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            types[key] = pa.string()
+    return types
+
+
+def merge_type(first, second):
+    # return (pyarrow.DataType): Type able to hold values of both types. Integers and floats widen to float, any
+    # other mix falls back to string.
+
+    pa, _ = load_pyarrow()
+    if first == second or pa.types.is_null(second):
+        return first
+    if pa.types.is_null(first):
+        return second
+    numeric = lambda t: pa.types.is_integer(t) or pa.types.is_floating(t)
+    if numeric(first) and numeric(second):
+        return pa.float64() if pa.types.is_floating(first) or pa.types.is_floating(second) else pa.int64()
+    return pa.string()
+
+
+def _schema(types, columns=None):
+    # Columns named in "columns" come first, then the others in order of first appearance. Null columns are strings.
+    pa, _ = load_pyarrow()
+    names = list(OrderedDict.fromkeys(list(columns or []) + list(types)))
+    return pa.schema([pa.field(key, pa.string() if pa.types.is_null(types.get(key, pa.null())) else types[key])
+                      for key in names])
+
+
+def infer_schema(rows, columns=None):
+    # param rows (list): Dicts to derive column types (and names, unless "columns" is given) from. Columns are
+    # ordered by first appearance.
+    # param columns (list): Column names, when known in advance
+    # return schema (pyarrow.Schema): Columns whose values are empty or of mixed types are stored as strings.
+
+    types = _infer_types(rows)
+    if columns:
+        types = OrderedDict((key, types.get(key, load_pyarrow()[0].null())) for key in columns)
+    return _schema(types)
+
+
+def to_table(rows, schema):
+    # param rows (list): Dicts to convert. Missing keys become null; a key missing from the schema raises
+    # ValueError rather than being dropped silently.
+    # param schema (pyarrow.Schema): Target schema
+    # return table (pyarrow.Table)
+
+    pa, _ = load_pyarrow()
+    names = set(schema.names)
+    unknown = {key for row in rows for key in row if key not in names}
+    if unknown:
+        raise ValueError(f'Columns {sorted(unknown)} are not in the Parquet schema')
+    arrays = []
+    for field in schema:
+        values = [_value(row.get(field.name)) for row in rows]
+        if pa.types.is_string(field.type):
+            values = [v if v is None or isinstance(v, str) else str(v) for v in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+class ParquetWriter:
+    # Streams dict rows to a Parquet file, one compressed row group of "row_group_size" rows at a time. A Parquet
+    # file has a single schema, so when none is given the rows are spilled to a temporary file, one row group at a
+    # time, while the column names and types of every group are merged. The file is written on "close" with a schema
+    # covering all rows: a column of ints and floats becomes float, other mixed columns become strings, and keys first
+    # seen in a later group still get a column. "columns" sets the order of the leading columns. Memory use is
+    # bounded by the row group size either way.
+
+    def __init__(self, filename, schema=None, row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION, columns=None):
+        load_pyarrow()
+        self.filename = filename
+        self.schema = schema
+        self.columns = columns
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.buffer = []
+        self.writer = None
+        self.types = None if schema is not None else OrderedDict()
+        self.spill = None
+        self.count = 0
+
+    def write(self, row):
+        self.buffer.append(row)
+        self.count += 1
+        if len(self.buffer) >= self.row_group_size:
+            self.flush()
+
+    def write_all(self, rows):
+        # param rows (iterable): Dict rows to write
+        # return (int): Number of rows written so far
+        for row in rows:
+            self.write(row)
+        return self.count
+
+    def _write_table(self, rows):
+        _, pq = load_pyarrow()
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.filename, self.schema, compression=self.compression)
+        self.writer.write_table(to_table(rows, self.schema))
+
+    def flush(self):
+        if not self.buffer:
+            return
+        if self.types is None:
+            self._write_table(self.buffer)
+        else:
+            for key, data_type in _infer_types(self.buffer).items():
+                self.types[key] = merge_type(self.types[key], data_type) if key in self.types else data_type
+            if self.spill is None:
+                self.spill = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.filename)))
+            pickle.dump(self.buffer, self.spill, protocol=pickle.HIGHEST_PROTOCOL)
+        self.buffer = []
+
+    def close(self):
+        if self.types is not None:
+            if self.spill is None:
+                # Everything fits in one row group, no need to spill
+                self.types = _infer_types(self.buffer)
+                self.spill, groups = None, [self.buffer]
+            else:
+                self.flush()
+                self.spill.seek(0)
+                groups = _read_groups(self.spill)
+            self.schema = _schema(self.types, self.columns)
+            self.types = None
+            try:
+                for rows in groups:
+                    self._write_table(rows)
+            finally:
+                if self.spill:
+                    self.spill.close()
+            self.buffer = []
+        else:
+            self.flush()
+        if self.writer is None:
+            self._write_table([])
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_groups(spill):
+    # return: Generator of the row groups pickled into a spill file by ParquetWriter
+    while True:
+        try:
+            yield pickle.load(spill)
+        except EOFError:
+            return
+
+
+def write_parquet(rows, filename, schema=None, row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION, columns=None):
+    # param rows (iterable): Dict rows to write
+    # param filename (str): Parquet file name
+    # param schema (pyarrow.Schema), columns (list): Optional schema, or column names to infer types for
+    # return count (int): Number of rows written
+
+    with ParquetWriter(filename, schema, row_group_size, compression, columns) as writer:
+        return writer.write_all(rows)
+
+
+class PartitionedWriter:
+    # Writes rows to a Hive style partitioned Parquet dataset, "base_dir/key=value/.../part-N.parquet", so query
+    # engines can skip whole directories. "partition_by" maps a row to a list of (key, value) pairs. Up to
+    # "max_open" partition files stay open; a partition written to again after being closed gets a new part file.
+
+    def __init__(self, base_dir, partition_by, schema=None, row_group_size=ROW_GROUP_SIZE, compression=COMPRESSION,
+                 max_open=MAX_OPEN_PARTITIONS):
+        load_pyarrow()
+        self.base_dir = base_dir
+        self.partition_by = partition_by
+        self.schema = schema
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.max_open = max_open
+        self.writers = OrderedDict()
+        self.parts = {}
+        self.count = 0
+
+    def _path(self, partition):
+        directory = os.path.join(self.base_dir, *(f'{key}={str(value).replace(os.sep, "_")}'
+                                                  for key, value in partition))
+        os.makedirs(directory, exist_ok=True)
+        part = self.parts.get(partition, 0)
+        self.parts[partition] = part + 1
+        return os.path.join(directory, f'part-{part}.parquet')
+
+    def write(self, row):
+        partition = tuple(self.partition_by(row))
+        writer = self.writers.get(partition)
+        if writer is None:
+            if len(self.writers) >= self.max_open:
+                _, oldest = self.writers.popitem(last=False)
+                oldest.close()
+            writer = self.writers[partition] = ParquetWriter(self._path(partition), self.schema,
+                                                             self.row_group_size, self.compression)
+            logging.debug(f'Opened Parquet partition file {writer.filename}')
+        else:
+            self.writers.move_to_end(partition)
+        writer.write(row)
+        self.count += 1
+
+    def write_all(self, rows):
+        for row in rows:
+            self.write(row)
+        return self.count
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -24,34 +24,108 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 import csv
 import json
 import argparse
+import sys
+import os
+from itertools import islice
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import json_stream
+
+# Column holding, as JSON, any keys first seen after the CSV header was written (only used with a bounded sample)
+EXTRA_FIELD = 'extra'
+# Column holding array items that are not objects, e.g. a list of hostnames
+VALUE_FIELD = 'value'
+# Joins the keys of nested objects when flattening is turned on with "--flatten"
+DEFAULT_SEPARATOR = '.'
+DEFAULT_OUTPUT_FILE = 'devices.csv'
+
+
+def flatten(item, separator='.', max_depth=None, prefix='', depth=0):
+    # param item (dict): Record from the input file
+    # param separator (str): Joins the keys of nested objects and the indexes of list items, e.g. "role.source" or
+    # "tags.0". If None, nested values are not flattened and are written as JSON text instead.
+    # param max_depth (int): Nesting levels to flatten; deeper values are written as JSON text. None for no limit.
+    # return row (dict): New flat dict of column name to scalar value
+
+    row = {}
+    for key, value in (enumerate(item) if isinstance(item, list) else item.items()):
+        column = f'{prefix}{separator}{key}' if prefix else str(key)
+        if isinstance(value, (dict, list)) and value and separator is not None and \
+                (max_depth is None or depth < max_depth):
+            row.update(flatten(value, separator, max_depth, column, depth + 1))
+        elif isinstance(value, (dict, list)):
+            row[column] = json.dumps(value)
+        else:
+            row[column] = value
+    return row
+
+
+def iter_rows(input_file, separator=None, max_depth=None):
+    # param input_file (str): JSON text file containing a top-level array of objects
+    # return: Generator of flattened rows, decoding one array item at a time. Items that are not objects are written
+    # to the VALUE_FIELD column.
+    with open(input_file) as f:
+        for item in json_stream.iter_json_array(f):
+            if not isinstance(item, dict):
+                item = {VALUE_FIELD: item}
+            yield flatten(item, separator, max_depth)
+
+
+def discover_fields(rows):
+    # param rows (iterable): Flattened rows
+    # return fields (list): Union of the keys of every row, in order of first appearance
+    fields = {}
+    for row in rows:
+        fields.update(dict.fromkeys(row))
+    return list(fields)
+
+
+def write_csv(input_file, output_file, separator=None, max_depth=None, sample=0):
+    # param input_file (str): JSON text file containing a top-level array of objects
+    # param output_file (str): CSV file to create
+    # param separator, max_depth: Flattening options, see "flatten". By default nested values are written as JSON text
+    # in one column per top-level key, as before flattening was added.
+    # param sample (int): Number of records scanned to discover the CSV columns. With 0 the whole input file is read
+    # twice, once to find every key so each gets its own column and once to write the rows; otherwise only "sample" records are buffered and keys first seen
+    # after them are written to the EXTRA_FIELD column as JSON. Either way memory use does not grow with the number
+    # of records.
+    # return count (int): Number of rows written
+
+    if sample:
+        rows = iter_rows(input_file, separator, max_depth)
+        buffered = list(islice(rows, sample))
+        fields = discover_fields(buffered)
+        rows = (row for part in (buffered, rows) for row in part)
+    else:
+        fields = discover_fields(iter_rows(input_file, separator, max_depth))
+        rows = iter_rows(input_file, separator, max_depth)
+    known = set(fields)
+    count = 0
+
+    with open(output_file, 'w', encoding='UTF8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields + [EXTRA_FIELD] if sample else fields)
+        writer.writeheader()
+        for row in rows:
+            extra = {key: row.pop(key) for key in [key for key in row if key not in known]}
+            if extra:
+                row[EXTRA_FIELD] = json.dumps(extra)
+            writer.writerow(row)
+            count += 1
+    return count
 
 
 def main(args):
     # params args: Dictionary of parsed command line arguments
     # return Null
 
-    input_file = open(args['input_file'])
-    device_list = json.load(input_file)
-    headings = []
-
-    # Iterate through first dictionary item and append keys to "headings" list.
-    for i in device_list:
-        for key in i.keys():
-            headings.append(key)
-        break
-
-    # Create a CSV file using "output_file" filename and open it for writing
-    with open(args['output_file'], 'w', encoding='UTF8', newline='') as f:
-        # Generate a list of column headers from dictionary keys in the input file
-
-        # Write column headers to the file
-        writer = csv.DictWriter(f, fieldnames=headings)
-        writer.writeheader()
-
-        # Iterate through each dictionary contained in "device_list" and write values into each row.
-        for i in device_list:
-            writer.writerow(i)
-
+    separator = args.get('separator') or DEFAULT_SEPARATOR if args.get('flatten') else None
+    output_file = args.get('output_file') or DEFAULT_OUTPUT_FILE
+    count = write_csv(args['input_file'], output_file, separator, args.get('max_depth'), args.get('sample') or 0)
+    print(f'{count} records written to {output_file}')
     return
 
 
@@ -65,7 +139,19 @@ if __name__ == '__main__':
     parser.add_argument('--input_file', type=str, help='JSON formatted text file containing output from the "response" '
                         'key of the "/dna/intent/api/v1/network-device" API endpoint.')
     parser.add_argument('--output_file', type=str, help='Filename to use for CSV file that is created. Defaults to '
-                        '"devices.csv".', default='devices.csv')
+                        f'"{DEFAULT_OUTPUT_FILE}".', default=DEFAULT_OUTPUT_FILE)
+    parser.add_argument('--flatten', action='store_true', help='Flatten nested objects and lists into one column per '
+                        'value, named by joining the keys and list indexes with SEPARATOR (e.g. "role.source"). By '
+                        'default each nested value is written as JSON text in a single column.')
+    parser.add_argument('--separator', type=str, default=DEFAULT_SEPARATOR, help='Separator used by --flatten. '
+                        'Defaults to ".".')
+    parser.add_argument('--max_depth', type=int, default=None, help='Nesting levels flattened by --flatten; deeper '
+                        'values are written as JSON text. Defaults to no limit.')
+    parser.add_argument('--sample', type=int, default=0, help='Number of records scanned to discover the CSV columns. '
+                        'Defaults to 0, which reads the whole input file twice, once to find every key so it gets '
+                        'a column and once to write the rows. '
+                        'With a sample, the input is read once and keys first seen later are stored as JSON in an '
+                        '"extra" column.')
 
     args = parser.parse_args()
     arg_dict = vars(args)  # Convert "args" Namespace to a Dictionary
@@ -24,6 +24,7 @@ __license__ = "Cisco Sample Code License, Version 1.1"
 import logging
 import sys
 import os
+import threading
 from configparser import ConfigParser, Error
 
 # Append parent directory to path so we can import from external packages
@@ -31,30 +32,96 @@ currentdir = os.path.dirname(os.path.realpath(__file__))
 parentdir = os.path.dirname(currentdir)
 sys.path.append(parentdir)
 
+# Section read when no cluster is selected
+DEFAULT_SECTION = 'DNAC'
+
+# Values returned by the first call for each section, so workflows chained in one process read (or prompt for) them
+# only once
+_config = {}
+_config_file = None
+_lock = threading.RLock()
+# Cluster (config.ini section) selected for the current thread with "use_cluster"
+_local = threading.local()
+
+
+def find_config_file():
+    # return (str): Path of the "config.ini" file, prompting for it if it can't be found
+    global _config_file
+    with _lock:
+        if _config_file is None:
+            # Check for location of "config.ini" file, prompt if it can't be found.
+            if os.path.isfile('../config.ini'):
+                _config_file = '../config.ini'
+            elif os.path.isfile('config.ini'):
+                _config_file = 'config.ini'
+            else:
+                _config_file = input('File "config.ini" was not found. Enter full path to INI file: ')
+        return _config_file
+
+
+def read_config():
+    # return config (ConfigParser): Contents of "config.ini"
+    config = ConfigParser()
+    config.read(find_config_file())
+    return config
+
+
+def list_clusters():
+    # return (list): Names of the "config.ini" sections that define a cluster (contain a "server" option). Besides
+    # the default [DNAC] section, each regional cluster may have its own section, e.g. [emea] or [apjc].
+    config = read_config()
+    return [section for section in config.sections() if config.has_option(section, 'server')]
+
+
+def use_cluster(name):
+    # param name (str): config.ini section that "get_config" reads in the current thread, or None for [DNAC].
+    # Workflows run in separate threads can each target a different cluster.
+    _local.cluster = name
+
+
+def current_cluster():
+    # return (str): Cluster selected for the current thread, or None
+    return getattr(_local, 'cluster', None)
+
+
+def cluster_path(path, cluster=None):
+    # param path (str): Output file or directory name
+    # param cluster (str): Cluster name, by default the one selected for the current thread. Worker pool threads
+    # have no cluster selected, so workflows pass the cluster of the thread that started the pool.
+    # return (str): The name prefixed with the cluster, e.g. "emea_advisory_summary.json", so concurrent runs
+    # against several clusters do not overwrite each other's files. Unchanged when no cluster is selected.
+    cluster = cluster or current_cluster()
+    if not cluster:
+        return path
+    directory, name = os.path.split(path)
+    return os.path.join(directory, f'{cluster}_{name}')
+
 
 def get_config():
     # Parse "config.ini" file to obtain DNAC appliance details and credentials.
     # return strings: dnac_server, dnac_port, dnac_username, dnac_password.
 
-    # Check for location of "config.ini" file, prompt if it can't be found.
-    if os.path.isfile('../config.ini'):
-        config_file = '../config.ini'
-    elif os.path.isfile('config.ini'):
-        config_file = 'config.ini'
-    else:
-        config_file = input('File "config.ini" was not found. Enter full path to INI file: ')
+    section = current_cluster() or DEFAULT_SECTION
+    with _lock:
+        if section not in _config:
+            _config[section] = _parse_section(section)
+        return _config[section]
 
-    logging.info('Parsing "config.ini" file to ingest DNAC details and credentials.')
-    config = ConfigParser()
+
+def _parse_section(section):
+    logging.info(f'Parsing "config.ini" file to ingest DNAC details and credentials from section [{section}].')
     try:
-        config.read(config_file)
-        dnac_server = config['DNAC']['server']
-        dnac_port = config['DNAC']['port']
-        dnac_username = config['DNAC']['username']
-        dnac_password = config['DNAC']['password']
+        config = read_config()
+        dnac_server = config[section]['server']
+        dnac_port = config[section]['port']
+        dnac_username = config[section]['username']
+        dnac_password = config[section]['password']
         logging.info(f'Setting config option "dnac_server" to {dnac_server}')
         logging.info(f'Setting config option "dnac_port" to {dnac_port}')
-    except Error:
+    except (Error, KeyError):
+        if section != DEFAULT_SECTION:
+            # Named clusters are usually read from several threads at once, so don't prompt for them
+            raise ValueError(f'Cluster [{section}] is not fully defined in "config.ini".')
         logging.warning('Error occurred while parsing "config.ini" file')  # If parsing fails, prompt for input instead
         import getpass  # Only import "getpass" module if needed
         dnac_server = input('Enter DNA Center appliance IP address: ')
@@ -0,0 +1,254 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import atexit
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import metrics
+
+DEFAULT_CACHE_FILE = 'files/http_cache.db'
+DEFAULT_TTL = 86400
+# off: no caching. auto: answer from the cache when an entry is fresh, otherwise call DNAC and store the response.
+# record: always call DNAC and store the responses (refreshes the cache). replay: answer only from the cache, with no
+# network access at all; requests missing from the cache fail.
+MODES = ('off', 'auto', 'record', 'replay')
+# Environment variables configuring the cache of scripts started without "dnac.py --http_cache"
+MODE_VARIABLE = 'DNAC_HTTP_CACHE'
+FILE_VARIABLE = 'DNAC_HTTP_CACHE_FILE'
+TTL_VARIABLE = 'DNAC_HTTP_CACHE_TTL'
+# Token requests are never stored, so credentials and live tokens do not end up on disk. In replay mode they are
+# answered with this placeholder token.
+TOKEN_PATH = '/auth/token'
+REPLAY_TOKEN = 'replayed-token'
+# Response headers that describe the encoding on the wire rather than the stored body
+DROPPED_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length', 'connection', 'keep-alive'}
+# Streamed bodies are copied in chunks of this many bytes, and kept in memory up to SPOOL_SIZE bytes before they are
+# moved to a temporary file
+CHUNK_SIZE = 64 * 1024
+SPOOL_SIZE = 1024 * 1024
+
+
+class ReplayMissError(Exception):
+    # Raised in replay mode for a request that was never recorded
+    pass
+
+
+def request_key(method, url, params=None, data=None, json_body=None):
+    # param method, url, params, data, json_body: Arguments of the request, as given to "requests.request"
+    # return (str): SHA-256 of the method, the URL with its query parameters sorted, and the body. Headers, and so
+    # the "X-Auth-Token" and credentials, are not part of the key.
+
+    from requests import Request
+    prepared = Request(method.upper(), url, params=params, data=data, json=json_body).prepare()
+    parts = urlsplit(prepared.url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    body = prepared.body or b''
+    if isinstance(body, str):
+        body = body.encode()
+    canonical = f'{prepared.method} {parts.scheme}://{parts.netloc}{parts.path}?{query}\n'.encode() + body
+    return hashlib.sha256(canonical).hexdigest()
+
+
+def build_response(method, url, status, headers, body):
+    # return (requests.Response): Response read from the cache, usable like one received from DNAC, including
+    # "iter_content" on streamed downloads
+    from requests import Request, Response
+    from requests.structures import CaseInsensitiveDict
+    response = Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers)
+    response._content = body
+    response._content_consumed = True
+    response.url = url
+    response.reason = 'OK'
+    response.request = Request(method.upper(), url).prepare()
+    return response
+
+
+class HttpCache:
+    # SQLite backed store of DNAC API responses, keyed on "request_key". Bodies are compressed with zlib, which
+    # shrinks the JSON responses of DNAC several times over. Only successful (2xx) responses are stored.
+    # A request sent to DNAC by this process is not answered from the cache again later in the same process, so
+    # polling a task status keeps calling DNAC until the task finishes; the last response received is the one kept.
+
+    def __init__(self, filename=DEFAULT_CACHE_FILE, mode='auto', ttl=DEFAULT_TTL):
+        # param ttl: Maximum age in seconds of entries answered in auto mode; 0 for no limit. Replay mode answers
+        # entries of any age.
+        import sqlite3
+        if mode not in MODES:
+            raise ValueError(f'Unknown HTTP cache mode "{mode}", expected one of: {", ".join(MODES)}')
+        pathlib.Path(os.path.dirname(filename) or '.').mkdir(parents=True, exist_ok=True)
+        self.filename = filename
+        self.mode = mode
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(filename, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, method TEXT, url TEXT, '
+                        'status INTEGER, headers TEXT, body BLOB, stored_at REAL)')
+        self.db.commit()
+        self.fetched = set()
+        self.counts = {'hits': 0, 'misses': 0, 'stored': 0}
+        atexit.register(self._report)
+
+    def get(self, key):
+        # return status, headers, body: Cached response, or None on a miss
+        if key in self.fetched:
+            return None
+        cutoff = time.time() - self.ttl if self.ttl and self.mode != 'replay' else 0
+        with self.lock:
+            row = self.db.execute('SELECT status, headers, body FROM responses WHERE key = ? AND stored_at >= ?',
+                                  (key, cutoff)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1]), zlib.decompress(row[2])
+
+    def store(self, key, method, url, response, stream=False):
+        # param response (requests.Response): Response received from DNAC
+        # param stream (bool): The request was sent with "stream=True". The body is then compressed chunk by chunk
+        # while it is copied to a spooled temporary file, which the response reads from afterwards, so the caller
+        # still streams a download instead of holding it in memory. Only the compressed copy is kept in memory.
+        headers = {name: value for name, value in response.headers.items() if name.lower() not in DROPPED_HEADERS}
+        if stream:
+            compressor = zlib.compressobj()
+            spool = tempfile.SpooledTemporaryFile(SPOOL_SIZE)
+            parts = []
+            for chunk in response.iter_content(CHUNK_SIZE):
+                spool.write(chunk)
+                parts.append(compressor.compress(chunk))
+            parts.append(compressor.flush())
+            body = b''.join(parts)
+            response.close()
+            spool.seek(0)
+            response.raw = spool
+            response._content_consumed = False
+        else:
+            body = zlib.compress(response.content)
+        with self.lock:
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                            (key, method.upper(), url.split('?')[0], response.status_code, json.dumps(headers),
+                             body, time.time()))
+            self.db.commit()
+            self.counts['stored'] += 1
+
+    def request(self, send, method, url, **kwargs):
+        # param send: Function sending the request to DNAC, with the same arguments as "requests.request"
+        # return (requests.Response): Cached or received response
+
+        if TOKEN_PATH in urlsplit(url).path:
+            if self.mode == 'replay':
+                return build_response(method, url, 200, {'Content-Type': 'application/json'},
+                                      json.dumps({'Token': REPLAY_TOKEN}).encode())
+            return send(method, url, **kwargs)
+
+        key = request_key(method, url, kwargs.get('params'), kwargs.get('data'), kwargs.get('json'))
+        if self.mode in ('auto', 'replay'):
+            cached = self.get(key)
+            with self.lock:
+                self.counts['hits' if cached else 'misses'] += 1
+            if cached:
+                logging.debug(f'HTTP cache hit for {method} {urlsplit(url).path}')
+                return build_response(method, url, *cached)
+            if self.mode == 'replay':
+                raise ReplayMissError(f'{method} {url} (params {kwargs.get("params")}) was not recorded in '
+                                      f'{self.filename}')
+        response = send(method, url, **kwargs)
+        self.fetched.add(key)
+        if 200 <= response.status_code < 300:
+            self.store(key, method, url, response, kwargs.get('stream', False))
+        return response
+
+    def purge(self, ttl):
+        # param ttl: Entries older than this many seconds are deleted
+        # return (int): Number of entries deleted
+        with self.lock:
+            deleted = self.db.execute('DELETE FROM responses WHERE stored_at < ?', (time.time() - ttl,)).rowcount
+            self.db.commit()
+        return deleted
+
+    def summary(self):
+        # return (list): Number of stored responses, compressed size and age range per method and endpoint, with
+        # IDs in the path replaced by "{id}"
+        endpoints = {}
+        with self.lock:
+            rows = self.db.execute('SELECT method, url, LENGTH(body), stored_at FROM responses').fetchall()
+        for method, url, size, stored_at in rows:
+            key = (method, metrics.endpoint_template(url))
+            count, total, oldest, newest = endpoints.get(key, (0, 0, stored_at, stored_at))
+            endpoints[key] = (count + 1, total + size, min(oldest, stored_at), max(newest, stored_at))
+        return [key + value for key, value in sorted(endpoints.items(), key=lambda item: item[0][1])]
+
+    def _report(self):
+        if any(self.counts.values()):
+            logging.info(f'HTTP cache ({self.mode}): {self.counts["hits"]} hits, {self.counts["misses"]} misses, '
+                         f'{self.counts["stored"]} responses stored in {self.filename}')
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def from_environment():
+    # return (HttpCache): Cache configured by the DNAC_HTTP_CACHE* environment variables, or None if they do not
+    # enable it
+    mode = os.environ.get(MODE_VARIABLE, 'off').lower()
+    if mode == 'off':
+        return None
+    return HttpCache(os.environ.get(FILE_VARIABLE) or DEFAULT_CACHE_FILE, mode,
+                     float(os.environ.get(TTL_VARIABLE) or DEFAULT_TTL))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show or clean up the HTTP cache of recorded DNAC API responses.')
+    parser.add_argument('--cache_file', type=str, default=os.environ.get(FILE_VARIABLE) or DEFAULT_CACHE_FILE,
+                        help=f'Cache file. Default is "{DEFAULT_CACHE_FILE}".')
+    parser.add_argument('--purge', type=float, metavar='SECONDS', help='Delete entries older than this many '
+                        'seconds.')
+    args = parser.parse_args()
+    if not os.path.isfile(args.cache_file):
+        sys.exit(f'Cache file "{args.cache_file}" was not found.')
+    cache = HttpCache(args.cache_file, 'auto')
+    if args.purge is not None:
+        print(f'{cache.purge(args.purge)} entries deleted')
+    now = time.time()
+    for method, url, count, size, oldest, newest in cache.summary():
+        print(f'{method:<5}{url}  {count} responses, {size / 1024:.1f} KB, '
+              f'{(now - newest) / 60:.0f}-{(now - oldest) / 60:.0f} minutes old')
+    cache.close()
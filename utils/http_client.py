@@ -0,0 +1,198 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from utils.rate_limiter import RateLimiter
+from utils import metrics
+
+# Number of pooled connections kept open to each DNAC cluster
+POOL_SIZE = 20
+# Number of times a request answered with 429 Too Many Requests is repeated, and the first backoff in seconds. The
+# backoff doubles with every attempt and is the shortest wait, even if "Retry-After" asks for less.
+MAX_RETRIES = 5
+RETRY_BACKOFF = 1.0
+
+_clients = {}
+_clients_lock = threading.Lock()
+# Number of 401 responses received by each thread, see "unauthorized_count"
+_local = threading.local()
+# utils.http_cache.HttpCache shared by every client; configured from the environment on first use unless set with
+# "use_cache"
+_cache = None
+_cache_configured = False
+
+
+class ApiClient:
+    # Pooled HTTP client for a single DNAC cluster. Connections are kept alive and reused between API calls instead
+    # of opening a new TLS session for every request. An optional RateLimiter caps the request rate to the cluster.
+    # Throttled (429) requests are retried, and every call is recorded in utils.metrics.
+
+    def __init__(self, pool_size=POOL_SIZE, limiter=None):
+        # "requests" is only imported once the first client is created, so scripts start (and print "--help") quickly
+        import requests
+        import urllib3
+        from requests.adapters import HTTPAdapter
+        from urllib3.exceptions import InsecureRequestWarning
+        urllib3.disable_warnings(InsecureRequestWarning)  # Disable insecure https warnings
+
+        self.limiter = limiter
+        self.errors = requests.RequestException
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def request(self, method, url, **kwargs):
+        attempt = 0
+        while True:
+            wait = self.limiter.acquire() if self.limiter else 0.0
+            start = time.monotonic()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except self.errors:
+                metrics.record(method, url, None, time.monotonic() - start, retry=attempt > 0, wait=wait)
+                raise
+            metrics.record(method, url, response.status_code, time.monotonic() - start,
+                           bytes_out=_body_size(response.request.body), bytes_in=_content_size(response),
+                           retry=attempt > 0, wait=wait)
+            if response.status_code == 401:
+                _local.unauthorized = unauthorized_count() + 1
+            if response.status_code != 429 or attempt >= MAX_RETRIES:
+                return response
+            delay = _retry_delay(response, attempt)
+            logging.warning(f'Request to {urlsplit(url).path} was throttled (429), retrying in {delay:.1f}s.')
+            response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def close(self):
+        self.session.close()
+
+
+def unauthorized_count():
+    # return (int): Number of 401 responses received by the current thread. Callers whose API functions only report
+    # a generic failure compare it before and after a call to tell whether DNAC rejected the token.
+    return getattr(_local, 'unauthorized', 0)
+
+
+def _body_size(body):
+    if isinstance(body, (bytes, str)):
+        return len(body)
+    return 0
+
+
+def _content_size(response):
+    # Size of the response body without reading a streamed body that has not been consumed yet
+    if response._content not in (False, None):
+        return len(response._content)
+    try:
+        return int(response.headers.get('content-length', 0))
+    except ValueError:
+        return 0
+
+
+def _retry_delay(response, attempt):
+    # Back off exponentially, or longer if a "Retry-After" header (in seconds) asks for it. Up to 50% random jitter is
+    # added so threads throttled at the same moment do not all retry at the same moment.
+    delay = RETRY_BACKOFF * 2 ** attempt
+    try:
+        delay = max(delay, float(response.headers['retry-after']))
+    except (KeyError, ValueError):
+        pass
+    return delay * (1 + random.random() / 2)
+
+
+def _client_key(url):
+    parts = urlsplit(url)
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def get_client(url):
+    # param url: String containing any URL on the DNAC cluster
+    # return: ApiClient shared by all requests to the same scheme, host and port
+
+    key = _client_key(url)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            logging.debug(f'Creating pooled HTTP client for {key}')
+            client = _clients[key] = ApiClient()
+    return client
+
+
+def set_rate_limit(url, rate, burst=None):
+    # param url: String containing any URL on the DNAC cluster
+    # param rate: Maximum average number of requests per second to the cluster, or None to remove the limit
+    # param burst: Number of requests that may be sent back to back before the rate applies
+
+    get_client(url).limiter = RateLimiter(rate, burst) if rate else None
+
+
+def use_cache(cache):
+    # param cache (utils.http_cache.HttpCache): Cache answering and recording the requests of every client, or None
+    # to send every request to DNAC. Overrides the DNAC_HTTP_CACHE environment variables.
+    global _cache, _cache_configured
+    with _clients_lock:
+        _cache = cache
+        _cache_configured = True
+
+
+def _get_cache():
+    global _cache, _cache_configured
+    if not _cache_configured:
+        with _clients_lock:
+            if not _cache_configured:
+                from utils import http_cache
+                _cache = http_cache.from_environment()
+                _cache_configured = True
+    return _cache
+
+
+def request(method, url, **kwargs):
+    # Accepts the same arguments as "requests.request"
+    client = get_client(url)
+    cache = _get_cache()
+    if cache:
+        return cache.request(client.request, method, url, **kwargs)
+    return client.request(method, url, **kwargs)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def close_all():
+    # Close the pooled connections of every client
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,88 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+
+_WHITESPACE = ' \t\n\r'
+
+
+def iter_json_array(file_obj, chunk_size=65536):
+    # param file_obj: File object opened in text mode, containing a top-level JSON array
+    # param chunk_size: Number of characters to read from the file at a time
+    # return: Generator yielding each item of the top-level array, one at a time
+    # Only the item currently being decoded is held in memory, so very large API exports can be processed
+    # without calling "json.load" on the entire file.
+
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    read_size = chunk_size
+
+    def read_more():
+        nonlocal buffer, position, eof
+        chunk = file_obj.read(read_size)
+        if not chunk:
+            eof = True
+            return
+        # Discard characters that have already been decoded before growing the buffer
+        buffer = buffer[position:] + chunk
+        position = 0
+
+    def skip(characters):
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in characters:
+                position += 1
+            if position < len(buffer) or eof:
+                return
+            read_more()
+
+    # Find the opening bracket of the array
+    skip(_WHITESPACE)
+    if position >= len(buffer) or buffer[position] != '[':
+        raise ValueError('Input does not contain a top-level JSON array.')
+    position += 1
+
+    while True:
+        skip(_WHITESPACE + ',')
+        if position >= len(buffer):
+            raise ValueError('Unexpected end of input while reading JSON array.')
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            # Double the read size on each miss so very large items are not re-decoded once per chunk
+            read_more()
+            read_size *= 2
+            continue
+        if end == len(buffer) and not eof:
+            # A scalar at the end of the buffer may have been truncated (e.g. "12" of "123"), read more first
+            read_more()
+            continue
+        position = end
+        read_size = chunk_size
+        yield item
@@ -21,8 +21,12 @@ __contributors__ = ""
 __copyright__ = "Copyright (c) 2021 Cisco and/or its affiliates."
 __license__ = "Cisco Sample Code License, Version 1.1"
 
+import json
 import logging
 
+# Default maximum number of characters of a payload or response body included in a log message
+PREVIEW_LIMIT = 2048
+
 
 def logger(logging_level, logging_file):
     # param logging_level: Level of logging output
@@ -48,3 +52,81 @@ def logger(logging_level, logging_file):
 
     logging.info('Started logging...')
     return
+
+
+def enabled(level=logging.DEBUG):
+    # return (bool): True if messages of "level" are output. Use as a guard before doing work only needed for logging.
+    return logging.getLogger().isEnabledFor(level)
+
+
+def _truncate(text, total, limit, unit='characters'):
+    # Mark previews that were cut short with the full size of the payload
+    if total > limit:
+        return f'{text[:limit]}... ({total} {unit} total)'
+    return text
+
+
+class Preview:
+    # Lazily renders a size-capped preview of any payload for use as a %-style logging argument, e.g.
+    # logging.debug('Received: %s', Preview(result)). Nothing is serialized unless the message is actually emitted,
+    # and dicts/lists are encoded piece by piece only until "limit" characters have been produced, so previewing a
+    # large payload never builds a second full copy of it.
+
+    def __init__(self, value, limit=PREVIEW_LIMIT):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self):
+        limit = self.limit
+        value = self.value
+        if isinstance(value, bytes):
+            return _truncate(value[:limit + 1].decode('utf-8', errors='replace'), len(value), limit, 'bytes')
+        if isinstance(value, str):
+            return _truncate(value, len(value), limit)
+        if isinstance(value, (dict, list, tuple)):
+            parts = []
+            length = 0
+            try:
+                for chunk in json.JSONEncoder(default=str).iterencode(value):
+                    parts.append(chunk)
+                    length += len(chunk)
+                    if length > limit:
+                        return f'{"".join(parts)[:limit]}... (truncated)'
+                return ''.join(parts)
+            except (TypeError, ValueError):
+                pass
+        text = str(value)
+        return _truncate(text, len(text), limit)
+
+
+class ResponsePreview:
+    # Lazily renders the status code and a size-capped preview of the body of a "requests" response. The body is
+    # never decoded as a whole or parsed as JSON. Callers that requested the response with "stream=True" pass
+    # "streamed", and its body is left for them to read.
+
+    def __init__(self, response, limit=PREVIEW_LIMIT, headers=False, streamed=False):
+        self.response = response
+        self.limit = limit
+        self.headers = headers
+        self.streamed = streamed
+
+    def __str__(self):
+        response = self.response
+        text = f'{response.status_code} {response.reason or ""}'.rstrip()
+        if self.streamed:
+            text += ': <streamed body not read>'
+        else:
+            text += f': {Preview(response.content or b"", self.limit)}'
+        if self.headers:
+            text += f'\nHeaders: {response.headers}'
+        return text
+
+
+def log_response(message, response, level=logging.DEBUG, limit=PREVIEW_LIMIT, headers=False, streamed=False):
+    # param message (str): Text logged before the response preview
+    # param response: "requests" response object
+    # param level (int): Logging level of the message
+    # param limit (int): Maximum number of characters of the body included
+    # param streamed (bool): The response was requested with "stream=True"; its body is not previewed
+    if enabled(level):
+        logging.log(level, '%s: %s', message, ResponsePreview(response, limit, headers, streamed))
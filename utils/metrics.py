@@ -0,0 +1,332 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import atexit
+import json
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, deque
+from itertools import accumulate
+from datetime import datetime as dt
+from urllib.parse import urlsplit
+
+# Upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+PERCENTILES = (50, 95, 99)
+# Most recent samples kept per endpoint and worker pool for percentiles. Counts, sums, maxima and histogram buckets
+# cover every sample.
+SAMPLE_SIZE = 10000
+# Path segments replaced by "{id}" in endpoint templates: UUIDs, long hex IDs, numbers and other long identifiers
+# containing digits (e.g. advisory IDs)
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12}|[0-9a-fA-F]{16,}|\d+|'
+                         r'(?=[^/]*\d)[\w.:-]{12,})$')
+
+
+def endpoint_template(url):
+    # param url (str): Request URL
+    # return (str): URL path with IDs replaced by "{id}", so calls to the same API endpoint are counted together
+    path = urlsplit(url).path
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+def percentile(values, q):
+    # param values (list): Sorted values
+    # param q (int): Percentile, 0-100
+    # return (float): Nearest-rank percentile of the values
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))]
+
+
+class Distribution:
+    # Running count, sum, maximum and histogram bucket counts of a series of durations, with the most recent
+    # SAMPLE_SIZE values for percentiles, so memory use and the cost of a report stay bounded in long-running processes
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+        self.recent = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, value):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        index = bisect_left(BUCKETS, value)
+        if index < len(BUCKETS):
+            self.buckets[index] += 1
+        self.recent.append(value)
+
+    def cumulative(self):
+        # return (list): Number of values up to each of BUCKETS, then of all values, as in a Prometheus histogram
+        return list(accumulate(self.buckets)) + [self.count]
+
+    def percentiles(self):
+        # return (dict): Percentile to value, over the most recent values
+        values = sorted(self.recent)
+        return {q: percentile(values, q) for q in PERCENTILES}
+
+
+class EndpointStats:
+    # Counters and latency distribution of one endpoint template
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.statuses = Counter()
+        self.latencies = Distribution()
+        self.bytes_out = 0
+        self.bytes_in = 0
+        self.retries = 0
+        self.throttled = 0
+        self.wait = 0.0
+
+
+class Metrics:
+    # Thread-safe registry of API call metrics, keyed by method and endpoint template, and of the time tasks spend
+    # queued in worker pools before they start.
+
+    def __init__(self):
+        self.endpoints = {}
+        self.queues = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, method, url, status, latency, bytes_out=0, bytes_in=0, retry=False, wait=0.0):
+        # param method (str): HTTP method
+        # param url (str): Request URL
+        # param status (int): Response status code, or None if the request failed without a response
+        # param latency (float): Seconds from sending the request until the response was received (headers only for
+        # streamed responses)
+        # param bytes_out, bytes_in (int): Request and response body sizes
+        # param retry (bool): The call repeats an earlier call that was throttled
+        # param wait (float): Seconds spent waiting for the client-side rate limiter before sending
+
+        key = (method.upper(), endpoint_template(url))
+        with self.lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.count += 1
+            stats.statuses[status or 'error'] += 1
+            if status is None or status >= 400:
+                stats.errors += 1
+            if status == 429:
+                stats.throttled += 1
+            stats.retries += bool(retry)
+            stats.latencies.add(latency)
+            stats.bytes_out += bytes_out
+            stats.bytes_in += bytes_in
+            stats.wait += wait
+
+    def record_queue(self, name, wait):
+        # param name (str): Name of the worker pool task
+        # param wait (float): Seconds the task waited in the pool queue
+        with self.lock:
+            queue = self.queues.get(name)
+            if queue is None:
+                queue = self.queues[name] = Distribution()
+            queue.add(wait)
+
+    def summary(self):
+        # return summary (dict): Run totals, and per endpoint counters and latency percentiles in milliseconds.
+        # Percentiles cover the last SAMPLE_SIZE calls of each endpoint and tasks of each pool.
+        with self.lock:
+            endpoints = []
+            for (method, template), stats in sorted(self.endpoints.items(), key=lambda item: -item[1].latencies.sum):
+                latencies = stats.latencies
+                endpoint = {'method': method, 'endpoint': template, 'calls': stats.count, 'errors': stats.errors,
+                            'throttled': stats.throttled, 'retries': stats.retries,
+                            'statuses': {str(status): count for status, count in stats.statuses.items()},
+                            'bytesOut': stats.bytes_out, 'bytesIn': stats.bytes_in,
+                            'totalSeconds': round(latencies.sum, 3), 'rateLimitWaitSeconds': round(stats.wait, 3)}
+                for q, value in latencies.percentiles().items():
+                    endpoint[f'p{q}Ms'] = round(value * 1000, 1)
+                endpoint['maxMs'] = round(latencies.max * 1000, 1)
+                endpoints.append(endpoint)
+            queues = []
+            for name, waits in sorted(self.queues.items()):
+                queues.append({'pool': name, 'tasks': waits.count, 'totalWaitSeconds': round(waits.sum, 3),
+                               **{f'p{q}WaitMs': round(value * 1000, 1) for q, value in waits.percentiles().items()}})
+        elapsed = time.time() - self.started
+        calls = sum(endpoint['calls'] for endpoint in endpoints)
+        return {
+            'started': dt.fromtimestamp(self.started).isoformat(),
+            'elapsedSeconds': round(elapsed, 3),
+            'calls': calls,
+            'callsPerSecond': round(calls / elapsed, 2) if elapsed else 0.0,
+            'errors': sum(endpoint['errors'] for endpoint in endpoints),
+            'throttled': sum(endpoint['throttled'] for endpoint in endpoints),
+            'bytesIn': sum(endpoint['bytesIn'] for endpoint in endpoints),
+            'bytesOut': sum(endpoint['bytesOut'] for endpoint in endpoints),
+            'endpoints': endpoints,
+            'queues': queues
+        }
+
+    def prometheus(self):
+        # return (str): Metrics in the Prometheus text exposition format
+        lines = []
+
+        def metric(name, kind, description, samples):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{{{_labels(labels)}}} {value}')
+
+        # Histograms are built from running bucket counts, so a scrape does not sort any samples
+        with self.lock:
+            items = sorted((key, stats.statuses.copy(), stats.latencies.cumulative(), stats.latencies.sum,
+                            {attribute: getattr(stats, attribute)
+                             for attribute in ('bytes_out', 'bytes_in', 'retries', 'throttled', 'wait')})
+                           for key, stats in self.endpoints.items())
+            queues = sorted((name, waits.sum, waits.count) for name, waits in self.queues.items())
+        endpoint = [(('method', method), ('endpoint', template)) for (method, template), *_ in items]
+        metric('dnac_api_requests_total', 'counter', 'API calls by response status.',
+               [(labels + (('status', status),), count) for labels, (_, statuses, *_) in zip(endpoint, items)
+                for status, count in sorted(statuses.items(), key=str)])
+        lines.append('# HELP dnac_api_request_duration_seconds API call latency.')
+        lines.append('# TYPE dnac_api_request_duration_seconds histogram')
+        for labels, (_, _, counts, total, _) in zip(endpoint, items):
+            for bound, count in zip(BUCKETS + ('+Inf',), counts):
+                lines.append(f'dnac_api_request_duration_seconds_bucket{{{_labels(labels + (("le", bound),))}}} '
+                             f'{count}')
+            lines.append(f'dnac_api_request_duration_seconds_sum{{{_labels(labels)}}} {total:.6f}')
+            lines.append(f'dnac_api_request_duration_seconds_count{{{_labels(labels)}}} {counts[-1]}')
+        for name, attribute, description in (
+                ('dnac_api_request_bytes_total', 'bytes_out', 'Request body bytes sent.'),
+                ('dnac_api_response_bytes_total', 'bytes_in', 'Response body bytes received.'),
+                ('dnac_api_retries_total', 'retries', 'API calls repeated after a 429 response.'),
+                ('dnac_api_throttled_total', 'throttled', 'API calls answered with 429 Too Many Requests.'),
+                ('dnac_api_rate_limit_wait_seconds_total', 'wait', 'Time spent waiting for the client-side rate '
+                                                                   'limiter.')):
+            metric(name, 'counter', description,
+                   [(labels, round(values[attribute], 6)) for labels, (*_, values) in zip(endpoint, items)])
+        metric('dnac_pool_queue_wait_seconds_total', 'counter', 'Time tasks waited in worker pool queues.',
+               [((('pool', name),), round(total, 6)) for name, total, _ in queues])
+        metric('dnac_pool_tasks_total', 'counter', 'Tasks run by worker pools.',
+               [((('pool', name),), count) for name, _, count in queues])
+        return '\n'.join(lines) + '\n'
+
+    def table(self):
+        # return (str): Compact per endpoint timing table, slowest total time first
+        summary = self.summary()
+        rows = [('Endpoint', 'Calls', 'Err', '429', 'p50 ms', 'p95 ms', 'p99 ms', 'Total s', 'KB in')]
+        for endpoint in summary['endpoints']:
+            rows.append((f'{endpoint["method"]} {endpoint["endpoint"]}', endpoint['calls'], endpoint['errors'],
+                         endpoint['throttled'], endpoint['p50Ms'], endpoint['p95Ms'], endpoint['p99Ms'],
+                         endpoint['totalSeconds'], round(endpoint['bytesIn'] / 1024, 1)))
+        widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+        lines = ['  '.join(str(value).ljust(widths[i]) if i == 0 else str(value).rjust(widths[i])
+                           for i, value in enumerate(row)) for row in rows]
+        lines.insert(1, '-' * len(lines[0]))
+        lines.append(f'{summary["calls"]} API calls in {summary["elapsedSeconds"]}s '
+                     f'({summary["callsPerSecond"]}/s), {summary["errors"]} errors, {summary["throttled"]} throttled')
+        for queue in summary['queues']:
+            lines.append(f'Pool "{queue["pool"]}": {queue["tasks"]} tasks, p95 queue wait {queue["p95WaitMs"]} ms')
+        return '\n'.join(lines)
+
+
+def _labels(labels):
+    # Format (name, value) pairs as Prometheus labels, escaping the values
+    return ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Metrics of every API call made through utils.http_client in this process
+REGISTRY = Metrics()
+# Name and directory used by the report registered with "report_at_exit"
+_exit_report = {}
+
+
+def record(method, url, status, latency, **kwargs):
+    REGISTRY.record(method, url, status, latency, **kwargs)
+
+
+def queued(func, tasks, name=None, star=False):
+    # param func: Function run by a worker pool
+    # param tasks (iterable): Arguments of each call, one item per task; argument tuples if "star" is set
+    # param name (str): Pool name used in reports, defaults to the function name
+    # return run, tasks: Wrapped function and tasks to pass to the pool's "map" or "imap_unordered". Each task is
+    # stamped when the pool takes it from the iterable, i.e. when it is queued, and "run" records how long it waited
+    # before a worker started it.
+    name = name or func.__name__
+
+    def run(task):
+        submitted, args = task
+        REGISTRY.record_queue(name, time.monotonic() - submitted)
+        return func(*args) if star else func(args)
+    return run, ((time.monotonic(), args) for args in tasks)
+
+
+def summary():
+    return REGISTRY.summary()
+
+
+def write_prometheus(filename):
+    # param filename (str): Prometheus text file, e.g. for the node_exporter textfile collector
+    with open(filename, 'w') as f:
+        f.write(REGISTRY.prometheus())
+    return filename
+
+
+def write_json(filename):
+    # param filename (str): JSON run summary file
+    with open(filename, 'w') as f:
+        json.dump(REGISTRY.summary(), f, indent=4)
+    return filename
+
+
+def report(metrics_dir=None, name='dnac'):
+    # Print the timing table to stderr and, if "metrics_dir" is set, save "<name>.prom" and a timestamped JSON run
+    # summary in that directory
+    if not REGISTRY.endpoints:
+        return
+    print(REGISTRY.table(), file=sys.stderr)
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        timestamp = dt.now().strftime('%Y-%m-%dT%H-%M-%S')
+        write_prometheus(os.path.join(metrics_dir, f'{name}.prom'))
+        write_json(os.path.join(metrics_dir, f'{name}_run_{timestamp}.json'))
+
+
+def report_at_exit(metrics_dir=None, name='dnac'):
+    # Register "report" to run when the script exits, including exits through "sys.exit". Only the first call
+    # registers it, so workflows chained in one process print a single combined table; the first "metrics_dir" given
+    # by any of them is used.
+    if not _exit_report:
+        _exit_report['name'] = name
+        atexit.register(_report_at_exit)
+    if metrics_dir:
+        _exit_report.setdefault('metrics_dir', metrics_dir)
+
+
+def _report_at_exit():
+    report(_exit_report.get('metrics_dir'), _exit_report['name'])
@@ -0,0 +1,243 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+
+import atexit
+import cProfile
+import io
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime as dt
+
+MODES = ('time', 'cprofile', 'tracemalloc')
+# Seconds between stack samples taken for the flame graph
+SAMPLE_INTERVAL = 0.005
+# Number of entries listed per stage in the cProfile and allocation reports
+TOP = 15
+# Leaf frames of threads that are only waiting for work; these samples are left out of the flame graph
+_IDLE = {('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'), ('queue.py', 'get'),
+         ('pool.py', 'worker'), ('selectors.py', 'select')}
+
+
+class StackSampler(threading.Thread):
+    # Samples the Python stack of every thread at a fixed interval and counts each distinct stack, prefixed with the
+    # name of the stage the thread was running at the time (or, for worker threads outside any stage, the stage of
+    # the main thread). The counts are written in the "folded stacks" format read by
+    # flamegraph.pl, speedscope and similar tools. Unlike cProfile this also covers the worker pool threads.
+
+    def __init__(self, profiler, interval=SAMPLE_INTERVAL):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.profiler = profiler
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            main_stage = self.profiler.current(threading.main_thread().ident) or 'other'
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stage = self.profiler.current(thread_id) or main_stage
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                self.stacks[';'.join([stage] + stack[::-1])] += 1
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+    def folded(self):
+        # return (str): One "stack count" line per distinct stack
+        return ''.join(f'{stack} {count}\n' for stack, count in sorted(self.stacks.items()))
+
+
+def _own_filter(snapshot):
+    # Leave out memory allocated by the profiler and by tracemalloc itself
+    return snapshot.filter_traces([tracemalloc.Filter(False, __file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+
+
+class Profiler:
+    # Times named pipeline stages. Every stage records wall time and process CPU time (all threads). Optionally each
+    # outermost stage is also run under cProfile, or tracemalloc snapshots are taken around it to report the lines
+    # that allocated the most memory. While enabled, a StackSampler collects stacks for a flame graph.
+
+    def __init__(self, mode='time', name='dnac'):
+        if mode not in MODES:
+            raise ValueError(f'Unknown profile mode "{mode}", expected one of: {", ".join(MODES)}')
+        self.mode = mode
+        self.name = name
+        self.stages = []
+        self.reports = {}
+        self.started = time.perf_counter()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._active = {}
+        self.sampler = StackSampler(self)
+        self.sampler.start()
+        if mode == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def current(self, thread_id):
+        # return (str): Path of the innermost stage running in the thread, e.g. "fan-out/write", or None
+        return self._active.get(thread_id)
+
+    @contextmanager
+    def stage(self, name):
+        # Context manager timing the enclosed block as stage "name". Stages may be nested.
+        stack = self._local.__dict__.setdefault('stack', [])
+        outermost = not stack
+        stack.append(name)
+        path = '/'.join(stack)
+        thread_id = threading.get_ident()
+        self._active[thread_id] = path
+        profile = cProfile.Profile() if self.mode == 'cprofile' and outermost else None
+        snapshot = None
+        if self.mode == 'tracemalloc' and outermost:
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot()
+        wall, cpu = time.perf_counter(), time.process_time()
+        if profile:
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler is already active (Python 3.12+ allows only one at a time)
+                profile = None
+        try:
+            yield
+        finally:
+            if profile:
+                profile.disable()
+            result = {'stage': path, 'depth': len(stack) - 1,
+                      'wallSeconds': round(time.perf_counter() - wall, 4),
+                      'cpuSeconds': round(time.process_time() - cpu, 4)}
+            with self._lock:
+                if profile:
+                    self.reports.setdefault(path, []).append(profile)
+                if snapshot:
+                    result['peakMemoryBytes'] = tracemalloc.get_traced_memory()[1]
+                    self.reports.setdefault(path, []).append(
+                        _own_filter(tracemalloc.take_snapshot()).compare_to(_own_filter(snapshot), 'lineno')[:TOP])
+                self.stages.append(result)
+            stack.pop()
+            if stack:
+                self._active[thread_id] = '/'.join(stack)
+            else:
+                self._active.pop(thread_id, None)
+
+    def table(self):
+        # return (str): Wall and CPU time of every stage in the order they finished
+        rows = [('Stage', 'Wall s', 'CPU s', 'CPU %')]
+        for stage in self.stages:
+            cpu_share = round(100 * stage['cpuSeconds'] / stage['wallSeconds']) if stage['wallSeconds'] else 0
+            rows.append(('  ' * stage['depth'] + stage['stage'].rsplit('/', 1)[-1], stage['wallSeconds'],
+                         stage['cpuSeconds'], cpu_share))
+        rows.append(('total', round(time.perf_counter() - self.started, 4), round(time.process_time(), 4), ''))
+        widths = [max(len(str(row[i])) for row in rows) for i in range(4)]
+        lines = ['  '.join(str(value).ljust(widths[i]) if i == 0 else str(value).rjust(widths[i])
+                           for i, value in enumerate(row)) for row in rows]
+        lines.insert(1, '-' * len(lines[0]))
+        return '\n'.join(lines)
+
+    def _report_text(self):
+        # return (str): Top functions by cumulative time per stage (cProfile), or top allocating lines (tracemalloc)
+        import pstats  # Only needed for cProfile reports
+        output = io.StringIO()
+        for stage, reports in self.reports.items():
+            output.write(f'=== Stage "{stage}" ({len(reports)} run{"s" if len(reports) > 1 else ""})\n')
+            if self.mode == 'cprofile':
+                pstats.Stats(*reports, stream=output).sort_stats('cumulative').print_stats(TOP)
+            else:
+                # Largest growth of any run of the stage
+                for stat in max(reports, key=lambda report: sum(stat.size_diff for stat in report)):
+                    output.write(f'{stat.size_diff / 1024:12.1f} KiB  {stat.count_diff:+9d} blocks  '
+                                 f'{stat.traceback}\n')
+            output.write('\n')
+        return output.getvalue()
+
+    def save(self, directory='profile'):
+        # Write the stage timings (JSON), the folded stacks for a flame graph and, depending on the mode, the cProfile
+        # statistics of each stage or the allocation report
+        # return files (list): Names of the files written
+        self.sampler.stop()
+        os.makedirs(directory, exist_ok=True)
+        prefix = os.path.join(directory, f'{self.name}_{dt.now().strftime("%Y-%m-%dT%H-%M-%S")}')
+        files = [f'{prefix}_stages.json', f'{prefix}.folded']
+        with open(files[0], 'w') as f:
+            json.dump({'mode': self.mode, 'stages': self.stages}, f, indent=4)
+        with open(files[1], 'w') as f:
+            f.write(self.sampler.folded())
+        if self.reports:
+            files.append(f'{prefix}_{"cprofile" if self.mode == "cprofile" else "allocations"}.txt')
+            with open(files[-1], 'w') as f:
+                f.write(self._report_text())
+        if self.mode == 'cprofile':
+            import pstats
+            # Binary statistics per stage, for pstats, snakeviz or gprof2dot
+            for stage, reports in self.reports.items():
+                files.append(f'{prefix}_{stage.replace("/", "_")}.prof')
+                pstats.Stats(*reports).dump_stats(files[-1])
+        return files
+
+
+_profiler = None
+
+
+def enable(mode='time', name='dnac', directory='profile'):
+    # Start profiling this process. At exit the stage table is printed to stderr and the reports are saved in
+    # "directory". Later calls, e.g. from chained workflows, keep adding stages to the profiler already running.
+    global _profiler
+    if _profiler:
+        return _profiler
+    _profiler = Profiler(mode, name)
+    atexit.register(_finish, _profiler, directory)
+    return _profiler
+
+
+def _finish(profiler, directory):
+    print(profiler.table(), file=sys.stderr)
+    for filename in profiler.save(directory):
+        print(f'Profile saved to "{filename}"', file=sys.stderr)
+
+
+@contextmanager
+def _no_stage():
+    yield
+
+
+def stage(name):
+    # Time the enclosed block as a pipeline stage when profiling is enabled; otherwise does nothing
+    # Usage: with profiler.stage('auth'): ...
+    return _profiler.stage(name) if _profiler else _no_stage()
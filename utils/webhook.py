@@ -0,0 +1,268 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime as dt
+
+# Only local clients can post notifications by default; listen on "0.0.0.0" to accept them from DNAC directly
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 9000
+DEFAULT_PATH = '/events'
+# Largest notification body accepted, in bytes
+MAX_BODY = 10 * 1024 * 1024
+
+
+def _epoch_ms(value):
+    # Notification timestamps are epoch milliseconds, but may also arrive as ISO date/time strings
+    if value is None:
+        return int(time.time() * 1000)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return int(dt.fromisoformat(value.replace('Z', '+00:00')).timestamp() * 1000)
+    return int(value)
+
+
+def normalize_event(notification):
+    # param notification (dict): Event notification pushed by DNAC to a REST webhook destination
+    # return event (dict): The same event in the schema returned by "get_device_events" ("name", "eventName",
+    # "timestamp" in epoch ms, "id", "severity", "details" as a list of key/value dicts), plus "deviceUuid" and
+    # "taskId" when the notification identifies a device or a task
+
+    details = notification.get('details') or {}
+    if isinstance(details, dict):
+        details = [{'key': key, 'value': value} for key, value in details.items()]
+    event = {
+        'name': notification.get('eventId') or notification.get('name'),
+        'eventName': notification.get('name') or notification.get('description'),
+        'timestamp': _epoch_ms(notification.get('timestamp') or notification.get('startTime')),
+        'id': notification.get('instanceId') or notification.get('id'),
+        'severity': None if notification.get('severity') is None else str(notification.get('severity')),
+        'details': details
+    }
+    if not event['id']:
+        event['id'] = f'{event["name"]}-{event["timestamp"]}'
+    network = notification.get('network') or {}
+    device_uuid = network.get('deviceId') or notification.get('deviceUuid')
+    if device_uuid:
+        event['deviceUuid'] = device_uuid
+    task_id = notification.get('taskId')
+    for item in details:
+        if str(item.get('key', '')).lower().replace(' ', '') == 'taskid':
+            task_id = task_id or item.get('value')
+    if task_id:
+        event['taskId'] = task_id
+    return event
+
+
+class TaskWaiter:
+    # Lets threads waiting on DNAC tasks wake up as soon as a notification mentioning their task arrives, instead
+    # of sleeping for the full poll interval. Use "notify" as (or from) a WebhookReceiver handler.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.events = {}
+
+    def _event(self, task_id):
+        with self.lock:
+            return self.events.setdefault(task_id, threading.Event())
+
+    def notify(self, event):
+        # param event (dict): Normalized event; events without a "taskId" are ignored
+        if event.get('taskId'):
+            logging.debug(f'Received notification for task {event["taskId"]}')
+            self._event(event['taskId']).set()
+
+    def wait(self, task_id, timeout):
+        # return (bool): True if a notification for the task arrived within "timeout" seconds
+        notified = self._event(task_id).wait(timeout)
+        if notified:
+            with self.lock:
+                self.events.pop(task_id, None)
+        return notified
+
+
+def wait_for_task(get_status, task_id, attempts=5, interval=3, waiter=None):
+    # param get_status: Function returning the task status dictionary from "/dna/intent/api/v1/task/{task_id}"
+    # param task_id (str): Task UUID, used for log messages and to match notifications
+    # param attempts (int): Maximum number of status checks
+    # param interval (int): Seconds between status checks
+    # param waiter (TaskWaiter): Optional; a notification for the task triggers the next check immediately
+    # return task_status (dict): Last status received. The task has finished if it contains "isError": true or an
+    # "endTime" key.
+
+    counter = 1
+    while True:
+        task_status = get_status()
+        if task_status['isError'] or 'endTime' in task_status.keys() or counter >= attempts:
+            return task_status
+        logging.info(f'Currently waiting on Task ID {task_id} to finish. Attempt #{counter}')
+        logging.debug(f'Task is still pending, attempt #{counter}: {task_status}')
+        counter += 1
+        if waiter:
+            waiter.wait(task_id, interval)
+        else:
+            time.sleep(interval)
+
+
+class WebhookReceiver:
+    # Minimal asyncio HTTP server accepting DNAC event notifications. Each POST to "path" may carry one notification
+    # or a list of them; every notification is normalized and passed to "handler" in a worker thread. The server
+    # runs its own event loop in a background thread so it can be used from the synchronous scripts. If
+    # "authorization" is set, requests must send exactly that "Authorization" header value (e.g. "Basic ...").
+
+    def __init__(self, handler, host=DEFAULT_HOST, port=DEFAULT_PORT, path=DEFAULT_PATH, authorization=None,
+                 certfile=None, keyfile=None):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self.path = path
+        self.authorization = authorization
+        self.ssl_context = None
+        if certfile:
+            import ssl
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(certfile, keyfile)
+        self.received = 0
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self._ready = threading.Event()
+        self._error = None
+        self._writers = set()
+
+    async def _respond(self, writer, status, reason, body=b''):
+        writer.write(f'HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\n\r\n'.encode('latin-1') + body)
+        await writer.drain()
+
+    async def _process(self, method, target, headers, body):
+        # return status, reason: HTTP response status for the request
+        if target.split('?')[0] != self.path:
+            return 404, 'Not Found'
+        if method != 'POST':
+            return 405, 'Method Not Allowed'
+        if self.authorization and headers.get('authorization') != self.authorization:
+            return 401, 'Unauthorized'
+        try:
+            payload = json.loads(body or b'null')
+        except ValueError:
+            return 400, 'Bad Request'
+        notifications = payload if isinstance(payload, list) else [payload]
+        if not all(isinstance(item, dict) for item in notifications):
+            return 400, 'Bad Request'
+        events = [normalize_event(item) for item in notifications]
+        self.received += len(events)
+        await self.loop.run_in_executor(None, self._deliver, events)
+        return 200, 'OK'
+
+    def _deliver(self, events):
+        for event in events:
+            try:
+                self.handler(event)
+            except Exception:
+                logging.exception(f'Webhook handler failed for event {event.get("id")}')
+
+    async def _handle(self, reader, writer):
+        import asyncio
+        self._writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    key, _, value = line.decode('latin-1').partition(':')
+                    headers[key.strip().lower()] = value.strip()
+                length = int(headers.get('content-length') or 0)
+                if length > MAX_BODY:
+                    await self._respond(writer, 413, 'Payload Too Large')
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, reason = await self._process(method, target, headers, body)
+                await self._respond(writer, status, reason)
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _run(self):
+        import asyncio
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port, ssl=self.ssl_context))
+            self.port = self.server.sockets[0].getsockname()[1]
+        except Exception as e:
+            # E.g. the port is already in use; "start" re-raises the error in the calling thread
+            self._error = e
+            self.loop.close()
+            return
+        finally:
+            self._ready.set()
+        self.loop.run_forever()
+        # Stop accepting connections, then close open keep-alive connections so their handlers finish
+        self.server.close()
+        for writer in list(self._writers):
+            writer.close()
+        self.loop.run_until_complete(asyncio.gather(*asyncio.all_tasks(self.loop), return_exceptions=True))
+        self.loop.run_until_complete(self.server.wait_closed())
+        self.loop.close()
+
+    def start(self):
+        # Start listening in a background thread; returns once the port is open. asyncio is imported here rather
+        # than at the top, so scripts that never start a receiver do not pay for it at startup.
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, name='webhook-receiver', daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._error:
+            self.thread.join()
+            raise self._error
+        scheme = 'https' if self.ssl_context else 'http'
+        logging.info(f'Webhook receiver listening on {scheme}://{self.host}:{self.port}{self.path}')
+        return self
+
+    def stop(self):
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,121 @@
+"""
+Copyright (c) 2026 Cisco and/or its affiliates.
+
+This software is licensed to you under the terms of the Cisco Sample
+Code License, Version 1.1 (the "License"). You may obtain a copy of the
+License at
+
+               https://developer.cisco.com/docs/licenses
+
+All use of the material herein must be in accordance with the terms of
+the License. All rights not expressly granted by the License are
+reserved. Unless required by applicable law or agreed to separately in
+writing, software distributed under the License is distributed on an "AS
+IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express
+or implied.
+
+"""
+
+__author__ = "Aron Donaldson <ardonald@cisco.com>"
+__contributors__ = ""
+__copyright__ = "Copyright (c) 2026 Cisco and/or its affiliates."
+__license__ = "Cisco Sample Code License, Version 1.1"
+
+import argparse
+import random
+import sys
+import os
+import time
+import uuid
+
+# Append parent directory to path so we can import from external packages
+currentdir = os.path.dirname(os.path.realpath(__file__))
+parentdir = os.path.dirname(currentdir)
+sys.path.append(parentdir)
+
+from utils import http_client
+
+# Syslog mnemonics used for synthetic device events
+MNEMONICS = [('LINK', 'UPDOWN', 3), ('LINEPROTO', 'UPDOWN', 5), ('SYS', 'CONFIG_I', 5),
+             ('SEC_LOGIN', 'LOGIN_SUCCESS', 5), ('OSPF', 'ADJCHG', 5), ('PLATFORM', 'ENVMON', 2)]
+
+
+def device_notification(device_uuid):
+    # param device_uuid (str): UUID of the device the event is reported for
+    # return (dict): Synthetic syslog event notification in the format DNAC sends to webhook destinations
+    facility, mnemonic, severity = random.choice(MNEMONICS)
+    return {
+        'version': '1.0.0',
+        'instanceId': str(uuid.uuid4()),
+        'eventId': f'SYSLOG-{facility}-{mnemonic}',
+        'namespace': 'ASSURANCE',
+        'name': f'{facility}-{severity}-{mnemonic}',
+        'description': f'%{facility}-{severity}-{mnemonic}: synthetic test event',
+        'type': 'NETWORK',
+        'category': 'WARN',
+        'severity': severity,
+        'timestamp': int(time.time() * 1000),
+        'details': {'Mnemonic': mnemonic, 'Facility': facility, 'Message Text': 'synthetic test event'},
+        'network': {'siteId': '', 'deviceId': device_uuid}
+    }
+
+
+def task_notification(task_id):
+    # param task_id (str): Task UUID
+    # return (dict): Synthetic notification reporting that a task has finished
+    return {
+        'version': '1.0.0',
+        'instanceId': str(uuid.uuid4()),
+        'eventId': 'TASK-COMPLETE',
+        'name': 'Task completed',
+        'severity': 4,
+        'timestamp': int(time.time() * 1000),
+        'taskId': task_id,
+        'details': {'Task Id': task_id}
+    }
+
+
+def send(url, notifications, authorization=None, batch_size=1):
+    # param url (str): Webhook receiver URL
+    # param notifications (list): Notification dicts
+    # param batch_size (int): Notifications sent per POST request
+    # return (int): Number of notifications accepted by the receiver
+
+    headers = {'content-type': 'application/json'}
+    if authorization:
+        headers['authorization'] = authorization
+    accepted = 0
+    for i in range(0, len(notifications), batch_size):
+        batch = notifications[i:i + batch_size]
+        response = http_client.post(url, headers=headers, json=batch if batch_size > 1 else batch[0], verify=False)
+        if response.status_code == 200:
+            accepted += len(batch)
+        else:
+            print(f'Receiver returned {response.status_code} {response.reason}')
+    return accepted
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Stand-in for Catalyst Center event notifications. Sends synthetic '
+                                                 'device events and task completion notifications to a webhook '
+                                                 'receiver for testing.')
+    parser.add_argument('--url', default='http://127.0.0.1:9000/events', help='Webhook receiver URL. Default is '
+                                                                            '"http://127.0.0.1:9000/events".')
+    parser.add_argument('-d', '--device_uuid', action='append', help='Device UUID to send events for. May be '
+                                                                     'repeated.')
+    parser.add_argument('-n', '--count', type=int, default=10, help='Number of device events to send. Default is 10.')
+    parser.add_argument('-t', '--task_id', action='append', help='Send a completion notification for this task ID. '
+                                                                 'May be repeated.')
+    parser.add_argument('--rate', type=float, default=0, help='Notifications per second; 0 sends as fast as '
+                                                              'possible.')
+    parser.add_argument('--batch_size', type=int, default=1, help='Notifications per request. Default is 1.')
+    parser.add_argument('--authorization', help='Value of the "Authorization" header expected by the receiver.')
+    args = parser.parse_args()
+
+    notifications = [device_notification(random.choice(args.device_uuid or [str(uuid.uuid4())]))
+                     for _ in range(args.count)]
+    notifications += [task_notification(task_id) for task_id in args.task_id or []]
+    if args.rate:
+        http_client.set_rate_limit(args.url, args.rate / args.batch_size)
+    sent = send(args.url, notifications, args.authorization, args.batch_size)
+    print(f'{sent} of {len(notifications)} notifications accepted by {args.url}')